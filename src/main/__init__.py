@@ -1,11 +1,78 @@
 """Dagger Version Manager - Automated version synchronization for multi-file projects."""
 
-import re
-from datetime import datetime
-from typing import Annotated, Optional
+import asyncio
+import json
+import time
+from typing import Annotated, Callable, Optional, TypeVar
 
 import dagger
-from dagger import Doc, function, object_type
+from dagger import Doc, Ignore, dag, field, function, object_type
+
+from .context import CallContext
+from .filters import (
+    CHANGED_IGNORE,
+    HISTORY_IGNORE,
+    HOOKS_IGNORE,
+    MANIFEST_FILE,
+    MONOREPO_IGNORE,
+    SOURCE_IGNORE,
+    TAGS_IGNORE,
+)
+from .limits import ENGINE_TIMEOUT, MAX_ENGINE_CALLS, SNAPSHOT_MAX_BYTES
+from .monorepo import SKIPPED_DIRECTORIES, Package, changed_paths_command, discover_packages
+from .patterns import compile_pattern
+from .profiler import measure, profiled, profiling
+from .report import (
+    CONSISTENT,
+    INVALID_SPEC,
+    MISMATCH,
+    NOT_FOUND,
+    READ_ERROR,
+    SYNCED,
+    MonorepoReport,
+    PackageReport,
+    TargetCheck,
+    ValidationReport,
+)
+
+# Marker file, project type, target file and version pattern.
+# Priority order: Ansible > Python > Helm > Docker
+PROJECT_TYPES = [
+    ("galaxy.yml", "Ansible Collection", "galaxy.yml", r'^version:.*$'),
+    ("pyproject.toml", "Python", "pyproject.toml", r'^version\s*=\s*".*"$'),
+    ("Chart.yaml", "Helm", "Chart.yaml", r'^version:.*$'),
+    ("Dockerfile", "Docker", "Dockerfile", r'LABEL version=".*"$'),
+]
+
+# Version pattern used for a target file when none is given
+DEFAULT_PATTERNS = {target: pattern for _, _, target, pattern in PROJECT_TYPES}
+
+# Target of single-target functions without a manifest or --target-file
+DEFAULT_TARGET = ("galaxy.yml", r'^version:.*$')
+
+# Image used to run git inside the engine, pinned so results and the engine
+# cache don't change under a moving tag
+GIT_IMAGE = "alpine/git:2.47.2"
+
+T = TypeVar("T")
+
+
+@object_type
+class SyncResult:
+    """Updated directory together with a report of what was changed."""
+    
+    directory: dagger.Directory = field()
+    report: str = field()
+
+
+@object_type
+class ReleaseResult:
+    """Release report together with the directory holding every release file."""
+    
+    version: str = field()
+    report: str = field()
+    directory: dagger.Directory = field()
+    files: list[str] = field()
 
 
 @object_type
@@ -15,11 +82,117 @@ class VersionManager:
     
     Provides version synchronization, validation, bumping, and release workflows
     for projects that maintain version numbers in multiple files (e.g., VERSION + galaxy.yml).
+    
+    Every engine query goes through one scheduler per instance, which bounds
+    the queries in flight, merges identical ones and times them out.
     """
 
+    max_engine_calls: Annotated[
+        int,
+        Doc("Maximum engine queries in flight at once")
+    ] = field(default=MAX_ENGINE_CALLS)
+    engine_timeout: Annotated[
+        float,
+        Doc("Seconds before a file or directory query is abandoned (0 disables the timeout)")
+    ] = field(default=ENGINE_TIMEOUT)
+    snapshot_max_bytes: Annotated[
+        int,
+        Doc("Bytes of small metadata files read in one query at the start of a call (0 disables)")
+    ] = field(default=SNAPSHOT_MAX_BYTES)
+
+    def _engine(self) -> "EngineScheduler":
+        """Return the engine call scheduler shared by every call on this instance."""
+        scheduler = self.__dict__.get("_scheduler")
+        if scheduler is None:
+            # Deferred: created on the first call, not at import
+            from .scheduler import EngineScheduler
+            
+            scheduler = EngineScheduler(self.max_engine_calls, self.engine_timeout)
+            self._scheduler = scheduler
+        return scheduler
+
+    def _context(self) -> CallContext:
+        """Create the request-scoped cache of a new top-level call."""
+        # New directories come from dag unless a client was set (the server's)
+        return CallContext(self._engine(), self.__dict__.get("_client"))
+
+    def _snapshot_enabled(self, source: dagger.Directory) -> bool:
+        """Whether to snapshot a directory; local and in-memory ones are read directly."""
+        return self.snapshot_max_bytes > 0 and isinstance(source, dagger.Directory)
+
+    async def _run_snapshot(
+        self,
+        source: dagger.Directory,
+        directories: list[str],
+        files: list[str]
+    ) -> str:
+        """
+        Run the snapshot script in a container.
+        
+        Args:
+            source: Directory to snapshot
+            directories: Directories to list
+            files: Files to read
+            
+        Returns:
+            Output of the snapshot script
+        """
+        # Deferred: only engine directories are snapshotted
+        from .snapshot import SNAPSHOT_SCRIPT
+        
+        async def snapshot() -> str:
+            with measure("engine.container.snapshot") as span:
+                output = await (
+                    dag.container()
+                    .from_(GIT_IMAGE)
+                    .with_directory("/src", source)
+                    .with_workdir("/src")
+                    .with_env_variable("DVM_SNAPSHOT_DIRS", "\n".join(directories))
+                    .with_env_variable("DVM_SNAPSHOT_FILES", "\n".join(files))
+                    .with_env_variable("DVM_SNAPSHOT_MAX_BYTES", str(self.snapshot_max_bytes))
+                    .with_exec(["sh", "-c", SNAPSHOT_SCRIPT])
+                    .stdout()
+                )
+                span.bytes = len(output.encode())
+            return output
+        
+        return await self._engine().run(None, snapshot, apply_timeout=False)
+
+    @profiled
+    async def _snapshot(
+        self,
+        source: dagger.Directory,
+        ctx: CallContext,
+        *extra_files: Optional[str]
+    ) -> None:
+        """
+        Prefill the call context with the small files a call reads.
+        
+        Version files, marker files, git hooks and the call's own files are
+        listed and read in one container exec instead of one query each. If
+        the snapshot can't be taken, every file is read on demand as usual.
+        
+        Args:
+            source: Directory to snapshot
+            ctx: Request-scoped cache of the current call
+            *extra_files: Call-specific files (version file, targets, changelog)
+        """
+        if not self._snapshot_enabled(source):
+            return
+        
+        # Deferred: only engine directories are snapshotted
+        from .snapshot import Snapshot, snapshot_paths
+        
+        directories, files = snapshot_paths(extra_files)
+        try:
+            snapshot = Snapshot.from_output(await self._run_snapshot(source, directories, files))
+        except Exception:
+            return
+        ctx.seed(source, snapshot)
+
     def _validate_semver(self, version: str) -> tuple[bool, str]:
         """
-        Validate semantic version format (X.Y.Z).
+        Validate semantic version format (SemVer 2.0: X.Y.Z[-PRERELEASE][+BUILD]).
         
         Args:
             version: Version string to validate
@@ -27,36 +200,45 @@ class VersionManager:
         Returns:
             Tuple of (is_valid, error_message)
         """
-        semver_pattern = r'^\d+\.\d+\.\d+$'
-        if re.match(semver_pattern, version.strip()):
+        # Deferred: loaded by the first call that reads a version
+        from .semver import SEMVER_RE
+        
+        if SEMVER_RE.match(version.strip()):
             return True, ""
-        return False, f"❌ Invalid version format: {version.strip()} (expected X.Y.Z)"
+        return False, (
+            f"❌ Invalid version format: {version.strip()} "
+            f"(expected X.Y.Z[-PRERELEASE][+BUILD])"
+        )
 
     async def _file_exists(
         self,
         source: dagger.Directory,
-        file_path: str
+        file_path: str,
+        ctx: Optional[CallContext] = None
     ) -> bool:
         """
         Check if a file exists in the directory.
         
+        Existence is answered from directory entry listings, so file contents
+        are never transferred. Each parent directory is listed once per call.
+        
         Args:
             source: Directory to check
             file_path: Path to the file
+            ctx: Request-scoped cache of the current call
             
         Returns:
             True if file exists, False otherwise
         """
-        try:
-            await source.file(file_path).contents()
-            return True
-        except Exception:
-            return False
+        ctx = ctx or self._context()
+        return await ctx.exists(source, file_path)
 
+    @profiled
     async def _resolve_version_file(
         self,
         source: dagger.Directory,
-        version_file: str
+        version_file: str,
+        ctx: Optional[CallContext] = None
     ) -> tuple[Optional[str], Optional[str]]:
         """
         Resolve the version file path, auto-detecting common locations.
@@ -68,6 +250,7 @@ class VersionManager:
         Args:
             source: Directory containing the version file
             version_file: Name of the version file
+            ctx: Request-scoped cache of the current call
             
         Returns:
             Tuple of (resolved_path, error_message)
@@ -76,9 +259,35 @@ class VersionManager:
         if version_file != "VERSION":
             return version_file, None
         
-        # Check both locations
-        root_exists = await self._file_exists(source, "VERSION")
-        subdir_exists = await self._file_exists(source, "version/VERSION")
+        ctx = ctx or self._context()
+        resolved = ctx.memo("resolved", source, version_file)
+        if resolved is None:
+            resolved = ctx.remember(
+                "resolved", source, version_file,
+                await self._detect_version_file_location(source, ctx)
+            )
+        return resolved
+
+    async def _detect_version_file_location(
+        self,
+        source: dagger.Directory,
+        ctx: CallContext
+    ) -> tuple[Optional[str], Optional[str]]:
+        """
+        Pick between ./VERSION and ./version/VERSION.
+        
+        Args:
+            source: Directory containing the version file
+            ctx: Request-scoped cache of the current call
+            
+        Returns:
+            Tuple of (resolved_path, error_message)
+        """
+        # Check both locations concurrently
+        root_exists, subdir_exists = await asyncio.gather(
+            self._file_exists(source, "VERSION", ctx),
+            self._file_exists(source, "version/VERSION", ctx),
+        )
         
         # Handle the four cases
         if root_exists and subdir_exists:
@@ -102,10 +311,12 @@ class VersionManager:
             )
             return None, error_msg
 
+    @profiled
     async def _read_version_file(
         self,
         source: dagger.Directory,
-        version_file: str
+        version_file: str,
+        ctx: Optional[CallContext] = None
     ) -> tuple[Optional[str], Optional[str]]:
         """
         Read version from the source file with auto-detection support.
@@ -116,31 +327,41 @@ class VersionManager:
         Args:
             source: Directory containing the version file
             version_file: Name of the version file (auto-detected if "VERSION")
+            ctx: Request-scoped cache of the current call
             
         Returns:
             Tuple of (version_string, error_message)
         """
+        ctx = ctx or self._context()
+        
         # Resolve the version file path (with auto-detection)
-        resolved_path, error = await self._resolve_version_file(source, version_file)
+        resolved_path, error = await self._resolve_version_file(source, version_file, ctx)
         if error:
             return None, error
         
+        parsed = ctx.memo("version", source, resolved_path)
+        if parsed is not None:
+            return parsed
+        
         try:
-            content = await source.file(resolved_path).contents()
+            content = await ctx.read(source, resolved_path)
             version = content.strip()
             
             is_valid, error = self._validate_semver(version)
             if not is_valid:
-                return None, error
-            
-            return version, None
+                parsed = (None, error)
+            else:
+                parsed = (version, None)
         except Exception as e:
             error_msg = (
                 f"❌ Failed to read {resolved_path}: {str(e)}\n"
                 f"   Create a {resolved_path} file with format X.Y.Z (e.g., 1.0.0)"
             )
-            return None, error_msg
+            parsed = (None, error_msg)
+        
+        return ctx.remember("version", source, resolved_path, parsed)
 
+    @profiled
     def _extract_version_from_target(
         self,
         target_content: str,
@@ -156,257 +377,1573 @@ class VersionManager:
         Returns:
             Extracted version string or None if not found
         """
-        for line in target_content.split('\n'):
-            if re.match(version_pattern, line):
-                # Extract version number from the line
-                version_match = re.search(r'\d+\.\d+\.\d+', line)
-                if version_match:
-                    return version_match.group(0)
-        return None
+        # Scan stops at the first matching line; no line list is built
+        span = compile_pattern(version_pattern).find_version(target_content)
+        if span is None:
+            return None
+        return target_content[span[0]:span[1]]
 
-    def _bump_version_logic(self, version: str, bump_type: str) -> tuple[Optional[str], Optional[str]]:
+    def _bump_version_logic(
+        self,
+        version: str,
+        bump_type: str,
+        preid: Optional[str] = None
+    ) -> tuple[Optional[str], Optional[str]]:
         """
         Increment version component according to semantic versioning rules.
         
         Args:
-            version: Current version (X.Y.Z)
-            bump_type: Type of bump (major, minor, or patch)
+            version: Current version (X.Y.Z[-PRERELEASE][+BUILD])
+            bump_type: Type of bump (major, minor, patch, prerelease or finalize)
+            preid: Pre-release label for prerelease bumps (e.g., rc, beta)
             
         Returns:
             Tuple of (new_version, error_message)
         """
-        if bump_type not in ["major", "minor", "patch"]:
-            return None, f'❌ Invalid bump_type: {bump_type} (use "major", "minor", or "patch")'
+        # Deferred: only bumps parse versions
+        from .semver import BUMP_TYPES, Version
+        
+        if bump_type not in BUMP_TYPES:
+            return None, (
+                f'❌ Invalid bump_type: {bump_type} '
+                f'(use "major", "minor", "patch", "prerelease", or "finalize")'
+            )
         
         try:
-            major, minor, patch = map(int, version.split('.'))
-            
-            if bump_type == "major":
-                return f"{major + 1}.0.0", None
-            elif bump_type == "minor":
-                return f"{major}.{minor + 1}.0", None
-            else:  # patch
-                return f"{major}.{minor}.{patch + 1}", None
-        except Exception as e:
+            current = Version.parse(version)
+        except ValueError as e:
             return None, f"❌ Failed to parse version {version}: {str(e)}"
+        
+        try:
+            return str(current.bump(bump_type, preid)), None
+        except ValueError as e:
+            return None, f"❌ Cannot bump {version}: {str(e)}"
 
-    @function
-    async def get_version(
+    @profiled
+    async def _validate_version(
         self,
-        source: Annotated[
-            dagger.Directory,
-            Doc("Source directory containing version file (use --source=. for your project)")
-        ],
-        version_file: Annotated[
-            str,
-            Doc("Name of the version file (auto-detects VERSION or version/VERSION)")
-        ] = "VERSION"
+        source: dagger.Directory,
+        version_file: str,
+        targets: list[tuple[str, str]],
+        ctx: Optional[CallContext] = None
     ) -> str:
         """
-        Read and return the current version from the version file.
-        
-        Supports auto-detection: when using the default "VERSION", automatically
-        checks both ./VERSION and ./version/VERSION locations. Returns an error
-        if both exist (ambiguous) or neither exists.
+        Validate that the source version matches every target file version.
         
         Args:
-            source: Source directory (required, use --source=. for your project)
-            version_file: Name of the version file (default: VERSION with auto-detection)
+            source: Directory containing the version files
+            version_file: Name of the source version file
+            targets: List of (target_file, version_pattern) pairs
+            ctx: Request-scoped cache of the current call
             
         Returns:
-            Version string or error message
-            
-        Example:
-            dagger call get-version --source=.
-            dagger call get-version --source=. --version-file=version/VERSION
+            Validation result message; with several targets, the message of
+            every target that isn't consistent
         """
-        version, error = await self._read_version_file(source, version_file)
+        ctx = ctx or self._context()
         
+        # Read source version
+        source_version, error = await self._read_version_file(source, version_file, ctx)
         if error:
             return error
         
-        return version
+        checks = await asyncio.gather(*(
+            self._check_target(
+                source, version_file, source_version, target_file, version_pattern, ctx
+            )
+            for target_file, version_pattern in targets
+        ))
+        failures = [check.message for check in checks if check.status != CONSISTENT]
+        return "\n".join(failures) if failures else checks[0].message
 
-    @function
-    async def validate_version(
+    @profiled
+    async def _check_target(
         self,
-        source: Annotated[
-            dagger.Directory,
-            Doc("Source directory containing version files (use --source=. for your project)")
-        ],
-        version_file: Annotated[
-            str,
-            Doc("Name of the source version file (auto-detects VERSION or version/VERSION)")
-        ] = "VERSION",
-        target_file: Annotated[
-            str,
-            Doc("Name of the target file to validate against")
-        ] = "galaxy.yml",
-        version_pattern: Annotated[
-            str,
-            Doc("Regex pattern to match version line in target file")
-        ] = r'^version:.*$'
-    ) -> str:
+        source: dagger.Directory,
+        version_file: str,
+        source_version: str,
+        target_file: str,
+        version_pattern: str,
+        ctx: Optional[CallContext] = None
+    ) -> TargetCheck:
         """
-        Validate that version in source file matches version in target file.
-        
-        Supports auto-detection: when using the default "VERSION", automatically
-        checks both ./VERSION and ./version/VERSION locations.
+        Compare one target file against an already read source version.
         
         Args:
-            source: Source directory (required, use --source=. for your project)
-            version_file: Name of the source version file (default: VERSION with auto-detection)
-            target_file: Name of the target file to check (default: galaxy.yml)
-            version_pattern: Regex pattern to match version line (default: r'^version:.*$')
+            source: Directory containing the target file
+            version_file: Name of the source version file (for messages)
+            source_version: Version read from the version file
+            target_file: Name of the target file to check
+            version_pattern: Regex pattern to match version line
+            ctx: Request-scoped cache of the current call
             
         Returns:
-            Validation result message
-            
-        Example:
-            dagger call validate-version --source=.
-            dagger call validate-version --source=. --target-file=pyproject.toml --version-pattern='^version\s*=\s*".*"'
+            Structured result whose message is the validate_version output
         """
-        # Read source version
-        source_version, error = await self._read_version_file(source, version_file)
-        if error:
-            return error
+        ctx = ctx or self._context()
+        start = time.perf_counter()
+        check = TargetCheck(target_file, version_pattern, CONSISTENT)
         
         # Read target file
         try:
-            target_content = await source.file(target_file).contents()
+            target_content = await ctx.read(source, target_file)
         except Exception as e:
-            return (
+            check.status = READ_ERROR
+            check.message = (
                 f"❌ Failed to read {target_file}: {str(e)}\n"
                 f"   Check that the file exists and path is correct"
             )
+            check.elapsed_ms = (time.perf_counter() - start) * 1000
+            return check
         
         # Extract target version
-        target_version = self._extract_version_from_target(target_content, version_pattern)
+        check.target_version = self._extract_version_from_target(target_content, version_pattern)
         
-        if not target_version:
-            return (
+        if not check.target_version:
+            check.status = NOT_FOUND
+            check.message = (
                 f"❌ Could not find version in {target_file} matching pattern: {version_pattern}\n"
                 f"   Verify the pattern matches your file format"
             )
-        
-        # Compare versions
-        if source_version == target_version:
-            return f"✅ Version {source_version} is consistent"
+        elif source_version == check.target_version:
+            check.message = f"✅ Version {source_version} is consistent"
         else:
-            return (
-                f"⚠️  Mismatch: {version_file}={source_version}, {target_file}={target_version}\n"
+            check.status = MISMATCH
+            check.message = (
+                f"⚠️  Mismatch: {version_file}={source_version}, "
+                f"{target_file}={check.target_version}\n"
                 f"   Run: dagger call version-manager sync-version"
             )
+        
+        check.elapsed_ms = (time.perf_counter() - start) * 1000
+        return check
 
-    @function
-    async def sync_version(
+    async def _validate_versions(
         self,
-        source: Annotated[
-            dagger.Directory,
-            Doc("Source directory containing version files (use --source=. for your project)")
-        ],
-        version_file: Annotated[
-            str,
-            Doc("Name of the source version file (auto-detects VERSION or version/VERSION)")
-        ] = "VERSION",
-        target_file: Annotated[
-            str,
-            Doc("Name of the target file to update")
-        ] = "galaxy.yml",
-        version_pattern: Annotated[
-            str,
-            Doc("Regex pattern to match version line in target file")
-        ] = r'^version:.*$'
+        source: dagger.Directory,
+        version_file: str,
+        targets: list[str],
+        ctx: Optional[CallContext] = None
+    ) -> ValidationReport:
+        """
+        Validate several target files concurrently against one version file.
+        
+        Args:
+            source: Directory containing the version files
+            version_file: Name of the source version file
+            targets: Target specs as PATH or PATH:PATTERN
+            ctx: Request-scoped cache of the current call
+            
+        Returns:
+            Structured report with one result per target spec
+        """
+        ctx = ctx or self._context()
+        start = time.perf_counter()
+        
+        resolved_path, _ = await self._resolve_version_file(source, version_file, ctx)
+        report = ValidationReport(resolved_path or version_file)
+        
+        # Read source version once for every target
+        report.source_version, report.error = await self._read_version_file(
+            source, version_file, ctx
+        )
+        if report.error:
+            report.elapsed_ms = (time.perf_counter() - start) * 1000
+            return report
+        
+        async def check(spec: str) -> TargetCheck:
+            try:
+                target_file, version_pattern = self._parse_target_spec(spec)
+            except Exception as e:
+                return TargetCheck(spec, "", INVALID_SPEC, message=str(e))
+            return await self._check_target(
+                source, version_file, report.source_version,
+                target_file, version_pattern, ctx
+            )
+        
+        report.targets = list(await asyncio.gather(*(check(spec) for spec in targets)))
+        report.elapsed_ms = (time.perf_counter() - start) * 1000
+        return report
+
+    @profiled
+    async def _sync_version(
+        self,
+        source: dagger.Directory,
+        version_file: str,
+        target_file: str,
+        version_pattern: str,
+        ctx: Optional[CallContext] = None,
+        version_format: Optional[str] = None
     ) -> dagger.Directory:
         """
-        Synchronize version from source file to target file.
+        Write the source version into the matching line of the target file.
         
-        Reads version from source file and updates the matching line in target file
-        according to the specified pattern.
+        Args:
+            source: Directory containing the version files
+            version_file: Name of the source version file
+            target_file: Name of the target file to update
+            version_pattern: Regex pattern to match version line
+            ctx: Request-scoped cache of the current call
+            version_format: Rewriter name overriding the one picked by file name
+            
+        Returns:
+            Updated directory with synced version
+            
+        Raises:
+            Exception: If the version or target can't be read or the pattern doesn't match
+        """
+        ctx = ctx or self._context()
         
-        Supports auto-detection: when using the default "VERSION", automatically
-        checks both ./VERSION and ./version/VERSION locations.
+        # Read source version
+        source_version, error = await self._read_version_file(source, version_file, ctx)
+        if error:
+            raise Exception(error)
+        
+        # Read target file
+        try:
+            target_content = await ctx.read(source, target_file)
+        except Exception as e:
+            raise Exception(
+                f"❌ Failed to read {target_file}: {str(e)}\n"
+                f"   Check that the file exists and path is correct"
+            )
+        
+        # Update target content
+        new_content = self._update_target_content(
+            target_content, target_file, version_pattern, source_version, version_format
+        )
+        
+        # Write updated content back
+        updated_dir = ctx.with_new_file(source, target_file, new_content)
+        
+        return updated_dir
+
+    @profiled
+    def _update_target_content(
+        self,
+        target_content: str,
+        target_file: str,
+        version_pattern: str,
+        source_version: str,
+        version_format: Optional[str] = None
+    ) -> str:
+        """
+        Rewrite the first line matching the pattern with the new version.
         
         Args:
-            source: Source directory (required, use --source=. for your project)
-            version_file: Name of the source version file (default: VERSION with auto-detection)
-            target_file: Name of the target file to update (default: galaxy.yml)
-            version_pattern: Regex pattern to match version line (default: r'^version:.*$')
+            target_content: Content of the target file
+            target_file: Name of the target file (for error messages)
+            version_pattern: Regex pattern to match version line
+            source_version: Version to write
+            version_format: Rewriter name overriding the one picked by file name
+            
+        Returns:
+            Updated target content
+            
+        Raises:
+            Exception: If no line matches the pattern
+        """
+        start, end = self._locate_version_value(
+            target_content, target_file, version_pattern, version_format
+        )
+        
+        # Splice the new version in; everything else is left byte-for-byte
+        return target_content[:start] + source_version + target_content[end:]
+
+    def _locate_version_value(
+        self,
+        target_content: str,
+        target_file: str,
+        version_pattern: str,
+        version_format: Optional[str] = None
+    ) -> tuple[int, int]:
+        """
+        Find the version value a sync would replace.
+        
+        Args:
+            target_content: Content of the target file
+            target_file: Name of the target file (for error messages)
+            version_pattern: Regex pattern to match version line
+            version_format: Rewriter name overriding the one picked by file name
+            
+        Returns:
+            Tuple of (start, end) of the value within the content
+            
+        Raises:
+            Exception: If no line matches the pattern or it holds no version
+        """
+        # Deferred: the format registry is only needed when writing
+        from .rewriters import FORMATS, locate_version_value
+        
+        span = compile_pattern(version_pattern).find_line(target_content)
+        
+        if span is None:
+            raise Exception(
+                f"❌ Pattern not found in {target_file}: {version_pattern}\n"
+                f"   Verify the pattern matches your file format\n"
+                f"   Common patterns:\n"
+                f"   - YAML: r'^version:.*$'\n"
+                f"   - TOML: r'^version\\s*=\\s*\".*\"$'\n"
+                f"   - Dockerfile: r'LABEL version=\".*\"$'"
+            )
+        
+        start, end = span
+        line = target_content[start:end]
+        
+        # The format's rewriter locates just the version value in the line, so
+        # indentation, quotes and comments are preserved
+        value = locate_version_value(target_file, line, FORMATS.get(version_format))
+        if value is None:
+            raise Exception(
+                f"❌ No version value found in {target_file} line: {line.strip()}\n"
+                f"   Verify the pattern matches the line holding the version"
+            )
+        return start + value[0], start + value[1]
+
+    def _parse_target_spec(self, spec: str) -> tuple[str, str]:
+        """
+        Split a target spec of the form PATH or PATH:PATTERN.
+        
+        The path ends at the first colon. Without a pattern, the default
+        pattern for the file name is used (galaxy.yml, pyproject.toml,
+        Chart.yaml or Dockerfile).
+        
+        Args:
+            spec: Target spec (e.g., "Chart.yaml" or "deploy/app.yaml:^  version:.*$")
+            
+        Returns:
+            Tuple of (target_file, version_pattern)
+            
+        Raises:
+            Exception: If no pattern is given and the file name has no default
+        """
+        target_file, sep, version_pattern = spec.partition(":")
+        target_file = target_file.strip()
+        if sep and version_pattern:
+            return target_file, version_pattern
+        
+        default = DEFAULT_PATTERNS.get(target_file.rsplit("/", 1)[-1])
+        if default is None:
+            raise Exception(
+                f"❌ No version pattern for {target_file}\n"
+                f"   Use PATH:PATTERN (e.g., {target_file}:^version:.*$)"
+            )
+        return target_file, default
+
+    @profiled
+    async def _load_manifest(
+        self,
+        source: dagger.Directory,
+        ctx: CallContext
+    ) -> Optional["Manifest"]:
+        """
+        Read and compile the version manifest of a source directory.
+        
+        Compiled manifests are cached by content hash, so repeated calls on
+        an unchanged manifest only pay for reading it.
+        
+        Args:
+            source: Directory that may hold a manifest at its root
+            ctx: Request-scoped cache of the current call
+        
+        Returns:
+            Compiled manifest, or None if the source has no manifest
+        
+        Raises:
+            Exception: If the manifest can't be read or is malformed
+        """
+        if not await ctx.exists(source, MANIFEST_FILE):
+            return None
+        
+        # Deferred: only sources with a manifest need the TOML parser
+        from .manifest import load_manifest
+        
+        try:
+            return load_manifest(await ctx.read(source, MANIFEST_FILE), DEFAULT_PATTERNS)
+        except ValueError as e:
+            raise Exception(str(e))
+
+    def _parse_target_specs(self, specs: list[str]) -> list[tuple[str, str]]:
+        """
+        Parse target specs, reporting every malformed one together.
+        
+        Args:
+            specs: Target specs as PATH or PATH:PATTERN
+            
+        Returns:
+            List of (target_file, version_pattern) pairs
+            
+        Raises:
+            Exception: If any spec is malformed
+        """
+        parsed = []
+        errors = []
+        for spec in specs:
+            try:
+                parsed.append(self._parse_target_spec(spec))
+            except Exception as e:
+                errors.append(str(e))
+        if errors:
+            raise Exception("\n\n".join(errors))
+        return parsed
+
+    def _explicit_targets(
+        self,
+        target_file: Optional[str],
+        version_pattern: Optional[str]
+    ) -> Optional[list[tuple[str, str]]]:
+        """
+        Build the single target given on the command line, if any.
+        
+        Args:
+            target_file: Target file, if given
+            version_pattern: Pattern of the target file, if given
+        
+        Returns:
+            One (target_file, version_pattern) pair with the missing half
+            defaulted, or None if neither was given
+        """
+        if target_file is None and version_pattern is None:
+            return None
+        return [(target_file or DEFAULT_TARGET[0], version_pattern or DEFAULT_TARGET[1])]
+
+    async def _resolve_targets(
+        self,
+        source: dagger.Directory,
+        version_file: str,
+        targets: Optional[list[tuple[str, str]]],
+        ctx: CallContext
+    ) -> tuple[str, list[tuple[str, str]], dict[str, str]]:
+        """
+        Resolve the version file and targets of a call.
+        
+        Targets given on the command line win. Otherwise the root targets of
+        the manifest are used, and its version file replaces the default
+        "VERSION". Without a manifest, galaxy.yml is the target.
+        
+        Args:
+            source: Directory containing the version files
+            version_file: Version file given to the call
+            targets: Targets given to the call, if any
+            ctx: Request-scoped cache of the current call
+        
+        Returns:
+            Tuple of (version_file, targets, rewriter names by target file)
+        
+        Raises:
+            Exception: If the manifest is malformed or lists no root targets
+        """
+        if targets:
+            return version_file, targets, {}
+        
+        manifest = await self._load_manifest(source, ctx)
+        if manifest is None:
+            return version_file, [DEFAULT_TARGET], {}
+        if not manifest.root.targets:
+            raise Exception(
+                f"❌ {MANIFEST_FILE} lists no root targets\n"
+                f"   Add a [[targets]] table or pass --target-file"
+            )
+        if version_file == "VERSION":
+            version_file = manifest.root.version_file
+        return version_file, manifest.root.pairs(), manifest.formats
+
+    async def _map_targets(
+        self,
+        source: dagger.Directory,
+        targets: list[tuple[str, str]],
+        ctx: CallContext,
+        process: Callable[[str, str, list[str]], T],
+        action: str
+    ) -> dict[str, T]:
+        """
+        Read every target file once and process it with all its patterns.
+        
+        Targets naming the same file are grouped, so each file is read once
+        and processed with its patterns in order. All files are fetched
+        concurrently. Failures are collected across files and reported
+        together.
+        
+        Args:
+            source: Directory containing the target files
+            targets: List of (target_file, version_pattern) pairs
+            ctx: Request-scoped cache of the current call
+            process: Called with (target_file, content, patterns) per file
+            action: Verb of the error summary (e.g., "sync")
+            
+        Returns:
+            Result of process by target path, in first-mention order
+            
+        Raises:
+            Exception: If any target can't be read or processed
+        """
+        patterns: dict[str, list[str]] = {}
+        for target_file, version_pattern in targets:
+            patterns.setdefault(target_file, []).append(version_pattern)
+        
+        # Read all targets concurrently
+        contents = await asyncio.gather(
+            *(ctx.read(source, target_file) for target_file in patterns),
+            return_exceptions=True
+        )
+        
+        errors = []
+        results = {}
+        for (target_file, target_patterns), content in zip(patterns.items(), contents):
+            if isinstance(content, Exception):
+                errors.append(
+                    f"❌ Failed to read {target_file}: {str(content)}\n"
+                    f"   Check that the file exists and path is correct"
+                )
+                continue
+            try:
+                results[target_file] = process(target_file, content, target_patterns)
+            except Exception as e:
+                errors.append(str(e))
+        
+        if errors:
+            raise Exception(
+                f"❌ Failed to {action} {len(errors)} of {len(patterns)} targets\n\n"
+                + "\n\n".join(errors)
+            )
+        
+        return results
+
+    @profiled
+    async def _render_targets(
+        self,
+        source: dagger.Directory,
+        version: str,
+        targets: list[tuple[str, str]],
+        ctx: CallContext,
+        formats: Optional[dict[str, str]] = None
+    ) -> dict[str, str]:
+        """
+        Compute the new contents of every target file for a version.
+        
+        All targets are fetched concurrently. Failures are collected across
+        targets and reported together.
+        
+        Args:
+            source: Directory containing the target files
+            version: Version to write
+            targets: List of (target_file, version_pattern) pairs
+            ctx: Request-scoped cache of the current call
+            formats: Rewriter names by target file, overriding the file name
+            
+        Returns:
+            New contents by target path, in first-mention order
+            
+        Raises:
+            Exception: If any target can't be read or its pattern doesn't match
+        """
+        def render(target_file: str, content: str, target_patterns: list[str]) -> str:
+            # Patterns for the same file are applied in order to the same content
+            for version_pattern in target_patterns:
+                content = self._update_target_content(
+                    content, target_file, version_pattern, version,
+                    (formats or {}).get(target_file)
+                )
+            return content
+        
+        return await self._map_targets(source, targets, ctx, render, "sync")
+
+    async def _sync_versions(
+        self,
+        source: dagger.Directory,
+        version_file: str,
+        targets: list[tuple[str, str]],
+        ctx: Optional[CallContext] = None,
+        formats: Optional[dict[str, str]] = None
+    ) -> dagger.Directory:
+        """
+        Write the source version into every target file in one pass.
+        
+        The version file is read once, all targets are fetched concurrently
+        and the rewritten targets are applied in a single write.
+        
+        Args:
+            source: Directory containing the version files
+            version_file: Name of the source version file
+            targets: List of (target_file, version_pattern) pairs
+            ctx: Request-scoped cache of the current call
+            formats: Rewriter names by target file, overriding the file name
+            
+        Returns:
+            Updated directory with every target rewritten
+            
+        Raises:
+            Exception: If the version can't be read or any target fails
+        """
+        ctx = ctx or self._context()
+        
+        # Read source version
+        source_version, error = await self._read_version_file(source, version_file, ctx)
+        if error:
+            raise Exception(error)
+        
+        rendered = await self._render_targets(source, source_version, targets, ctx, formats)
+        return ctx.with_new_files(source, rendered)
+
+    @profiled
+    async def _plan_sync(
+        self,
+        source: dagger.Directory,
+        version_file: str,
+        targets: list[tuple[str, str]],
+        ctx: CallContext,
+        formats: Optional[dict[str, str]] = None
+    ) -> "SyncPlan":
+        """
+        Compute the edits a sync would make, without writing anything.
+        
+        Every pattern is matched against the current contents of its target,
+        so a file with several targets gets one edit per distinct value.
+        
+        Args:
+            source: Directory containing the version files
+            version_file: Name of the source version file
+            targets: List of (target_file, version_pattern) pairs
+            ctx: Request-scoped cache of the current call
+            formats: Rewriter names by target file, overriding the file name
+            
+        Returns:
+            Plan holding the edits and their unified diff
+            
+        Raises:
+            Exception: If the version can't be read or any target fails
+        """
+        # Deferred: only previews render diffs
+        from .plan import Edit, SyncPlan, render_patch
+        
+        source_version, error = await self._read_version_file(source, version_file, ctx)
+        if error:
+            raise Exception(error)
+        resolved_path, _ = await self._resolve_version_file(source, version_file, ctx)
+        plan = SyncPlan(source_version, resolved_path or version_file)
+        
+        def plan_file(
+            target_file: str, content: str, target_patterns: list[str]
+        ) -> tuple[list[Edit], str]:
+            spans = sorted({
+                self._locate_version_value(
+                    content, target_file, version_pattern, (formats or {}).get(target_file)
+                )
+                for version_pattern in target_patterns
+            })
+            
+            # Splice from the end so earlier offsets stay valid
+            new_content = content
+            edits = []
+            for start, end in reversed(spans):
+                if content[start:end] == source_version:
+                    continue
+                byte_start = len(content[:start].encode())
+                edits.append(Edit(
+                    target_file, content.count("\n", 0, start) + 1, byte_start,
+                    byte_start + len(content[start:end].encode()),
+                    content[start:end], source_version
+                ))
+                new_content = new_content[:start] + source_version + new_content[end:]
+            edits.reverse()
+            return edits, render_patch(target_file, content, new_content)
+        
+        planned = await self._map_targets(source, targets, ctx, plan_file, "plan")
+        patches = []
+        for edits, patch in planned.values():
+            plan.edits.extend(edits)
+            patches.append(patch)
+        
+        plan.patch = "".join(patches)
+        return plan
+
+    @profiled
+    async def _discover_packages(
+        self,
+        source: dagger.Directory,
+        ctx: Optional[CallContext] = None
+    ) -> list[Package]:
+        """
+        Find every package in the tree with one concurrent round of globs.
+        
+        Packages declared in .versions.toml replace the scan, so the globs
+        only run when the manifest declares none. A package with several
+        targets is listed once per target.
+        
+        Args:
+            source: Directory to scan
+            ctx: Request-scoped cache of the current call
+            
+        Returns:
+            Packages pairing each VERSION file with its detected target
+            
+        Raises:
+            Exception: If the manifest is malformed
+        """
+        ctx = ctx or self._context()
+        manifest = await self._load_manifest(source, ctx)
+        if manifest is not None and manifest.packages:
+            return [
+                Package(
+                    package.root, package.version_file,
+                    target_file=target.path,
+                    version_pattern=target.pattern.source,
+                    version_format=target.format
+                )
+                for package in manifest.packages
+                for target in package.targets
+            ]
+        
+        version_paths, *marker_paths = await asyncio.gather(
+            ctx.glob(source, "**/VERSION"),
+            *(ctx.glob(source, f"**/{marker}") for marker, *_ in PROJECT_TYPES)
+        )
+        return discover_packages(
+            version_paths,
+            [path for paths in marker_paths for path in paths],
+            PROJECT_TYPES
+        )
+
+    @profiled
+    async def _find_owning_packages(
+        self,
+        source: dagger.Directory,
+        changed_paths: list[str],
+        ctx: CallContext
+    ) -> list[Package]:
+        """
+        Map changed paths to the packages that own them.
+        
+        Walks up from each changed path to the nearest directory holding a
+        VERSION or version/VERSION file. Only the ancestor directories of the
+        changed paths are listed (each once), so the cost follows the size of
+        the change rather than the size of the tree.
+        
+        Args:
+            source: Directory containing the packages
+            changed_paths: Paths relative to the source root
+            ctx: Request-scoped cache of the current call
+            
+        Returns:
+            Owning packages with their detected targets
+        """
+        listing = ctx.listing(source)
+        
+        async def version_files(directory: str) -> list[str]:
+            prefix = f"{directory}/" if directory else ""
+            entries = await listing.entries(directory or ".")
+            found = [f"{prefix}VERSION"] if "VERSION" in entries else []
+            if "version/" in entries and "VERSION" in await listing.entries(f"{prefix}version"):
+                found.append(f"{prefix}version/VERSION")
+            return found
+        
+        async def owner(path: str) -> Optional[str]:
+            parts = [part for part in path.strip("/").split("/") if part not in ("", ".")]
+            if any(part in SKIPPED_DIRECTORIES for part in parts[:-1]):
+                return None
+            for depth in range(len(parts) - 1, -1, -1):
+                directory = "/".join(parts[:depth])
+                # version/ holds the VERSION file of its parent package
+                if parts[depth - 1:depth] == ["version"]:
+                    continue
+                if await version_files(directory):
+                    return directory
+            return None
+        
+        roots = set(await asyncio.gather(*(owner(path) for path in changed_paths)))
+        roots.discard(None)
+        
+        version_paths = []
+        marker_paths = []
+        for root in sorted(roots):
+            # Both listings are already cached from the walk above
+            entries = await listing.entries(root or ".")
+            prefix = f"{root}/" if root else ""
+            version_paths.extend(await version_files(root))
+            marker_paths.extend(
+                f"{prefix}{marker}" for marker, *_ in PROJECT_TYPES if marker in entries
+            )
+        
+        return discover_packages(version_paths, marker_paths, PROJECT_TYPES)
+
+    @profiled
+    async def _read_tag_names(self, source: dagger.Directory, ctx: CallContext) -> list[str]:
+        """
+        Read tag names from the git directory without running git.
+        
+        Loose tags under .git/refs/tags and packed tags in .git/packed-refs
+        are combined; a tag present in both is listed once.
+        
+        Args:
+            source: Directory containing the .git directory
+            ctx: Request-scoped cache of the current call
+            
+        Returns:
+            Tag names
+        """
+        # Deferred: only tag analysis reads tags
+        from .tags import LOOSE_TAGS_DIRECTORY, PACKED_REFS_FILE, loose_tag_names, parse_packed_refs
+        
+        async def loose() -> list[str]:
+            return loose_tag_names(await ctx.glob(source, f"{LOOSE_TAGS_DIRECTORY}/**"))
+        
+        async def packed() -> list[str]:
+            if not await ctx.exists(source, PACKED_REFS_FILE):
+                return []
+            return parse_packed_refs(await ctx.read(source, PACKED_REFS_FILE))
+        
+        loose_names, packed_names = await asyncio.gather(loose(), packed())
+        return list(dict.fromkeys(packed_names + loose_names))
+
+    async def _changed_paths_from_git(self, source: dagger.Directory, diff_base: str) -> list[str]:
+        """
+        List paths changed since a git revision by running git in a container.
+        
+        Args:
+            source: Directory containing the .git directory
+            diff_base: Revision to diff against (e.g., HEAD or origin/main)
+            
+        Returns:
+            Changed paths relative to the source root
+        """
+        async def diff() -> str:
+            with measure("engine.container.git_diff") as span:
+                output = await (
+                    dag.container()
+                    .from_(GIT_IMAGE)
+                    .with_directory("/src", source)
+                    .with_workdir("/src")
+                    .with_exec(changed_paths_command(diff_base))
+                    .stdout()
+                )
+                span.bytes = len(output.encode())
+            return output
+        
+        output = await self._engine().run(None, diff, apply_timeout=False)
+        return [line for line in output.splitlines() if line]
+
+    async def _scan_commits(
+        self,
+        source: dagger.Directory,
+        since: Optional[str],
+        tag_prefix: str,
+        use_cache: bool
+    ) -> str:
+        """
+        Run the commit scan script in a git container.
+        
+        Args:
+            source: Directory containing the .git directory
+            since: Revision to start after (default: nearest release tag)
+            tag_prefix: Prefix of release tags
+            use_cache: Resume from the last analyzed commit in the cache volume
+            
+        Returns:
+            Output of the scan script
+        """
+        # Deferred: only bump inference scans the history
+        from .commits import CACHE_PATH, CACHE_VOLUME, SCAN_SCRIPT
+        
+        container = dag.container().from_(GIT_IMAGE)
+        if use_cache:
+            container = (
+                container
+                .with_mounted_cache(CACHE_PATH, dag.cache_volume(CACHE_VOLUME))
+                .with_env_variable("DVM_CACHE_DIR", CACHE_PATH)
+            )
+        
+        async def scan() -> str:
+            with measure("engine.container.commit_scan") as span:
+                output = await (
+                    container
+                    .with_directory("/src", source)
+                    .with_workdir("/src")
+                    .with_env_variable("GIT_CONFIG_COUNT", "1")
+                    .with_env_variable("GIT_CONFIG_KEY_0", "safe.directory")
+                    .with_env_variable("GIT_CONFIG_VALUE_0", "*")
+                    .with_env_variable("DVM_SINCE", since or "")
+                    .with_env_variable("DVM_TAG_PREFIX", tag_prefix)
+                    .with_exec(["sh", "-c", SCAN_SCRIPT])
+                    .stdout()
+                )
+                span.bytes = len(output.encode())
+            return output
+        
+        return await self._engine().run(None, scan, apply_timeout=False)
+
+    @profiled
+    async def _infer_bump(
+        self,
+        source: dagger.Directory,
+        since: Optional[str] = None,
+        tag_prefix: str = "v",
+        use_cache: bool = True
+    ) -> "BumpInference":
+        """
+        Infer the bump type from Conventional Commits since the last release.
+        
+        A breaking change (``type!:`` or a ``BREAKING CHANGE:`` footer) means
+        major, ``feat`` means minor and ``fix`` means patch.
+        
+        Args:
+            source: Directory containing the .git directory
+            since: Revision to start after (default: nearest release tag)
+            tag_prefix: Prefix of release tags
+            use_cache: Resume from the last analyzed commit
+            
+        Returns:
+            Inferred bump type and scan statistics
+            
+        Raises:
+            Exception: If the history can't be read
+        """
+        # Deferred: only bump inference scans the history
+        from .commits import BumpInference
+        
+        try:
+            output = await self._scan_commits(source, since, tag_prefix, use_cache)
+            return BumpInference.from_output(output)
+        except Exception as e:
+            raise Exception(f"❌ Failed to read commit history: {str(e)}")
+
+    async def _process_packages(
+        self,
+        source: dagger.Directory,
+        sync: bool,
+        max_concurrency: int,
+        ctx: Optional[CallContext] = None,
+        packages: Optional[list[Package]] = None
+    ) -> tuple[dagger.Directory, MonorepoReport]:
+        """
+        Validate, and optionally sync, every package of a monorepo.
+        
+        Packages are processed concurrently, with at most max_concurrency
+        packages reading from the engine at the same time.
+        
+        Args:
+            source: Directory containing the packages
+            sync: Rewrite targets whose version doesn't match
+            max_concurrency: Maximum number of packages processed at once
+            ctx: Request-scoped cache of the current call
+            packages: Packages to process (discovered from the tree if omitted)
+            
+        Returns:
+            Tuple of (updated_directory, report)
+        """
+        ctx = ctx or self._context()
+        start = time.perf_counter()
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        
+        async def process(package: Package) -> tuple[PackageReport, Optional[str]]:
+            result = PackageReport(package.root, package.project_type, package.version_file)
+            if package.error:
+                result.error = package.error
+                return result, None
+            
+            async with semaphore:
+                result.source_version, result.error = await self._read_version_file(
+                    source, package.version_file, ctx
+                )
+                if result.error:
+                    return result, None
+                
+                result.target = await self._check_target(
+                    source, package.version_file, result.source_version,
+                    package.target_file, package.version_pattern, ctx
+                )
+                if not sync or result.target.status != MISMATCH:
+                    return result, None
+                
+                try:
+                    new_content = self._update_target_content(
+                        await ctx.read(source, package.target_file),
+                        package.target_file, package.version_pattern,
+                        result.source_version, package.version_format
+                    )
+                except Exception as e:
+                    result.error = str(e)
+                    return result, None
+                
+                result.target.status = SYNCED
+                result.target.message = (
+                    f"✅ Synced {result.source_version} → {package.target_file} "
+                    f"(was {result.target.target_version})"
+                )
+                return result, new_content
+        
+        if packages is None:
+            packages = await self._discover_packages(source, ctx)
+        results = await asyncio.gather(*(process(package) for package in packages))
+        
+        # A file declared by several targets is rewritten in order, each
+        # rewrite applied to the previous one
+        rendered: dict[str, str] = {}
+        for package, (result, new_content) in zip(packages, results):
+            if new_content is None:
+                continue
+            if package.target_file in rendered:
+                new_content = self._update_target_content(
+                    rendered[package.target_file], package.target_file,
+                    package.version_pattern, result.source_version, package.version_format
+                )
+            rendered[package.target_file] = new_content
+        updated_dir = ctx.with_new_files(source, rendered)
+        
+        report = MonorepoReport([result for result, _ in results])
+        report.elapsed_ms = (time.perf_counter() - start) * 1000
+        return updated_dir, report
+
+    @function
+    async def get_version(
+        self,
+        source: Annotated[
+            dagger.Directory,
+            Doc("Source directory containing version file (use --source=. for your project)"),
+            Ignore(SOURCE_IGNORE)
+        ],
+        version_file: Annotated[
+            str,
+            Doc("Name of the version file (auto-detects VERSION or version/VERSION)")
+        ] = "VERSION"
+    ) -> str:
+        """
+        Read and return the current version from the version file.
+        
+        Supports auto-detection: when using the default "VERSION", automatically
+        checks both ./VERSION and ./version/VERSION locations. Returns an error
+        if both exist (ambiguous) or neither exists.
+        
+        Args:
+            source: Source directory (required, use --source=. for your project)
+            version_file: Name of the version file (default: VERSION with auto-detection)
+            
+        Returns:
+            Version string or error message
+            
+        Example:
+            dagger call get-version --source=.
+            dagger call get-version --source=. --version-file=version/VERSION
+        """
+        version, error = await self._read_version_file(source, version_file, self._context())
+        
+        if error:
+            return error
+        
+        return version
+
+    @function
+    async def validate_version(
+        self,
+        source: Annotated[
+            dagger.Directory,
+            Doc("Source directory containing version files (use --source=. for your project)"),
+            Ignore(SOURCE_IGNORE)
+        ],
+        version_file: Annotated[
+            str,
+            Doc("Name of the source version file (auto-detects VERSION or version/VERSION)")
+        ] = "VERSION",
+        target_file: Annotated[
+            Optional[str],
+            Doc("Target file to validate against (default: .versions.toml targets or galaxy.yml)")
+        ] = None,
+        version_pattern: Annotated[
+            Optional[str],
+            Doc("Regex pattern to match version line in target file")
+        ] = None
+    ) -> str:
+        """
+        Validate that version in source file matches version in target file.
+        
+        Supports auto-detection: when using the default "VERSION", automatically
+        checks both ./VERSION and ./version/VERSION locations.
+        
+        Without --target-file, every target listed in .versions.toml is
+        validated; without a manifest, galaxy.yml is.
+        
+        Args:
+            source: Source directory (required, use --source=. for your project)
+            version_file: Name of the source version file (default: VERSION with auto-detection)
+            target_file: Name of the target file to check (default: manifest targets or galaxy.yml)
+            version_pattern: Regex pattern to match version line (default: r'^version:.*$')
+            
+        Returns:
+            Validation result message
+            
+        Example:
+            dagger call validate-version --source=.
+            dagger call validate-version --source=. --target-file=pyproject.toml --version-pattern='^version\s*=\s*".*"'
+        """
+        ctx = self._context()
+        await self._snapshot(source, ctx, version_file, target_file)
+        try:
+            version_file, targets, _ = await self._resolve_targets(
+                source, version_file, self._explicit_targets(target_file, version_pattern), ctx
+            )
+        except Exception as e:
+            return str(e)
+        return await self._validate_version(source, version_file, targets, ctx)
+
+    @function
+    async def validate_versions(
+        self,
+        source: Annotated[
+            dagger.Directory,
+            Doc("Source directory containing version files (use --source=. for your project)"),
+            Ignore(SOURCE_IGNORE)
+        ],
+        targets: Annotated[
+            list[str],
+            Doc("Target files to check as PATH or PATH:PATTERN (pattern defaults by file name)")
+        ],
+        version_file: Annotated[
+            str,
+            Doc("Name of the source version file (auto-detects VERSION or version/VERSION)")
+        ] = "VERSION",
+        output_format: Annotated[
+            str,
+            Doc("Output format: json or text")
+        ] = "json"
+    ) -> str:
+        """
+        Validate several target files against the source version in one call.
+        
+        Reads the version file once and checks every target concurrently. The
+        JSON report lists per-target status (consistent, mismatch, not_found,
+        read_error or invalid_spec), the extracted version and timing. The text
+        format renders the same data as the validate_version messages followed
+        by a summary line.
+        
+        Args:
+            source: Source directory (required, use --source=. for your project)
+            targets: Target specs (e.g., pyproject.toml, Chart.yaml, deploy/app.yaml:^  version:.*$)
+            version_file: Name of the source version file (default: VERSION with auto-detection)
+            output_format: Output format, json (default) or text
+            
+        Returns:
+            Validation report as JSON or text
+            
+        Example:
+            dagger call validate-versions --source=. --targets=pyproject.toml,Chart.yaml
+            dagger call validate-versions --source=. --targets=galaxy.yml --output-format=text
+        """
+        if output_format not in ["json", "text"]:
+            return f'❌ Invalid output_format: {output_format} (use "json" or "text")'
+        
+        report = await self._validate_versions(source, version_file, targets, self._context())
+        
+        if output_format == "text":
+            return report.render()
+        return report.to_json()
+
+    @function
+    async def sync_version(
+        self,
+        source: Annotated[
+            dagger.Directory,
+            Doc("Source directory containing version files (use --source=. for your project)"),
+            Ignore(SOURCE_IGNORE)
+        ],
+        version_file: Annotated[
+            str,
+            Doc("Name of the source version file (auto-detects VERSION or version/VERSION)")
+        ] = "VERSION",
+        target_file: Annotated[
+            Optional[str],
+            Doc("Name of the target file to update (default: .versions.toml or galaxy.yml)")
+        ] = None,
+        version_pattern: Annotated[
+            Optional[str],
+            Doc("Regex pattern to match version line in target file")
+        ] = None
+    ) -> dagger.Directory:
+        """
+        Synchronize version from source file to target file.
+        
+        Reads version from source file and updates the matching line in target file
+        according to the specified pattern.
+        
+        Supports auto-detection: when using the default "VERSION", automatically
+        checks both ./VERSION and ./version/VERSION locations.
+        
+        Without --target-file, every target listed in .versions.toml is
+        synced in one write; without a manifest, galaxy.yml is.
+        
+        Args:
+            source: Source directory (required, use --source=. for your project)
+            version_file: Name of the source version file (default: VERSION with auto-detection)
+            target_file: Name of the target file to update (default: manifest targets or galaxy.yml)
+            version_pattern: Regex pattern to match version line (default: r'^version:.*$')
+            
+        Returns:
+            Updated directory with synced version
+            
+        Example:
+            dagger call sync-version --source=. export --path=.
+            dagger call sync-version --source=. --target-file=pyproject.toml --version-pattern='^version\s*=\s*".*"' export --path=.
+        """
+        ctx = self._context()
+        version_file, targets, formats = await self._resolve_targets(
+            source, version_file, self._explicit_targets(target_file, version_pattern), ctx
+        )
+        if len(targets) == 1:
+            target_file, version_pattern = targets[0]
+            return await self._sync_version(
+                source, version_file, target_file, version_pattern, ctx, formats.get(target_file)
+            )
+        return await self._sync_versions(source, version_file, targets, ctx, formats)
+
+    @function
+    async def sync_versions(
+        self,
+        source: Annotated[
+            dagger.Directory,
+            Doc("Source directory containing version files (use --source=. for your project)"),
+            Ignore(SOURCE_IGNORE)
+        ],
+        targets: Annotated[
+            list[str],
+            Doc("Target files to update as PATH or PATH:PATTERN (pattern defaults by file name)")
+        ],
+        version_file: Annotated[
+            str,
+            Doc("Name of the source version file (auto-detects VERSION or version/VERSION)")
+        ] = "VERSION"
+    ) -> dagger.Directory:
+        """
+        Synchronize version from source file to several target files at once.
+        
+        Reads the version file once, fetches every target concurrently and
+        returns a single directory with all targets rewritten. Each target is
+        given as PATH or PATH:PATTERN; without a pattern, the default for
+        galaxy.yml, pyproject.toml, Chart.yaml or Dockerfile is used. Errors
+        are collected across all targets and reported together.
+        
+        Args:
+            source: Source directory (required, use --source=. for your project)
+            targets: Target specs (e.g., pyproject.toml, Chart.yaml, deploy/app.yaml:^  version:.*$)
+            version_file: Name of the source version file (default: VERSION with auto-detection)
+            
+        Returns:
+            Updated directory with every target synced
+            
+        Example:
+            dagger call sync-versions --source=. --targets=pyproject.toml,Chart.yaml export --path=.
+            dagger call sync-versions --source=. --targets='pyproject.toml,Dockerfile:LABEL version=".*"$' export --path=.
+        """
+        ctx = self._context()
+        
+        # Parse every spec up front so malformed specs are reported together
+        parsed = self._parse_target_specs(targets)
+        return await self._sync_versions(source, version_file, parsed, ctx)
+
+    @function
+    async def plan_sync(
+        self,
+        source: Annotated[
+            dagger.Directory,
+            Doc("Source directory containing version files (use --source=. for your project)"),
+            Ignore(SOURCE_IGNORE)
+        ],
+        version_file: Annotated[
+            str,
+            Doc("Name of the source version file (auto-detects VERSION or version/VERSION)")
+        ] = "VERSION",
+        target_file: Annotated[
+            Optional[str],
+            Doc("Name of the target file to plan (default: .versions.toml targets or galaxy.yml)")
+        ] = None,
+        version_pattern: Annotated[
+            Optional[str],
+            Doc("Regex pattern to match version line in target file")
+        ] = None,
+        targets: Annotated[
+            Optional[list[str]],
+            Doc("Target files to plan as PATH or PATH:PATTERN (replaces --target-file)")
+        ] = None,
+        output_format: Annotated[
+            str,
+            Doc("Output format: diff or json")
+        ] = "diff"
+    ) -> str:
+        """
+        Preview a sync without writing a directory.
+        
+        Computes the exact byte range of every version value a sync would
+        replace. The diff format is a git-compatible unified diff; the JSON
+        format lists each edit (file, line, byte offsets, old and new value)
+        and carries the same diff under "patch". Targets resolve as for
+        sync-version and sync-versions. An empty diff means every target is
+        already in sync.
+        
+        Args:
+            source: Source directory (required, use --source=. for your project)
+            version_file: Name of the source version file (default: VERSION with auto-detection)
+            target_file: Name of the target file to plan (default: manifest targets or galaxy.yml)
+            version_pattern: Regex pattern to match version line (default: r'^version:.*$')
+            targets: Target specs replacing target_file (optional)
+            output_format: Output format, diff (default) or json
+            
+        Returns:
+            Unified diff or JSON plan
+            
+        Example:
+            dagger call plan-sync --source=.
+            dagger call plan-sync --source=. --targets=pyproject.toml,Chart.yaml --output-format=json
+        """
+        if output_format not in ["diff", "json"]:
+            return f'❌ Invalid output_format: {output_format} (use "diff" or "json")'
+        
+        ctx = self._context()
+        if targets:
+            explicit = self._parse_target_specs(targets)
+        else:
+            explicit = self._explicit_targets(target_file, version_pattern)
+        version_file, resolved, formats = await self._resolve_targets(
+            source, version_file, explicit, ctx
+        )
+        plan = await self._plan_sync(source, version_file, resolved, ctx, formats)
+        
+        if output_format == "json":
+            return plan.to_json()
+        return plan.patch
+
+    @function
+    async def apply_plan(
+        self,
+        source: Annotated[
+            dagger.Directory,
+            Doc("Source directory the plan was computed for (use --source=. for your project)"),
+            Ignore(SOURCE_IGNORE)
+        ],
+        plan: Annotated[
+            str,
+            Doc("Output of plan-sync, as a unified diff or JSON")
+        ]
+    ) -> dagger.Directory:
+        """
+        Apply a plan computed by plan-sync.
+        
+        The plan's diff is applied as a patch, so the targets are neither
+        read nor matched again. The patch checks the lines around every edit:
+        a plan computed against other contents fails instead of being
+        applied to the wrong lines.
+        
+        Args:
+            source: Source directory (required, use --source=. for your project)
+            plan: Plan from plan-sync (either output format)
+            
+        Returns:
+            Updated directory with the plan applied
+            
+        Raises:
+            Exception: If the plan is malformed
+            
+        Example:
+            dagger call apply-plan --source=. --plan="$(dagger call plan-sync --source=.)" export --path=.
+        """
+        patch = plan
+        if plan.lstrip().startswith("{"):
+            # Deferred: only JSON plans need parsing
+            from .plan import SyncPlan
+            
+            try:
+                patch = SyncPlan.from_json(plan).patch
+            except ValueError as e:
+                raise Exception(str(e))
+        
+        if not patch.strip():
+            return source
+        return self._context().with_patch(source, patch)
+
+    @function
+    async def validate_all(
+        self,
+        source: Annotated[
+            dagger.Directory,
+            Doc("Monorepo root directory (use --source=. for your project)"),
+            Ignore(MONOREPO_IGNORE)
+        ],
+        max_concurrency: Annotated[
+            int,
+            Doc("Maximum number of packages processed at once")
+        ] = 16,
+        output_format: Annotated[
+            str,
+            Doc("Output format: json or text")
+        ] = "json"
+    ) -> str:
+        """
+        Validate every package of a monorepo in one call.
+        
+        Discovers every VERSION file (./VERSION or ./version/VERSION layout
+        per package) and pairs it with the target detected from the marker
+        files next to it, using the same priority as setup-git-hooks
+        (galaxy.yml > pyproject.toml > Chart.yaml > Dockerfile). Packages are
+        validated concurrently.
+        
+        Args:
+            source: Monorepo root directory (required, use --source=. for your project)
+            max_concurrency: Maximum number of packages processed at once (default: 16)
+            output_format: Output format, json (default) or text
+            
+        Returns:
+            Per-package validation report as JSON or text
+            
+        Example:
+            dagger call validate-all --source=.
+            dagger call validate-all --source=. --max-concurrency=32 --output-format=text
+        """
+        if output_format not in ["json", "text"]:
+            return f'❌ Invalid output_format: {output_format} (use "json" or "text")'
+        
+        _, report = await self._process_packages(
+            source, False, max_concurrency, self._context()
+        )
+        
+        if output_format == "text":
+            return report.render()
+        return report.to_json()
+
+    @function
+    async def validate_changed(
+        self,
+        source: Annotated[
+            dagger.Directory,
+            Doc("Monorepo root directory (use --source=. for your project)"),
+            Ignore(CHANGED_IGNORE)
+        ],
+        changed_paths: Annotated[
+            Optional[list[str]],
+            Doc("Changed paths relative to the source root")
+        ] = None,
+        diff_base: Annotated[
+            Optional[str],
+            Doc("Git revision to diff against when no changed paths are given (e.g., HEAD)")
+        ] = None,
+        max_concurrency: Annotated[
+            int,
+            Doc("Maximum number of packages processed at once")
+        ] = 16,
+        output_format: Annotated[
+            str,
+            Doc("Output format: json or text")
+        ] = "json"
+    ) -> str:
+        """
+        Validate only the packages touched by a change.
+        
+        Each changed path is mapped to its owning package, the nearest
+        enclosing directory with a VERSION or version/VERSION file. Only
+        those packages are read and validated, so the cost follows the size
+        of the change rather than the size of the repository. Without
+        changed_paths, the paths are taken from `git diff --cached --name-only
+        <diff-base>` run in a container (the source must include .git), which
+        covers commits and staged changes.
+        
+        Args:
+            source: Monorepo root directory (required, use --source=. for your project)
+            changed_paths: Changed paths (e.g., from `git diff --cached --name-only`)
+            diff_base: Git revision to diff against when changed_paths is omitted
+            max_concurrency: Maximum number of packages processed at once (default: 16)
+            output_format: Output format, json (default) or text
             
         Returns:
-            Updated directory with synced version
+            Per-package validation report for the affected packages
             
         Example:
-            dagger call sync-version --source=. export --path=.
-            dagger call sync-version --source=. --target-file=pyproject.toml --version-pattern='^version\s*=\s*".*"' export --path=.
+            dagger call validate-changed --source=. --changed-paths=collections/a/galaxy.yml
+            dagger call validate-changed --source=. --diff-base=origin/main --output-format=text
         """
-        # Read source version
-        source_version, error = await self._read_version_file(source, version_file)
-        if error:
-            raise Exception(error)
+        if output_format not in ["json", "text"]:
+            return f'❌ Invalid output_format: {output_format} (use "json" or "text")'
         
-        # Read target file
-        try:
-            target_content = await source.file(target_file).contents()
-        except Exception as e:
-            raise Exception(
-                f"❌ Failed to read {target_file}: {str(e)}\n"
-                f"   Check that the file exists and path is correct"
-            )
+        if changed_paths is None:
+            if not diff_base:
+                return "❌ Provide --changed-paths or --diff-base"
+            try:
+                changed_paths = await self._changed_paths_from_git(source, diff_base)
+            except Exception as e:
+                return f"❌ Failed to run git diff against {diff_base}: {str(e)}"
+        
+        ctx = self._context()
+        start = time.perf_counter()
+        packages = await self._find_owning_packages(source, changed_paths, ctx)
+        _, report = await self._process_packages(
+            source, False, max_concurrency, ctx, packages
+        )
+        report.changed_paths = list(changed_paths)
+        report.elapsed_ms = (time.perf_counter() - start) * 1000
         
-        # Update target content
-        lines = target_content.split('\n')
-        updated = False
-        
-        for i, line in enumerate(lines):
-            if re.match(version_pattern, line):
-                # Determine format based on pattern
-                if 'version:' in line:
-                    # YAML format
-                    lines[i] = f"version: {source_version}"
-                elif 'version =' in line or 'version=' in line:
-                    # TOML/Python format
-                    lines[i] = f'version = "{source_version}"'
-                elif 'LABEL version=' in line:
-                    # Dockerfile format
-                    lines[i] = f'LABEL version="{source_version}"'
-                else:
-                    # Generic replacement
-                    lines[i] = re.sub(r'\d+\.\d+\.\d+', source_version, line)
-                updated = True
-                break
-        
-        if not updated:
-            raise Exception(
-                f"❌ Pattern not found in {target_file}: {version_pattern}\n"
-                f"   Verify the pattern matches your file format\n"
-                f"   Common patterns:\n"
-                f"   - YAML: r'^version:.*$'\n"
-                f"   - TOML: r'^version\\s*=\\s*\".*\"$'\n"
-                f"   - Dockerfile: r'LABEL version=\".*\"$'"
-            )
+        if output_format == "text":
+            return report.render()
+        return report.to_json()
+
+    @function
+    async def sync_all(
+        self,
+        source: Annotated[
+            dagger.Directory,
+            Doc("Monorepo root directory (use --source=. for your project)"),
+            Ignore(MONOREPO_IGNORE)
+        ],
+        max_concurrency: Annotated[
+            int,
+            Doc("Maximum number of packages processed at once")
+        ] = 16
+    ) -> SyncResult:
+        """
+        Synchronize every package of a monorepo in one call.
         
-        # Write updated content back
-        new_content = '\n'.join(lines)
-        updated_dir = source.with_new_file(target_file, new_content)
+        Discovers packages like validate-all and rewrites each target whose
+        version doesn't match its package's VERSION file. Packages that fail
+        are listed in the report; the other packages are still synced.
         
-        return updated_dir
+        Args:
+            source: Monorepo root directory (required, use --source=. for your project)
+            max_concurrency: Maximum number of packages processed at once (default: 16)
+            
+        Returns:
+            Merged directory with every package synced, and a JSON report
+            
+        Example:
+            dagger call sync-all --source=. directory export --path=.
+            dagger call sync-all --source=. report
+        """
+        updated_dir, report = await self._process_packages(
+            source, True, max_concurrency, self._context()
+        )
+        return SyncResult(directory=updated_dir, report=report.to_json())
 
     @function
     async def bump_version(
         self,
         source: Annotated[
             dagger.Directory,
-            Doc("Source directory containing version file (use --source=. for your project)")
+            Doc("Source directory containing version file (use --source=. for your project)"),
+            Ignore(SOURCE_IGNORE)
         ],
         bump_type: Annotated[
             str,
-            Doc("Type of version bump: major, minor, or patch")
+            Doc("Type of version bump: major, minor, patch, prerelease, finalize, or auto")
         ],
         version_file: Annotated[
             str,
             Doc("Name of the version file to update (auto-detects VERSION or version/VERSION)")
-        ] = "VERSION"
+        ] = "VERSION",
+        preid: Annotated[
+            Optional[str],
+            Doc("Pre-release label for prerelease bumps (default: current label or rc)")
+        ] = None,
+        history: Annotated[
+            Optional[dagger.Directory],
+            Doc("Repository whose commits decide an auto bump (use --history=.)"),
+            Ignore(HISTORY_IGNORE)
+        ] = None,
+        since: Annotated[
+            Optional[str],
+            Doc("Revision the auto bump reads commits after (default: latest v* tag)")
+        ] = None
     ) -> dagger.Directory:
         """
         Increment version according to semantic versioning rules.
@@ -414,14 +1951,25 @@ class VersionManager:
         - major: X.Y.Z → (X+1).0.0
         - minor: X.Y.Z → X.(Y+1).0
         - patch: X.Y.Z → X.Y.(Z+1)
+        - prerelease: X.Y.Z → X.Y.(Z+1)-rc.1, X.Y.Z-rc.1 → X.Y.Z-rc.2
+        - finalize: X.Y.Z-rc.2 → X.Y.Z
+        - auto: major, minor or patch, inferred from Conventional Commits since
+          the last release tag in --history
+        
+        A major, minor or patch bump of a pre-release completes it when the
+        pre-release already targets that version (2.0.0-rc.1 → 2.0.0 for major).
+        Build metadata is dropped.
         
         Supports auto-detection: when using the default "VERSION", automatically
         checks both ./VERSION and ./version/VERSION locations.
         
         Args:
             source: Source directory (required, use --source=. for your project)
-            bump_type: Type of bump (major, minor, or patch)
+            bump_type: Type of bump (major, minor, patch, prerelease, finalize, or auto)
             version_file: Name of the version file (default: VERSION with auto-detection)
+            preid: Pre-release label for prerelease bumps (optional)
+            history: Repository with the .git directory (required for auto)
+            since: Revision to read commits after for auto (default: latest v* tag)
             
         Returns:
             Updated directory with bumped version
@@ -430,19 +1978,39 @@ class VersionManager:
             dagger call bump-version --source=. --bump-type=patch export --path=.
             dagger call bump-version --source=. --bump-type=minor export --path=.
             dagger call bump-version --source=. --bump-type=major export --path=.
+            dagger call bump-version --source=. --bump-type=prerelease --preid=beta export --path=.
+            dagger call bump-version --source=. --history=. --bump-type=auto export --path=.
         """
+        ctx = self._context()
+        
         # Resolve the version file path first (with auto-detection)
-        resolved_path, error = await self._resolve_version_file(source, version_file)
+        resolved_path, error = await self._resolve_version_file(source, version_file, ctx)
         if error:
             raise Exception(error)
         
         # Read current version
-        current_version, error = await self._read_version_file(source, version_file)
+        current_version, error = await self._read_version_file(source, version_file, ctx)
         if error:
             raise Exception(error)
         
+        # Infer the bump type from the commit history
+        bump_type = bump_type.lower()
+        if bump_type == "auto":
+            if history is None:
+                raise Exception(
+                    "❌ bump_type=auto needs --history (the repository whose commits "
+                    "decide the bump, e.g. --history=.)"
+                )
+            inference = await self._infer_bump(history, since)
+            if inference.bump_type is None:
+                raise Exception(
+                    f"❌ No feat, fix or breaking change commits since "
+                    f"{inference.since or 'the first commit'} (nothing to release)"
+                )
+            bump_type = inference.bump_type
+        
         # Calculate new version
-        new_version, error = self._bump_version_logic(current_version, bump_type.lower())
+        new_version, error = self._bump_version_logic(current_version, bump_type, preid)
         if error:
             raise Exception(error)
         
@@ -452,130 +2020,483 @@ class VersionManager:
         return updated_dir
 
     @function
-    async def release(
+    async def infer_bump(
         self,
         source: Annotated[
             dagger.Directory,
-            Doc("Source directory containing version files (use --source=. for your project)")
+            Doc("Repository whose commit history is read (use --source=. for your project)"),
+            Ignore(HISTORY_IGNORE)
         ],
-        version_file: Annotated[
+        since: Annotated[
+            Optional[str],
+            Doc("Revision to read commits after (default: latest tag matching --tag-prefix)")
+        ] = None,
+        tag_prefix: Annotated[
             str,
-            Doc("Name of the source version file (auto-detects VERSION or version/VERSION)")
-        ] = "VERSION",
-        target_file: Annotated[
+            Doc("Prefix of release tags")
+        ] = "v",
+        use_cache: Annotated[
+            bool,
+            Doc("Resume from the last analyzed commit instead of rescanning the history")
+        ] = True
+    ) -> str:
+        """
+        Infer the next bump type from Conventional Commits since the last release.
+        
+        A breaking change (``feat!:`` or a ``BREAKING CHANGE:`` footer) means
+        major, ``feat`` means minor and ``fix`` means patch; other types don't
+        warrant a release. git log runs in a container and is read as a stream
+        that stops at the first breaking change. The last analyzed commit is
+        kept in a cache volume, so repeated calls only read new commits.
+        
+        Args:
+            source: Repository directory (only .git is uploaded)
+            since: Revision to read commits after (default: latest release tag)
+            tag_prefix: Prefix of release tags (default: v)
+            use_cache: Resume from the last analyzed commit (default: true)
+            
+        Returns:
+            JSON object with bump_type (null if nothing to release), the number
+            of commits scanned, the revision range and the cached resume point
+            
+        Example:
+            dagger call infer-bump --source=.
+            dagger call infer-bump --source=. --since=origin/release-1.x
+        """
+        inference = await self._infer_bump(source, since, tag_prefix, use_cache)
+        return json.dumps(inference.to_dict(), indent=2, ensure_ascii=False)
+
+    @function
+    async def analyze_tags(
+        self,
+        source: Annotated[
+            Optional[dagger.Directory],
+            Doc("Repository whose .git tags are analyzed (use --source=. for your project)"),
+            Ignore(TAGS_IGNORE)
+        ] = None,
+        tags: Annotated[
+            Optional[list[str]],
+            Doc("Tag names to analyze instead of reading them from --source")
+        ] = None,
+        prefix: Annotated[
             str,
-            Doc("Name of the target file to sync")
-        ] = "galaxy.yml",
-        version_pattern: Annotated[
+            Doc("Prefix of release tags, stripped before parsing")
+        ] = "v",
+        bump_type: Annotated[
             str,
-            Doc("Regex pattern to match version line in target file")
-        ] = r'^version:.*$',
-        tag_message: Annotated[
+            Doc("Bump type used to compute the next free version")
+        ] = "patch",
+        preid: Annotated[
             Optional[str],
-            Doc("Custom git tag message (defaults to 'Release X.Y.Z')")
+            Doc("Pre-release label for prerelease bumps")
         ] = None
     ) -> str:
         """
-        Complete release workflow: sync version, validate, and generate git commands.
-        
-        This function orchestrates the release process by:
-        1. Syncing version from source to target file
-        2. Validating consistency
-        3. Generating git commands for manual execution
+        Analyze the release tag history of a repository.
         
-        Supports auto-detection: when using the default "VERSION", automatically
-        checks both ./VERSION and ./version/VERSION locations.
+        Tags are read from .git/refs/tags and .git/packed-refs (git itself is
+        not run), or taken from --tags. They are parsed once into a sorted
+        index, which answers the latest release of every major line, the gaps
+        in the release sequence and the next version that isn't tagged yet.
         
         Args:
-            source: Source directory (required, use --source=. for your project)
-            version_file: Name of the source version file (default: VERSION with auto-detection)
-            target_file: Name of the target file to sync (default: galaxy.yml)
-            version_pattern: Regex pattern to match version line
-            tag_message: Custom git tag message (optional)
+            source: Repository directory (required unless --tags is given)
+            tags: Tag names to analyze (optional, e.g. from git tag --list)
+            prefix: Prefix of release tags (default: v)
+            bump_type: Bump type of the next version (default: patch)
+            preid: Pre-release label for prerelease bumps (optional)
             
         Returns:
-            Release instructions with git commands
+            JSON object with the sorted versions, latest releases, gaps,
+            next free version and the tags that aren't versions
             
         Example:
-            dagger call release --source=.
-            dagger call release --source=. --tag-message="Major release with breaking changes"
+            dagger call analyze-tags --source=.
+            dagger call analyze-tags --source=. --bump-type=minor
+            dagger call analyze-tags --tags=v1.0.0,v1.1.0,v2.0.0-rc.1 --bump-type=prerelease
+        """
+        # Deferred: only tag analysis indexes tags
+        from .semver import BUMP_TYPES
+        from .tags import TagIndex
+        
+        bump_type = bump_type.lower()
+        if bump_type not in BUMP_TYPES:
+            raise Exception(
+                f'❌ Invalid bump_type: {bump_type} '
+                f'(use "major", "minor", "patch", "prerelease", or "finalize")'
+            )
+        
+        if tags is None:
+            if source is None:
+                raise Exception("❌ Either --source or --tags is required")
+            tags = await self._read_tag_names(source, self._context())
+        
+        index = TagIndex(tags, prefix)
+        try:
+            summary = index.to_dict(bump_type, preid)
+        except ValueError as e:
+            raise Exception(f"❌ Cannot compute the next version: {str(e)}")
+        
+        return json.dumps(summary, indent=2, ensure_ascii=False)
+
+    def _changelog_content(self, existing: Optional[str], version: str, entry: str) -> str:
+        """
+        Add a release section to a changelog.
+        
+        The section is inserted above the newest existing release section
+        (the first "## " heading), below any title and introduction. A new
+        changelog starts with a "# Changelog" title.
+        
+        Args:
+            existing: Current changelog contents, or None if there is none
+            version: Released version
+            entry: Release notes (Markdown)
+            
+        Returns:
+            Updated changelog contents
+        """
+        from datetime import date
+        
+        section = f"## [{version}] - {date.today().isoformat()}\n\n{entry.strip()}\n"
+        if existing is None or not existing.strip():
+            return f"# Changelog\n\n{section}"
+        
+        lines = existing.splitlines(keepends=True)
+        for index, line in enumerate(lines):
+            if line.startswith("## "):
+                return "".join(lines[:index]) + section + "\n" + "".join(lines[index:])
+        return existing.rstrip("\n") + "\n\n" + section
+
+    async def _release(
+        self,
+        source: dagger.Directory,
+        version_file: str,
+        targets: Optional[list[tuple[str, str]]],
+        tag_message: Optional[str],
+        bump_type: Optional[str],
+        preid: Optional[str],
+        changelog: Optional[str],
+        changelog_file: str
+    ) -> ReleaseResult:
         """
+        Build the release directory and report.
+        
+        Every file of the release (bumped version file, targets, changelog)
+        is computed first and written in one batched write, then validated
+        from the written contents without re-reading them.
+        
+        Args:
+            source: Directory containing the version files
+            version_file: Name of the source version file
+            targets: List of (target_file, version_pattern) pairs (None reads
+                them from the manifest)
+            tag_message: Custom git tag message
+            bump_type: Bump applied before syncing, if any
+            preid: Pre-release label for prerelease bumps
+            changelog: Release notes to add to the changelog, if any
+            changelog_file: Path of the changelog
+            
+        Returns:
+            Release result; on failure the report holds the error and the
+            directory is the unchanged source
+        """
+        # Every step shares one context, so each file is fetched at most once
+        ctx = self._context()
+        await self._snapshot(
+            source, ctx, version_file, *(target for target, _ in targets or ()),
+            changelog_file if changelog else None
+        )
+        
+        def failed(error: str) -> ReleaseResult:
+            return ReleaseResult(version="", report=error, directory=source, files=[])
+        
+        try:
+            version_file, targets, formats = await self._resolve_targets(
+                source, version_file, targets, ctx
+            )
+        except Exception as e:
+            return failed(str(e))
+        
         # Resolve version file path for git commands
-        resolved_path, error = await self._resolve_version_file(source, version_file)
+        resolved_path, error = await self._resolve_version_file(source, version_file, ctx)
         if error:
-            return error
+            return failed(error)
         
         # Read version
-        version, error = await self._read_version_file(source, version_file)
+        version, error = await self._read_version_file(source, version_file, ctx)
         if error:
-            return error
+            return failed(error)
+        
+        files: dict[str, str] = {}
+        messages = []
         
-        # Sync version
+        # Bump version
+        if bump_type:
+            new_version, error = self._bump_version_logic(version, bump_type.lower(), preid)
+            if error:
+                return failed(error)
+            messages.append(f"✅ Bumped {resolved_path}: {version} → {new_version}")
+            version = new_version
+            files[resolved_path] = version
+        
+        # Sync version into every target
         try:
-            updated_src = await self.sync_version(
-                source=source,
-                version_file=version_file,
-                target_file=target_file,
-                version_pattern=version_pattern
-            )
-            sync_msg = f"✅ Synced {version} → {target_file}"
+            rendered = await self._render_targets(source, version, targets, ctx, formats)
         except Exception as e:
-            return str(e)
+            return failed(str(e))
+        files.update(rendered)
+        messages.extend(f"✅ Synced {version} → {target_file}" for target_file in rendered)
+        
+        # Add the release notes
+        if changelog:
+            existing = (
+                await ctx.read(source, changelog_file)
+                if await ctx.exists(source, changelog_file) else None
+            )
+            files[changelog_file] = self._changelog_content(existing, version, changelog)
+            messages.append(f"✅ Added {version} to {changelog_file}")
         
-        # Validate
-        validation_msg = await self.validate_version(
-            source=updated_src,
-            version_file=version_file,
-            target_file=target_file,
-            version_pattern=version_pattern
-        )
+        # One batched write of every release file
+        updated_src = ctx.with_new_files(source, files)
+        
+        # Validate (answered from the written content, no re-read)
+        checks = await asyncio.gather(*(
+            self._check_target(
+                updated_src, resolved_path, version, target_file, version_pattern, ctx
+            )
+            for target_file, version_pattern in targets
+        ))
+        messages.extend(dict.fromkeys(check.message for check in checks))
         
         # Generate git commands using resolved path
         tag_msg = tag_message or f"Release {version}"
+        changed = list(dict.fromkeys([resolved_path, *files]))
+        summary = "\n".join(messages)
         
-        result = f"""🚀 Release {version} Ready
+        report = f"""🚀 Release {version} Ready
 
-{sync_msg}
-{validation_msg}
+{summary}
 
 Next steps (run these commands manually):
 
-  git add {resolved_path} {target_file}
+  git add {' '.join(changed)}
   git commit -m "Release {version}"
   git tag -a v{version} -m "{tag_msg}"
   git push && git push --tags
 
 Note: Review changes before committing!
 """
-        return result
+        return ReleaseResult(version=version, report=report, directory=updated_src, files=changed)
+
+    @function
+    async def release(
+        self,
+        source: Annotated[
+            dagger.Directory,
+            Doc("Source directory containing version files (use --source=. for your project)"),
+            Ignore(SOURCE_IGNORE)
+        ],
+        version_file: Annotated[
+            str,
+            Doc("Name of the source version file (auto-detects VERSION or version/VERSION)")
+        ] = "VERSION",
+        target_file: Annotated[
+            Optional[str],
+            Doc("Name of the target file to sync (default: .versions.toml or galaxy.yml)")
+        ] = None,
+        version_pattern: Annotated[
+            Optional[str],
+            Doc("Regex pattern to match version line in target file")
+        ] = None,
+        tag_message: Annotated[
+            Optional[str],
+            Doc("Custom git tag message (defaults to 'Release X.Y.Z')")
+        ] = None,
+        targets: Annotated[
+            Optional[list[str]],
+            Doc("Target files to sync as PATH or PATH:PATTERN (replaces --target-file)")
+        ] = None,
+        bump_type: Annotated[
+            Optional[str],
+            Doc("Bump the version first: major, minor, patch, prerelease, or finalize")
+        ] = None,
+        preid: Annotated[
+            Optional[str],
+            Doc("Pre-release label for prerelease bumps")
+        ] = None,
+        changelog: Annotated[
+            Optional[str],
+            Doc("Release notes to add to the changelog (Markdown)")
+        ] = None,
+        changelog_file: Annotated[
+            str,
+            Doc("Changelog updated with --changelog")
+        ] = "CHANGELOG.md"
+    ) -> ReleaseResult:
+        """
+        Complete release workflow: bump, sync, changelog, validate and git commands.
+        
+        This function orchestrates the release process by:
+        1. Optionally bumping the version
+        2. Syncing the version to every target file
+        3. Optionally adding release notes to the changelog
+        4. Validating consistency
+        5. Generating git commands for manual execution
+        
+        All release files are written to the returned directory in one batched
+        write, so exporting it is the only step left; nothing has to be synced
+        again. Without --target-file or --targets, the targets listed in
+        .versions.toml are synced.
+        
+        Supports auto-detection: when using the default "VERSION", automatically
+        checks both ./VERSION and ./version/VERSION locations.
+        
+        Args:
+            source: Source directory (required, use --source=. for your project)
+            version_file: Name of the source version file (default: VERSION with auto-detection)
+            target_file: Name of the target file to sync (default: manifest targets or galaxy.yml)
+            version_pattern: Regex pattern to match version line
+            tag_message: Custom git tag message (optional)
+            targets: Target specs replacing target_file (optional)
+            bump_type: Bump applied before syncing (optional)
+            preid: Pre-release label for prerelease bumps (optional)
+            changelog: Release notes for the changelog (optional)
+            changelog_file: Changelog path (default: CHANGELOG.md)
+            
+        Returns:
+            Release with the report, the released version, the changed files
+            and the updated directory
+            
+        Example:
+            dagger call release --source=. report
+            dagger call release --source=. directory export --path=.
+            dagger call release --source=. --bump-type=minor --changelog="- New sync-all" directory export --path=.
+            dagger call release --source=. --targets=pyproject.toml,Chart.yaml report
+        """
+        try:
+            if targets:
+                parsed = self._parse_target_specs(targets)
+            else:
+                parsed = self._explicit_targets(target_file, version_pattern)
+        except Exception as e:
+            return ReleaseResult(version="", report=str(e), directory=source, files=[])
+        
+        return await self._release(
+            source, version_file, parsed, tag_message, bump_type, preid, changelog, changelog_file
+        )
+
+    @function
+    async def profile_release(
+        self,
+        source: Annotated[
+            dagger.Directory,
+            Doc("Source directory containing version files (use --source=. for your project)"),
+            Ignore(SOURCE_IGNORE)
+        ],
+        version_file: Annotated[
+            str,
+            Doc("Name of the source version file (auto-detects VERSION or version/VERSION)")
+        ] = "VERSION",
+        target_file: Annotated[
+            Optional[str],
+            Doc("Name of the target file to sync (default: .versions.toml or galaxy.yml)")
+        ] = None,
+        version_pattern: Annotated[
+            Optional[str],
+            Doc("Regex pattern to match version line in target file")
+        ] = None,
+        tag_message: Annotated[
+            Optional[str],
+            Doc("Custom git tag message (defaults to 'Release X.Y.Z')")
+        ] = None,
+        targets: Annotated[
+            Optional[list[str]],
+            Doc("Target files to sync as PATH or PATH:PATTERN (replaces --target-file)")
+        ] = None,
+        bump_type: Annotated[
+            Optional[str],
+            Doc("Bump the version first: major, minor, patch, prerelease, or finalize")
+        ] = None,
+        preid: Annotated[
+            Optional[str],
+            Doc("Pre-release label for prerelease bumps")
+        ] = None,
+        changelog: Annotated[
+            Optional[str],
+            Doc("Release notes to add to the changelog (Markdown)")
+        ] = None,
+        changelog_file: Annotated[
+            str,
+            Doc("Changelog updated with --changelog")
+        ] = "CHANGELOG.md"
+    ) -> str:
+        """
+        Run the release workflow and report where its time was spent.
+        
+        Every engine round-trip (file reads, directory listings, writes) and
+        internal helper is recorded with its call count, bytes and latency.
+        Helper timings are inclusive of the engine calls they make.
+        
+        Args:
+            source: Source directory (required, use --source=. for your project)
+            version_file: Name of the source version file (default: VERSION with auto-detection)
+            target_file: Name of the target file to sync (default: manifest targets or galaxy.yml)
+            version_pattern: Regex pattern to match version line
+            tag_message: Custom git tag message (optional)
+            targets: Target specs replacing target_file (optional)
+            bump_type: Bump applied before syncing (optional)
+            preid: Pre-release label for prerelease bumps (optional)
+            changelog: Release notes for the changelog (optional)
+            changelog_file: Changelog path (default: CHANGELOG.md)
+            
+        Returns:
+            JSON object with the release report under "result", the timing
+            breakdown under "profile" and the engine queue under "scheduler"
+            
+        Example:
+            dagger call profile-release --source=.
+        """
+        with profiling() as profiler:
+            result = await self.release(
+                source, version_file, target_file, version_pattern, tag_message,
+                targets, bump_type, preid, changelog, changelog_file
+            )
+        
+        return json.dumps(
+            {
+                "result": result.report,
+                "profile": profiler.to_dict(),
+                "scheduler": self._engine().stats.to_dict(),
+            },
+            indent=2,
+            ensure_ascii=False
+        )
 
+    @profiled
     async def _detect_project_type(
         self,
-        source: dagger.Directory
+        source: dagger.Directory,
+        ctx: Optional[CallContext] = None
     ) -> tuple[Optional[str], Optional[str], Optional[str]]:
         """
         Detect project type based on marker files.
         
         Args:
             source: Directory to check for marker files
+            ctx: Request-scoped cache of the current call
             
         Returns:
             Tuple of (project_type, target_file, version_pattern) or (None, None, None)
         """
-        # Priority order: Ansible > Python > Helm > Docker
-        project_types = [
-            ("galaxy.yml", "Ansible Collection", "galaxy.yml", r'^version:.*$'),
-            ("pyproject.toml", "Python", "pyproject.toml", r'^version\s*=\s*".*"$'),
-            ("Chart.yaml", "Helm", "Chart.yaml", r'^version:.*$'),
-            ("Dockerfile", "Docker", "Dockerfile", r'LABEL version=".*"$'),
-        ]
-        
-        for marker_file, project_type, target_file, pattern in project_types:
-            try:
-                await source.file(marker_file).contents()
+        # Probe every marker concurrently (they share one root listing), then
+        # pick the winner in priority order
+        ctx = ctx or self._context()
+        found = await asyncio.gather(
+            *(self._file_exists(source, marker, ctx) for marker, *_ in PROJECT_TYPES)
+        )
+        for exists, (_, project_type, target_file, pattern) in zip(found, PROJECT_TYPES):
+            if exists:
                 return project_type, target_file, pattern
-            except Exception:
-                continue
         
         return None, None, None
 
@@ -584,25 +2505,71 @@ Note: Review changes before committing!
         hook_type: str,
         version: str,
         target_file: str,
-        version_pattern: str
+        version_pattern: str,
+        use_cache: bool = True,
+        manifest: Optional["Manifest"] = None
     ) -> str:
         """
         Generate git hook script content.
         
+        The hook first runs an embedded stdlib-Python check that needs no
+        Dagger engine. It only falls back to the Dagger call when python3 is
+        missing or the fast check can't decide. Results are cached under the
+        git directory, keyed by a hash of the VERSION files, the target files
+        and the patterns; set DVM_NO_CACHE=1 to bypass the cache.
+        
         Args:
             hook_type: Type of hook (pre-commit or pre-push)
             version: Current version for metadata header
             version: Module version for metadata
             target_file: Target file for validation
             version_pattern: Regex pattern for version matching
+            use_cache: Whether the hook caches results under .git/
+            manifest: Manifest whose root targets are checked instead; the
+                Dagger fallback then reads the manifest too
             
         Returns:
             Hook script content
         """
+        # Deferred: only hook installation renders the embedded check
+        from datetime import datetime
+        
+        from .hooks import (
+            CACHE_DIRECTORY,
+            FAST_CHECK_DELIMITER,
+            FAST_CHECK_MISMATCH,
+            FAST_CHECK_OK,
+            FAST_CHECK_UNDECIDED,
+            VERSION_FILES,
+            render_fast_check,
+        )
+        
         timestamp = datetime.utcnow().isoformat() + "Z"
         
-        # Escape pattern for shell
-        escaped_pattern = version_pattern.replace('"', '\\"')
+        if manifest is None:
+            # Escape pattern for shell
+            escaped_pattern = version_pattern.replace('"', '\\"')
+            fast_check = render_fast_check(target_file, version_pattern)
+            validate_args = (
+                f' \\\n    --target-file={target_file}'
+                f' \\\n    --version-pattern="{escaped_pattern}"'
+            )
+        else:
+            # The manifest names the targets, so the fallback needs no flags
+            (target_file, version_pattern), *extra_targets = manifest.root.pairs()
+            version_file = manifest.root.version_file
+            fast_check = render_fast_check(
+                target_file, version_pattern, extra_targets,
+                VERSION_FILES if version_file == "VERSION" else (version_file,)
+            )
+            validate_args = ""
+        if use_cache:
+            cache_setup = (
+                'DVM_CACHE_DIR="$(git rev-parse --git-dir 2>/dev/null)"\n'
+                f'[ -n "$DVM_CACHE_DIR" ] && DVM_CACHE_DIR="$DVM_CACHE_DIR/{CACHE_DIRECTORY}"'
+            )
+        else:
+            cache_setup = 'DVM_CACHE_DIR=""'
         
         hook_content = f"""#!/bin/bash
 # DAGGER-VERSION-MANAGER: v{version}
@@ -613,14 +2580,46 @@ Note: Review changes before committing!
 
 echo "Checking version consistency..."
 
-if ! dagger call version-manager validate-version \\
-    --target-file={target_file} \\
-    --version-pattern="{escaped_pattern}" 2>&1 | grep -q "✅"; then
+cd "$(git rev-parse --show-toplevel 2>/dev/null || pwd)" || exit 1
+
+# Result cache keyed by the content of the checked files
+{cache_setup}
+export DVM_CACHE_DIR
+
+dvm_check() {{
+    python3 - "$@" <<'{FAST_CHECK_DELIMITER}'
+{fast_check}{FAST_CHECK_DELIMITER}
+}}
+
+# Fast path: {FAST_CHECK_OK} = consistent, {FAST_CHECK_MISMATCH} = mismatch, anything else = undecided
+status={FAST_CHECK_UNDECIDED}
+if [ -z "$DVM_HOOK_FORCE_DAGGER" ] && command -v python3 >/dev/null 2>&1; then
+    dvm_check check
+    status=$?
+fi
+
+if [ "$status" -eq {FAST_CHECK_OK} ]; then
+    echo "✅ Version check passed"
+    exit 0
+fi
+if [ "$status" -eq {FAST_CHECK_MISMATCH} ]; then
+    echo "❌ Version mismatch detected!"
+    echo "Run: dagger call version-manager sync-version --source=. export --path=."
+    exit 1
+fi
+
+# Slow path: let the module decide
+if ! dagger call version-manager validate-version --source=.{validate_args} 2>&1 | grep -q "✅"; then
     echo "❌ Version mismatch detected!"
-    echo "Run: dagger call version-manager sync-version export --path=."
+    echo "Run: dagger call version-manager sync-version --source=. export --path=."
     exit 1
 fi
 
+# Remember the passing inputs so the next run skips the engine
+if command -v python3 >/dev/null 2>&1; then
+    dvm_check record {FAST_CHECK_OK}
+fi
+
 echo "✅ Version check passed"
 exit 0
 """
@@ -629,20 +2628,28 @@ exit 0
     async def _check_existing_hook(
         self,
         source: dagger.Directory,
-        hook_path: str
+        hook_path: str,
+        ctx: Optional[CallContext] = None
     ) -> tuple[bool, bool]:
         """
         Check if hook exists and if it's managed by dagger-version-manager.
         
+        The hook contents are only read once the listing shows the file exists.
+        
         Args:
             source: Directory to check
             hook_path: Path to hook file (e.g., ".git/hooks/pre-commit")
+            ctx: Request-scoped cache of the current call
             
         Returns:
             Tuple of (exists, is_managed)
         """
+        ctx = ctx or self._context()
+        if not await self._file_exists(source, hook_path, ctx):
+            return False, False
+        
         try:
-            content = await source.file(hook_path).contents()
+            content = await ctx.read(source, hook_path)
             is_managed = "# DAGGER-VERSION-MANAGER:" in content
             return True, is_managed
         except Exception:
@@ -653,15 +2660,21 @@ exit 0
         self,
         source: Annotated[
             dagger.Directory,
-            Doc("Source directory containing project files (use --source=. for your project)")
-        ]
+            Doc("Source directory containing project files (use --source=. for your project)"),
+            Ignore(HOOKS_IGNORE)
+        ],
+        use_cache: Annotated[
+            bool,
+            Doc("Cache hook results under .git/ keyed by file contents")
+        ] = True
     ) -> dagger.Directory:
         """
         Install git hooks for automated version validation.
         
         This function sets up pre-commit and pre-push hooks that enforce version
         consistency across project files. The hooks are automatically configured
-        based on detected project type (Ansible, Python, Docker, or Helm).
+        based on detected project type (Ansible, Python, Docker, or Helm), or
+        check every target listed in .versions.toml when the project has one.
         
         The hooks will:
         - Block commits/pushes if versions are inconsistent
@@ -670,6 +2683,7 @@ exit 0
         
         Args:
             source: Source directory (required, use --source=. for your project)
+            use_cache: Cache hook results under .git/ keyed by file contents
             
         Returns:
             Updated directory with git hooks installed
@@ -681,18 +2695,21 @@ exit 0
             dagger call setup-git-hooks --source=. export --path=.
         """
         
+        # One snapshot (or one listing per directory) answers every existence
+        # query below; fetch all of them in a single concurrent round
+        ctx = self._context()
+        await self._snapshot(source, ctx)
+        await ctx.listing(source).prefetch(".", "version", ".git/hooks")
+        
         # Check for .git directory
-        try:
-            await source.directory(".git").entries()
-        except Exception:
+        if not await ctx.listing(source).is_directory(".git"):
             raise Exception(
                 "❌ Git repository not found (.git directory missing)\n"
                 "   Initialize git first: git init"
             )
         
         # Check if this is a Dagger module project
-        try:
-            await source.file("dagger.json").contents()
+        if await self._file_exists(source, "dagger.json", ctx):
             # This is a Dagger module - skip hook installation
             raise Exception(
                 "ℹ️  Detected Dagger module project\n"
@@ -706,28 +2723,31 @@ exit 0
                 "\n"
                 "No hooks installed."
             )
-        except Exception as e:
-            # If the exception message contains our marker, re-raise it
-            if "Detected Dagger module project" in str(e):
-                raise e
-            # Otherwise, it's just file not found - continue with normal flow
-            pass
         
-        # Detect project type
-        project_type, target_file, version_pattern = await self._detect_project_type(source)
-        
-        if not project_type:
-            raise Exception(
-                "❌ Could not detect project type\n"
-                "   Supported marker files:\n"
-                "   - galaxy.yml (Ansible Collection)\n"
-                "   - pyproject.toml (Python)\n"
-                "   - Chart.yaml (Helm)\n"
-                "   - Dockerfile (Docker)"
+        # The manifest names the targets; otherwise detect the project type
+        manifest = await self._load_manifest(source, ctx)
+        if manifest is not None:
+            version_file, targets, _ = await self._resolve_targets(source, "VERSION", None, ctx)
+            target_file, version_pattern = targets[0]
+        else:
+            project_type, target_file, version_pattern = await self._detect_project_type(
+                source, ctx
             )
         
+            if not project_type:
+                raise Exception(
+                    "❌ Could not detect project type\n"
+                    "   Supported marker files:\n"
+                    "   - galaxy.yml (Ansible Collection)\n"
+                    "   - pyproject.toml (Python)\n"
+                    "   - Chart.yaml (Helm)\n"
+                    "   - Dockerfile (Docker)\n"
+                    f"   Or list the targets in {MANIFEST_FILE}"
+                )
+            version_file = "VERSION"
+        
         # Get current version for metadata
-        version, error = await self._read_version_file(source, "VERSION")
+        version, error = await self._read_version_file(source, version_file, ctx)
         if error:
             raise Exception(error)
         
@@ -741,7 +2761,7 @@ exit 0
         updated_dir = source
         
         for hook_path, hook_type in hooks_to_install:
-            exists, is_managed = await self._check_existing_hook(updated_dir, hook_path)
+            exists, is_managed = await self._check_existing_hook(updated_dir, hook_path, ctx)
             
             if exists and not is_managed:
                 warnings.append(
@@ -752,9 +2772,11 @@ exit 0
             
             # Generate and install hook
             hook_content = self._generate_hook_content(
-                hook_type, version, target_file, version_pattern
+                hook_type, version, target_file, version_pattern, use_cache, manifest
+            )
+            updated_dir = ctx.with_new_file(
+                updated_dir, hook_path, hook_content, permissions=0o755
             )
-            updated_dir = updated_dir.with_new_file(hook_path, hook_content, permissions=0o755)
         
         # Build success message
         if warnings:
@@ -0,0 +1,166 @@
+"""Bump inference from Conventional Commits since the last release tag."""
+
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+# Cache volume with each repository's commit-graph and last analyzed commits
+CACHE_VOLUME = "dagger-version-manager-commits"
+CACHE_PATH = "/cache"
+
+# Bump levels printed by the scan, lowest first
+BUMP_LEVELS = ("none", "patch", "minor", "major")
+
+# POSIX sh + awk, runnable in the git image and on any developer machine.
+#
+# Inputs (environment):
+#   DVM_SINCE       Revision to start after (default: nearest DVM_TAG_PREFIX* tag)
+#   DVM_TAG_PREFIX  Prefix of release tags
+#   DVM_CACHE_DIR   Directory of the resume cache (empty disables it)
+#
+# git log streams "<sha> US <message> RS" records, newest first, into awk,
+# which stops reading as soon as a breaking change is found; git then exits
+# on the closed pipe instead of formatting the rest of the history.
+#
+# The cache keeps, per repository (keyed by its origin URL):
+#   - a split commit-graph, attached as an alternate object directory and
+#     extended with only the new commits on every call, so finding the last
+#     tag and limiting the log to the release range don't parse every commit
+#   - "<head> <bump>" per starting commit. When the cached head is an ancestor
+#     of HEAD only the commits after it are scanned and the cached bump is the
+#     floor; a cached major bump skips the scan entirely.
+SCAN_SCRIPT = r'''set -eu
+since="${DVM_SINCE:-}"
+tag_prefix="${DVM_TAG_PREFIX:-v}"
+cache_dir="${DVM_CACHE_DIR:-}"
+
+state_dir=""
+if [ -n "$cache_dir" ]; then
+    repo_key=$(git config --get remote.origin.url 2>/dev/null | cksum | cut -d " " -f 1)
+    state_dir="$cache_dir/$repo_key"
+    mkdir -p "$state_dir/objects/info"
+    GIT_ALTERNATE_OBJECT_DIRECTORIES="$state_dir/objects${GIT_ALTERNATE_OBJECT_DIRECTORIES:+:$GIT_ALTERNATE_OBJECT_DIRECTORIES}"
+    export GIT_ALTERNATE_OBJECT_DIRECTORIES
+    git commit-graph write --reachable --split --object-dir="$state_dir/objects" >/dev/null 2>&1 || true
+fi
+
+if [ -z "$since" ]; then
+    since=$(git describe --tags --abbrev=0 --match "$tag_prefix*" HEAD 2>/dev/null || true)
+fi
+head=$(git rev-parse --verify HEAD)
+base=""
+if [ -n "$since" ]; then
+    base=$(git rev-parse --verify "$since^{commit}")
+fi
+
+entry=""
+resume=""
+bump=none
+if [ -n "$state_dir" ]; then
+    entry="$state_dir/v1-${base:-root}"
+    if [ -f "$entry" ]; then
+        cached_head=""
+        cached_bump=""
+        read -r cached_head cached_bump < "$entry" || true
+        if [ -n "$cached_head" ] && git merge-base --is-ancestor "$cached_head" "$head" 2>/dev/null; then
+            resume=$cached_head
+            bump=$cached_bump
+        fi
+    fi
+fi
+
+scanned=0
+if [ "$bump" != major ] && [ "$resume" != "$head" ]; then
+    result=$(git log --format='%H%x1f%B%x1e' "$head" --not $base $resume | awk -v start="$bump" '
+        BEGIN {
+            RS = sprintf("%c", 30)
+            FS = sprintf("%c", 31)
+            split("none patch minor major", names, " ")
+            best = 0
+            for (i = 1; i <= 4; i++) if (names[i] == start) best = i - 1
+        }
+        {
+            sub(/^\n+/, "")
+            if ($0 == "") next
+            scanned++
+            message = $2
+            header = message
+            sub(/\n.*/, "", header)
+            header = tolower(header)
+            if (header ~ /^[a-z]+(\([^)]*\))?!:/ || message ~ /(^|\n)BREAKING[ -]CHANGE:/) level = 3
+            else if (header ~ /^feat(\([^)]*\))?:/) level = 2
+            else if (header ~ /^fix(\([^)]*\))?:/) level = 1
+            else level = 0
+            if (level > best) best = level
+            if (best == 3) exit
+        }
+        END { print names[best + 1], scanned + 0 }
+    ')
+    bump=${result% *}
+    scanned=${result#* }
+fi
+
+if [ -n "$entry" ]; then
+    printf '%s %s\n' "$head" "$bump" > "$entry.tmp.$$"
+    mv "$entry.tmp.$$" "$entry"
+fi
+
+echo "bump=$bump"
+echo "scanned=$scanned"
+echo "since=$since"
+echo "head=$head"
+echo "resumed_from=$resume"
+'''
+
+
+@dataclass
+class BumpInference:
+    """
+    Bump type inferred from the commits since a release.
+
+    Attributes:
+        bump_type: major, minor or patch; None if no commit warrants a release
+        scanned: Number of commit messages read in this call
+        since: Revision the history was read from ("" for the whole history)
+        head: Commit the history was read up to
+        resumed_from: Cached commit the scan resumed after, if any
+    """
+
+    bump_type: Optional[str]
+    scanned: int
+    since: str
+    head: str
+    resumed_from: Optional[str] = None
+
+    @classmethod
+    def from_output(cls, output: str) -> "BumpInference":
+        """
+        Parse the key=value lines printed by the scan script.
+
+        Args:
+            output: Standard output of SCAN_SCRIPT
+
+        Returns:
+            Parsed inference
+
+        Raises:
+            ValueError: If the output is incomplete or holds an unknown bump
+        """
+        values = dict(line.split("=", 1) for line in output.splitlines() if "=" in line)
+        try:
+            bump, scanned = values["bump"], int(values["scanned"])
+            since, head = values["since"], values["head"]
+        except (KeyError, ValueError):
+            raise ValueError(f"unexpected commit scan output: {output!r}")
+        if bump not in BUMP_LEVELS:
+            raise ValueError(f"unknown bump level: {bump!r}")
+        return cls(
+            None if bump == "none" else bump,
+            scanned,
+            since,
+            head,
+            values.get("resumed_from") or None,
+        )
+
+    def to_dict(self) -> dict:
+        """Convert to plain data."""
+        return asdict(self)
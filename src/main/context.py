@@ -0,0 +1,269 @@
+"""Request-scoped state shared by the helpers of a single top-level call."""
+
+from collections import Counter
+from typing import Any, Optional
+
+import dagger
+from dagger import dag
+
+from .listing import DirectoryListing
+from .profiler import measure
+
+
+class CallContext:
+    """
+    Memoize engine reads for the duration of one top-level function call.
+
+    Resolved version file paths, file contents and parsed versions are cached
+    per directory identity and path, so every file is fetched at most once per
+    call. Directories derived through :meth:`with_new_file` or
+    :meth:`with_new_files` inherit the cache of their parent and answer reads of
+    the files written through them without contacting the engine.
+
+    Engine queries go through a scheduler, usually shared by every call of a
+    VersionManager, which bounds how many are in flight and merges identical
+    queries.
+
+    Args:
+        scheduler: Engine call scheduler (a new one is created when omitted)
+        client: Creates the new directories the context builds on (``dag``
+            when omitted)
+
+    Attributes:
+        fetches: Number of engine content fetches per file path
+    """
+
+    def __init__(
+        self,
+        scheduler: Optional["EngineScheduler"] = None,
+        client: Optional[dagger.Client] = None
+    ):
+        if scheduler is None:
+            # Deferred: calls normally share their instance's scheduler
+            from .scheduler import EngineScheduler
+            scheduler = EngineScheduler()
+        self.scheduler = scheduler
+        self.client = client if client is not None else dag
+        # Directory objects are kept alive so their id() can't be reused
+        self._directories: dict[int, dagger.Directory] = {}
+        self._parents: dict[int, tuple[int, dict[str, str]]] = {}
+        self._listings: dict[int, DirectoryListing] = {}
+        self._contents: dict[tuple[int, str], str] = {}
+        self._errors: dict[tuple[int, str], Exception] = {}
+        self._memo: dict[tuple[str, int, str], Any] = {}
+        self.fetches: Counter[str] = Counter()
+
+    def _key(self, source: dagger.Directory) -> int:
+        """Return the identity key of a directory, registering it if needed."""
+        key = id(source)
+        self._directories.setdefault(key, source)
+        return key
+
+    def _origin(self, source: dagger.Directory, path: str) -> tuple[int, Optional[str]]:
+        """
+        Find the directory that owns a path's content.
+
+        Returns:
+            Tuple of (directory_key, written_content). written_content is set
+            when the path was written through this context.
+        """
+        key = self._key(source)
+        while key in self._parents:
+            parent, written = self._parents[key]
+            if path in written:
+                return key, written[path]
+            key = parent
+        return key, None
+
+    def listing(self, source: dagger.Directory) -> DirectoryListing:
+        """Return the shared directory listing for a source directory."""
+        key, _ = self._origin(source, "")
+        if key not in self._listings:
+            self._listings[key] = DirectoryListing(self._directories[key], self.scheduler)
+        return self._listings[key]
+
+    async def exists(self, source: dagger.Directory, file_path: str) -> bool:
+        """
+        Check if a file exists, answering from cached listings.
+
+        Args:
+            source: Directory to check
+            file_path: Path to the file
+
+        Returns:
+            True if file exists, False otherwise
+        """
+        _, written = self._origin(source, file_path)
+        if written is not None:
+            return True
+        return await self.listing(source).exists(file_path)
+
+    async def read(self, source: dagger.Directory, file_path: str) -> str:
+        """
+        Read a file, fetching it from the engine at most once.
+
+        Failures are cached as well, so a missing file is not retried.
+
+        Args:
+            source: Directory containing the file
+            file_path: Path to the file
+
+        Returns:
+            File contents
+
+        Raises:
+            Exception: If the file can't be read
+        """
+        key, written = self._origin(source, file_path)
+        if written is not None:
+            return written
+
+        cache_key = (key, file_path)
+        if cache_key in self._contents:
+            return self._contents[cache_key]
+        if cache_key in self._errors:
+            raise self._errors[cache_key]
+
+        directory = self._directories[key]
+
+        async def fetch() -> str:
+            self.fetches[file_path] += 1
+            with measure("engine.file.contents") as span:
+                content = await directory.file(file_path).contents()
+                span.bytes = len(content.encode())
+            return content
+
+        try:
+            content = await self.scheduler.run(("contents", key, file_path), fetch)
+        except Exception as e:
+            self._errors[cache_key] = e
+            raise
+        self._contents[cache_key] = content
+        return content
+
+    def seed(self, source: dagger.Directory, snapshot: "Snapshot") -> None:
+        """
+        Answer later reads and existence checks from a snapshot.
+
+        Files over the snapshot's size cap are still fetched on demand.
+
+        Args:
+            source: Directory the snapshot was taken of
+            snapshot: Listings and contents captured in one query
+        """
+        key = self._key(source)
+        listing = self.listing(source)
+        for path, names in snapshot.entries.items():
+            listing.seed(path, names or [])
+        for path, content in snapshot.files.items():
+            if content is None:
+                self._errors.setdefault(
+                    (key, path), Exception(f"{path}: no such file or directory")
+                )
+            else:
+                self._contents.setdefault((key, path), content)
+
+    async def glob(self, source: dagger.Directory, pattern: str) -> list[str]:
+        """
+        List the files matching a glob pattern.
+
+        Args:
+            source: Directory to search
+            pattern: Glob pattern (e.g. "**/VERSION")
+
+        Returns:
+            Matching paths relative to the directory
+        """
+        async def query() -> list[str]:
+            with measure("engine.directory.glob") as span:
+                paths = await source.glob(pattern)
+                span.bytes = sum(len(path) for path in paths)
+            return paths
+
+        return await self.scheduler.run(("glob", self._key(source), pattern), query)
+
+    def with_new_file(
+        self,
+        source: dagger.Directory,
+        file_path: str,
+        contents: str,
+        **kwargs: Any
+    ) -> dagger.Directory:
+        """
+        Write a file and remember its contents for later reads in this call.
+
+        Args:
+            source: Directory to write into
+            file_path: Path of the file to write
+            contents: New file contents
+            **kwargs: Extra arguments for ``Directory.with_new_file``
+
+        Returns:
+            Updated directory
+        """
+        with measure("engine.directory.with_new_file") as span:
+            updated = source.with_new_file(file_path, contents, **kwargs)
+            span.bytes = len(contents.encode())
+        self._parents[self._key(updated)] = (self._key(source), {file_path: contents})
+        return updated
+
+    def with_new_files(
+        self,
+        source: dagger.Directory,
+        files: dict[str, str],
+        **kwargs: Any
+    ) -> dagger.Directory:
+        """
+        Write several files as one layer on top of a directory.
+
+        The files are written into a new, empty directory that is merged onto
+        the directory with a single ``with_directory``, instead of stacking one
+        write per file on the full tree.
+
+        Args:
+            source: Directory to write into
+            files: New contents by file path
+            **kwargs: Extra arguments for ``Directory.with_new_file``
+
+        Returns:
+            Updated directory (the directory itself if there is nothing to write)
+        """
+        if not files:
+            return source
+        if len(files) == 1:
+            (file_path, contents), = files.items()
+            return self.with_new_file(source, file_path, contents, **kwargs)
+
+        with measure("engine.directory.with_directory") as span:
+            overlay = self.client.directory()
+            for file_path, contents in files.items():
+                overlay = overlay.with_new_file(file_path, contents, **kwargs)
+            updated = source.with_directory(".", overlay)
+            span.bytes = sum(len(contents.encode()) for contents in files.values())
+        self._parents[self._key(updated)] = (self._key(source), dict(files))
+        return updated
+
+    def with_patch(self, source: dagger.Directory, patch: str) -> dagger.Directory:
+        """
+        Apply a unified diff to a directory.
+
+        Args:
+            source: Directory to patch
+            patch: Git-compatible unified diff
+
+        Returns:
+            Patched directory
+        """
+        with measure("engine.directory.with_patch") as span:
+            updated = source.with_patch(patch)
+            span.bytes = len(patch.encode())
+        return updated
+
+    def memo(self, kind: str, source: dagger.Directory, name: str) -> Optional[Any]:
+        """Return a memoized derived value, or None if not computed yet."""
+        return self._memo.get((kind, self._key(source), name))
+
+    def remember(self, kind: str, source: dagger.Directory, name: str, value: Any) -> Any:
+        """Memoize a value derived from a file (e.g. a resolved path or parsed version)."""
+        self._memo[(kind, self._key(source), name)] = value
+        return value
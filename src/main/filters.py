@@ -0,0 +1,102 @@
+"""Upload filters for the source directory of each function.
+
+The patterns follow .dockerignore semantics: a pattern matching a directory
+drops everything below it, ``!`` re-includes, and the last match wins.
+"""
+
+import re
+from functools import lru_cache
+from typing import Sequence
+
+from .monorepo import SKIPPED_DIRECTORIES
+
+# Marker files of the supported project types, in detection priority order
+MARKER_FILES = ["galaxy.yml", "pyproject.toml", "Chart.yaml", "Dockerfile"]
+
+# Version manifest at the source root
+MANIFEST_FILE = ".versions.toml"
+
+# Build outputs, dropped at the source root only: nested directories with
+# these names can hold real targets (e.g. deploy/target/values.yaml)
+BUILD_DIRECTORIES = ["build", "dist", "target"]
+
+# Tool caches that never hold a version file or target
+CACHE_DIRECTORIES = [".mypy_cache", ".pytest_cache"]
+
+# Dependency and cache directories at any depth, build outputs at the root
+HEAVY_DIRECTORIES = [
+    *(
+        f"**/{name}"
+        for name in sorted((SKIPPED_DIRECTORIES - {".git"}) | set(CACHE_DIRECTORIES))
+    ),
+    *BUILD_DIRECTORIES,
+]
+
+# Functions reading caller-chosen paths: drop only what can't be a target
+SOURCE_IGNORE = ["**/.git", *HEAVY_DIRECTORIES]
+
+# Monorepo discovery and sync: .versions.toml packages can target any file,
+# so like SOURCE_IGNORE only what can't be a target is dropped
+MONOREPO_IGNORE = ["**/.git", *HEAVY_DIRECTORIES]
+
+# Incremental monorepo validation also diffs against the git history
+CHANGED_IGNORE = [*MONOREPO_IGNORE, "!.git"]
+
+# Hook installation: the tree as for MONOREPO_IGNORE (manifest targets and version
+# files can be anywhere), plus HEAD and the existing hooks
+HOOKS_IGNORE = [*MONOREPO_IGNORE, "!.git/HEAD", "!.git/hooks"]
+
+# Tag analysis: only the tag references of the git directory
+TAGS_IGNORE = ["*", "!.git/packed-refs", "!.git/refs/tags"]
+
+# Commit history: only the git directory
+HISTORY_IGNORE = ["*", "!.git"]
+
+
+@lru_cache(maxsize=None)
+def glob_regex(pattern: str) -> "re.Pattern[str]":
+    """Translate a doublestar glob ("**/" spans any number of directories)."""
+    out = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+        elif pattern[i] == "*":
+            out.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            out.append("[^/]")
+            i += 1
+        else:
+            out.append(re.escape(pattern[i]))
+            i += 1
+    return re.compile("".join(out) + r"\Z")
+
+
+def is_ignored(path: str, patterns: Sequence[str]) -> bool:
+    """
+    Whether an upload filter drops a path, following .dockerignore rules.
+
+    A pattern matching any parent directory also matches the path, ``!``
+    re-includes and the last matching pattern wins.
+
+    Args:
+        path: Path relative to the directory root
+        patterns: Ignore patterns
+
+    Returns:
+        True if the path is filtered out
+    """
+    parts = path.split("/")
+    prefixes = ["/".join(parts[:depth]) for depth in range(1, len(parts) + 1)]
+    ignored = False
+    for pattern in patterns:
+        negated = pattern.startswith("!")
+        regex = glob_regex(pattern.lstrip("!"))
+        if any(regex.match(prefix) for prefix in prefixes):
+            ignored = not negated
+    return ignored
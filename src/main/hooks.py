@@ -0,0 +1,207 @@
+"""Self-contained version check embedded in generated git hooks."""
+
+from typing import Sequence
+
+from .patterns import VERSION_RE
+from .semver import SEMVER_RE
+
+# Exit codes of the embedded check; any other status (e.g. 1 for an uncaught
+# exception) is treated as undecided by the hook
+FAST_CHECK_OK = 0
+FAST_CHECK_MISMATCH = 10
+FAST_CHECK_UNDECIDED = 11
+
+# Heredoc delimiter wrapping the embedded check in the hook script
+FAST_CHECK_DELIMITER = "DVM_FAST_CHECK"
+
+# Location of the result cache, relative to the git directory
+CACHE_DIRECTORY = "dagger-version-manager/cache"
+
+# Maximum number of cached results; the least recently used are evicted
+CACHE_MAX_ENTRIES = 256
+
+# Bumped whenever the check logic changes, invalidating older entries
+CACHE_SCHEMA = 2
+
+# Version file locations checked when none is configured (exactly one must exist)
+VERSION_FILES = ("VERSION", "version/VERSION")
+
+# Stdlib-only validator mirroring validate_version. Anything it can't decide
+# exactly as the module would (missing or ambiguous VERSION file, unreadable
+# target, no matching line) exits with FAST_CHECK_UNDECIDED so the hook falls
+# back to the Dagger call.
+#
+# Results are cached in DVM_CACHE_DIR, keyed by a hash of the VERSION
+# locations, the target files and their patterns. "check" answers from the cache
+# or decides and stores the result; "record STATUS" stores the outcome of the
+# Dagger fallback for the same inputs.
+_FAST_CHECK_TEMPLATE = '''\
+import hashlib
+import os
+import re
+import sys
+
+TARGETS = {targets!r}
+VERSION_FILES = {version_files!r}
+VERSION_RE = re.compile({version_re!r})
+SEMVER_RE = re.compile({semver_re!r})
+CACHE_SCHEMA = {cache_schema!r}
+CACHE_MAX_ENTRIES = {cache_max_entries!r}
+INPUTS = tuple(dict.fromkeys(VERSION_FILES + tuple(path for path, _ in TARGETS)))
+
+
+def undecided(reason):
+    print("ℹ️  Fast check undecided (" + reason + "), falling back to Dagger", file=sys.stderr)
+    sys.exit({undecided})
+
+
+def read_bytes(path):
+    try:
+        with open(path, "rb") as handle:
+            return handle.read()
+    except OSError:
+        return None
+
+
+def decode(path, data):
+    if data is None:
+        undecided("cannot read " + path)
+    try:
+        return data.decode("utf-8")
+    except UnicodeDecodeError:
+        undecided("cannot decode " + path)
+
+
+def cache_entry(inputs):
+    cache_dir = os.environ.get("DVM_CACHE_DIR", "")
+    if not cache_dir or os.environ.get("DVM_NO_CACHE"):
+        return None
+    fields = [str(CACHE_SCHEMA), VERSION_RE.pattern, SEMVER_RE.pattern]
+    fields.extend(VERSION_FILES)
+    for path, pattern in TARGETS:
+        fields.extend((path, pattern))
+    digest = hashlib.sha256("\\0".join(fields).encode("utf-8"))
+    for path in INPUTS:
+        data = inputs[path]
+        digest.update(b"-" if data is None else b"+" + hashlib.sha256(data).digest())
+    return os.path.join(cache_dir, digest.hexdigest())
+
+
+def cache_get(entry):
+    try:
+        with open(entry, encoding="utf-8") as handle:
+            status, _, message = handle.read().partition("\\n")
+        os.utime(entry)
+        return int(status), message
+    except (OSError, ValueError):
+        return None
+
+
+def cache_put(entry, status, message=""):
+    try:
+        cache_dir = os.path.dirname(entry)
+        os.makedirs(cache_dir, exist_ok=True)
+        partial = entry + ".tmp" + str(os.getpid())
+        with open(partial, "w", encoding="utf-8") as handle:
+            handle.write(str(status) + "\\n" + message)
+        os.replace(partial, entry)
+
+        names = [name for name in os.listdir(cache_dir) if ".tmp" not in name]
+        if len(names) > CACHE_MAX_ENTRIES:
+            paths = sorted((os.path.join(cache_dir, name) for name in names), key=os.path.getmtime)
+            for path in paths[:len(paths) - CACHE_MAX_ENTRIES]:
+                os.remove(path)
+    except OSError:
+        pass
+
+
+def target_version(inputs, target_file, version_pattern):
+    try:
+        line_re = re.compile(version_pattern, re.MULTILINE)
+    except re.error:
+        undecided("pattern does not compile")
+
+    for line in decode(target_file, inputs[target_file]).split("\\n"):
+        if line.endswith("\\r"):
+            line = line[:-1]
+        if line_re.match(line):
+            match = VERSION_RE.search(line)
+            if match:
+                return match.group(0)
+    undecided("no version line in " + target_file)
+
+
+def check(inputs):
+    found = [path for path in VERSION_FILES if inputs[path] is not None]
+    if len(found) != 1:
+        undecided("no unique VERSION file")
+    version_file = found[0]
+    version = decode(version_file, inputs[version_file]).strip()
+    if not SEMVER_RE.match(version):
+        undecided("invalid version in " + version_file)
+
+    messages = []
+    for target_file, version_pattern in TARGETS:
+        found_version = target_version(inputs, target_file, version_pattern)
+        if found_version != version:
+            messages.append(
+                "⚠️  Mismatch: " + version_file + "=" + version + ", "
+                + target_file + "=" + found_version
+            )
+    if messages:
+        return {mismatch}, "\\n".join(messages)
+    return {ok}, ""
+
+
+inputs = dict((path, read_bytes(path)) for path in INPUTS)
+entry = cache_entry(inputs)
+if sys.argv[1:2] == ["record"]:
+    if entry is not None:
+        cache_put(entry, int(sys.argv[2]))
+    sys.exit(0)
+
+cached = cache_get(entry) if entry is not None else None
+if cached is not None:
+    status, message = cached
+else:
+    status, message = check(inputs)
+    if entry is not None:
+        cache_put(entry, status, message)
+if message:
+    print(message)
+sys.exit(status)
+'''
+
+
+def render_fast_check(
+    target_file: str,
+    version_pattern: str,
+    extra_targets: Sequence[tuple[str, str]] = (),
+    version_files: Sequence[str] = VERSION_FILES
+) -> str:
+    """
+    Render the Python source of the embedded version check.
+
+    The version expressions come from the shared pattern registry, so the
+    hook extracts versions exactly like validate_version does.
+
+    Args:
+        target_file: Target file to validate, relative to the repository root
+        version_pattern: Regex pattern matching the version line
+        extra_targets: More (target_file, version_pattern) pairs to validate
+        version_files: Candidate version files; exactly one must exist
+
+    Returns:
+        Python source runnable with only the standard library
+    """
+    return _FAST_CHECK_TEMPLATE.format(
+        targets=((target_file, version_pattern), *map(tuple, extra_targets)),
+        version_files=tuple(version_files),
+        version_re=VERSION_RE.pattern,
+        semver_re=SEMVER_RE.pattern,
+        ok=FAST_CHECK_OK,
+        mismatch=FAST_CHECK_MISMATCH,
+        undecided=FAST_CHECK_UNDECIDED,
+        cache_schema=CACHE_SCHEMA,
+        cache_max_entries=CACHE_MAX_ENTRIES,
+    )
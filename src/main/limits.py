@@ -0,0 +1,14 @@
+"""Default limits of the module's engine use.
+
+Kept apart from the scheduler and the snapshot so the object's field
+defaults can be declared without importing the code that enforces them.
+"""
+
+# Engine round-trips in flight at once, across all calls sharing a scheduler
+MAX_ENGINE_CALLS = 16
+
+# Seconds before a file or directory query is abandoned
+ENGINE_TIMEOUT = 60.0
+
+# Total bytes of file contents in one snapshot; larger files are read normally
+SNAPSHOT_MAX_BYTES = 256 * 1024
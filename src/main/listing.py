@@ -0,0 +1,122 @@
+"""Directory listing index for answering file existence queries."""
+
+import asyncio
+import posixpath
+from typing import Optional
+
+import dagger
+
+from .profiler import measure
+
+
+class DirectoryListing:
+    """
+    Answer file existence queries from cached directory entry listings.
+
+    Each parent directory is listed at most once per instance, so checking
+    several files in the same directory costs a single engine round-trip and
+    never transfers file contents. Concurrent queries for the same directory
+    share one in-flight listing.
+
+    Args:
+        source: Directory to list
+        scheduler: Engine call scheduler (listings run unscheduled when omitted)
+    """
+
+    def __init__(self, source: dagger.Directory, scheduler: Optional["EngineScheduler"] = None):
+        self.source = source
+        self.scheduler = scheduler
+        self._entries: dict[str, asyncio.Future[frozenset[str]]] = {}
+
+    @staticmethod
+    def _split(file_path: str) -> tuple[str, str]:
+        """Split a path into its normalized parent directory and base name."""
+        path = posixpath.normpath(file_path).lstrip("/")
+        parent, name = posixpath.split(path)
+        return parent or ".", name
+
+    async def entries(self, path: str = ".") -> frozenset[str]:
+        """
+        List the entries of a directory, caching the result.
+
+        Directory entries keep their trailing slash so they can be told apart
+        from files. A missing directory yields an empty listing.
+
+        Args:
+            path: Directory path relative to the source root
+
+        Returns:
+            Set of entry names in the directory
+        """
+        if path not in self._entries:
+            self._entries[path] = asyncio.ensure_future(self._list(path))
+        return await self._entries[path]
+
+    async def _list(self, path: str) -> frozenset[str]:
+        """Query the engine for the entries of one directory."""
+        async def query() -> list[str]:
+            with measure("engine.directory.entries") as span:
+                names = await self.source.entries(path=None if path == "." else path)
+                span.bytes = sum(len(name) for name in names)
+            return names
+
+        try:
+            if self.scheduler is None:
+                names = await query()
+            else:
+                names = await self.scheduler.run(("entries", id(self.source), path), query)
+        except TimeoutError:
+            raise
+        except Exception:
+            names = []
+        return frozenset(names)
+
+    def seed(self, path: str, names: list[str]) -> None:
+        """
+        Record a listing obtained elsewhere, unless the directory was listed.
+
+        Args:
+            path: Directory path relative to the source root
+            names: Entry names, with a trailing slash on directories
+        """
+        if path not in self._entries:
+            future = asyncio.get_running_loop().create_future()
+            future.set_result(frozenset(names))
+            self._entries[path] = future
+
+    async def prefetch(self, *paths: str) -> None:
+        """
+        List several directories concurrently.
+
+        Args:
+            *paths: Directory paths relative to the source root
+        """
+        await asyncio.gather(*(self.entries(path) for path in paths))
+
+    async def exists(self, file_path: str) -> bool:
+        """
+        Check whether a regular file exists.
+
+        Args:
+            file_path: Path to the file relative to the source root
+
+        Returns:
+            True if the file exists, False otherwise
+        """
+        parent, name = self._split(file_path)
+        if not name or name == ".":
+            return False
+        return name in await self.entries(parent)
+
+    async def is_directory(self, dir_path: str) -> bool:
+        """
+        Check whether a directory exists.
+
+        Args:
+            dir_path: Path to the directory relative to the source root
+
+        Returns:
+            True if the directory exists, False otherwise
+        """
+        parent, name = self._split(dir_path)
+        return f"{name}/" in await self.entries(parent)
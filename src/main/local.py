@@ -0,0 +1,329 @@
+"""Local filesystem stand-in for ``dagger.Directory``, used by the server.
+
+The adapter implements the part of the Directory API the module calls, reads
+files straight from disk and keeps writes in memory until :meth:`export`,
+like an engine directory. Upload filters (the ``Ignore`` patterns of a
+function's directory argument) are applied the same way the engine applies
+them, so a function sees the same tree either way.
+"""
+
+import os
+import posixpath
+from collections import OrderedDict
+from typing import Iterator, Optional
+
+from .filters import glob_regex, is_ignored
+from .plan import apply_patch
+
+# Default budget of the shared file content cache
+FILE_CACHE_BYTES = 64 * 1024 * 1024
+
+
+def _may_include_below(directory: str, patterns: tuple[str, ...]) -> bool:
+    """Whether a ``!`` pattern could re-include a path below a directory."""
+    parts = directory.split("/")
+    for pattern in patterns:
+        if not pattern.startswith("!"):
+            continue
+        components = pattern[1:].split("/")
+        if any("**" in component for component in components):
+            return True
+        depth = min(len(parts), len(components))
+        if all(
+            glob_regex(component).match(part)
+            for component, part in zip(components[:depth], parts[:depth])
+        ):
+            return True
+    return False
+
+
+class FileCache:
+    """
+    Contents of local files, reused while their size and mtime are unchanged.
+
+    Shared by every directory of a server so repeated calls against an
+    unchanged repository don't read its files again. Least recently used
+    entries are dropped beyond the byte budget.
+
+    Attributes:
+        hits: Reads answered from the cache
+        misses: Reads that went to disk
+    """
+
+    def __init__(self, max_bytes: int = FILE_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, tuple[tuple[int, int], str]] = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def read(self, path: str) -> str:
+        """
+        Read a file, from the cache when it hasn't changed.
+
+        Args:
+            path: Absolute file path
+
+        Returns:
+            File contents, with line endings untouched
+
+        Raises:
+            OSError: If the file can't be read
+        """
+        stat = os.stat(path)
+        key = (stat.st_mtime_ns, stat.st_size)
+        entry = self._entries.get(path)
+        if entry is not None and entry[0] == key:
+            self._entries.move_to_end(path)
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        with open(path, encoding="utf-8", newline="") as handle:
+            content = handle.read()
+        if entry is not None:
+            self._bytes -= len(entry[1])
+            del self._entries[path]
+        if len(content) <= self.max_bytes:
+            self._entries[path] = (key, content)
+            self._bytes += len(content)
+            while self._bytes > self.max_bytes:
+                _, (_, dropped) = self._entries.popitem(last=False)
+                self._bytes -= len(dropped)
+        return content
+
+    def to_dict(self) -> dict:
+        """Convert the counters to plain data."""
+        return {
+            "files": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+class LocalFile:
+    """Lazy file handle of a :class:`LocalDirectory`."""
+
+    def __init__(self, directory: "LocalDirectory", path: str):
+        self._directory = directory
+        self._path = path
+
+    async def contents(self) -> str:
+        """Return the file contents."""
+        return self._directory._read(self._path)
+
+    async def size(self) -> int:
+        """Return the file size in bytes."""
+        return len(self._directory._read(self._path).encode())
+
+
+class LocalDirectory:
+    """
+    ``dagger.Directory`` stand-in backed by a directory on the local filesystem.
+
+    Derived directories share the root and the file cache; files written
+    through them live in memory until exported.
+
+    Args:
+        root: Directory on the local filesystem (None for a directory that
+            only holds the files written to it)
+        exclude: Upload filter, as in ``Ignore``
+        cache: File content cache (a new one is created when omitted)
+    """
+
+    def __init__(
+        self,
+        root: Optional[str],
+        exclude: Optional[list[str]] = None,
+        cache: Optional[FileCache] = None,
+    ):
+        self.root = os.path.abspath(root) if root is not None else None
+        self.cache = cache if cache is not None else FileCache()
+        self._filters: tuple[tuple[str, ...], ...] = (tuple(exclude),) if exclude else ()
+        self._written: dict[str, str] = {}
+        self._permissions: dict[str, int] = {}
+
+    def _derive(
+        self,
+        filters: Optional[tuple[tuple[str, ...], ...]] = None,
+        written: Optional[dict[str, str]] = None,
+        permissions: Optional[dict[str, int]] = None,
+    ) -> "LocalDirectory":
+        derived = LocalDirectory(self.root, cache=self.cache)
+        derived._filters = self._filters if filters is None else filters
+        derived._written = self._written if written is None else written
+        derived._permissions = self._permissions if permissions is None else permissions
+        return derived
+
+    @property
+    def written(self) -> dict[str, str]:
+        """Files written through this directory, by path."""
+        return dict(self._written)
+
+    @staticmethod
+    def _normalize(path: Optional[str]) -> str:
+        """Normalize a relative path, rejecting paths outside the root."""
+        normalized = posixpath.normpath(path or ".").lstrip("/")
+        if normalized == ".." or normalized.startswith("../"):
+            raise ValueError(f"{path}: path is outside the directory")
+        return "" if normalized == "." else normalized
+
+    def _visible(self, path: str) -> bool:
+        """Whether the upload filters keep a path."""
+        return not any(is_ignored(path, patterns) for patterns in self._filters)
+
+    def _pruned(self, directory: str) -> bool:
+        """Whether nothing below a filtered-out directory can be visible."""
+        return any(
+            is_ignored(directory, patterns) and not _may_include_below(directory, patterns)
+            for patterns in self._filters
+        )
+
+    def _read(self, path: str) -> str:
+        if path in self._written:
+            return self._written[path]
+        if path and self.root is not None and self._visible(path):
+            try:
+                return self.cache.read(os.path.join(self.root, path))
+            except (FileNotFoundError, NotADirectoryError, IsADirectoryError):
+                pass
+        raise Exception(f"{path}: no such file or directory")
+
+    def _walk(self, base: str = "") -> Iterator[str]:
+        """Yield the visible files on disk below a directory."""
+        if self.root is None:
+            return
+        stack = [base]
+        while stack:
+            directory = stack.pop()
+            try:
+                scanned = list(os.scandir(os.path.join(self.root, directory)))
+            except (FileNotFoundError, NotADirectoryError):
+                continue
+            for entry in scanned:
+                path = f"{directory}/{entry.name}" if directory else entry.name
+                if entry.is_dir():
+                    if not self._pruned(path):
+                        stack.append(path)
+                elif self._visible(path):
+                    yield path
+
+    def _files(self, base: str = "") -> set[str]:
+        """All visible files below a directory, including written ones."""
+        prefix = f"{base}/" if base else ""
+        return set(self._walk(base)) | {path for path in self._written if path.startswith(prefix)}
+
+    def file(self, path: str) -> LocalFile:
+        return LocalFile(self, self._normalize(path))
+
+    async def entries(self, path: Optional[str] = None) -> list[str]:
+        base = self._normalize(path)
+        prefix = f"{base}/" if base else ""
+        names = set()
+        try:
+            scanned = list(os.scandir(os.path.join(self.root, base))) if self.root else []
+        except (FileNotFoundError, NotADirectoryError):
+            scanned = []
+        for entry in scanned:
+            entry_path = prefix + entry.name
+            if entry.is_dir():
+                if not self._pruned(entry_path) and (
+                    self._visible(entry_path) or any(self._walk(entry_path))
+                ):
+                    names.add(f"{entry.name}/")
+            elif self._visible(entry_path):
+                names.add(entry.name)
+        for written in self._written:
+            if written.startswith(prefix):
+                head, sep, _ = written[len(prefix):].partition("/")
+                names.add(head + "/" if sep else head)
+        if base and not names:
+            raise Exception(f"{base}: no such file or directory")
+        return sorted(names)
+
+    async def glob(self, pattern: str) -> list[str]:
+        regex = glob_regex(pattern)
+        return sorted(path for path in self._files() if regex.match(path))
+
+    def filter(
+        self, exclude: Optional[list[str]] = None, include: Optional[list[str]] = None
+    ) -> "LocalDirectory":
+        filters = self._filters
+        if include is not None:
+            filters += (("*", *(f"!{pattern}" for pattern in include)),)
+        if exclude:
+            filters += (tuple(exclude),)
+        derived = self._derive(filters=filters)
+        derived._written = {
+            path: content for path, content in self._written.items() if derived._visible(path)
+        }
+        derived._permissions = {
+            path: mode for path, mode in self._permissions.items() if path in derived._written
+        }
+        return derived
+
+    def with_new_file(
+        self, path: str, contents: str, permissions: Optional[int] = None
+    ) -> "LocalDirectory":
+        path = self._normalize(path)
+        permissions_by_path = dict(self._permissions)
+        if permissions is not None:
+            permissions_by_path[path] = permissions
+        return self._derive(
+            written={**self._written, path: contents}, permissions=permissions_by_path
+        )
+
+    def with_directory(
+        self, path: str, directory: "LocalDirectory", **kwargs
+    ) -> "LocalDirectory":
+        prefix = self._normalize(path)
+        files = dict(directory._written)
+        if directory.root != self.root or prefix:
+            for file_path in directory._walk():
+                files.setdefault(file_path, directory._read(file_path))
+        written = dict(self._written)
+        permissions = dict(self._permissions)
+        for file_path, content in files.items():
+            target = posixpath.join(prefix, file_path) if prefix else file_path
+            written[target] = content
+            if file_path in directory._permissions:
+                permissions[target] = directory._permissions[file_path]
+        return self._derive(written=written, permissions=permissions)
+
+    def with_patch(self, patch: str) -> "LocalDirectory":
+        try:
+            files = apply_patch(lambda path: self._read(self._normalize(path)), patch)
+        except ValueError as e:
+            raise Exception(f"failed to apply patch: {e}")
+        return self._derive(written={**self._written, **files})
+
+    async def export(self, path: Optional[str] = None) -> str:
+        """
+        Write the files written through this directory to disk.
+
+        Args:
+            path: Destination directory (default: the root)
+
+        Returns:
+            Absolute path of the destination
+        """
+        destination = os.path.abspath(path) if path else self.root
+        if destination is None:
+            raise ValueError("a destination is required for a directory without root")
+        for file_path, content in self._written.items():
+            target = os.path.join(destination, file_path)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            with open(target, "w", encoding="utf-8", newline="") as handle:
+                handle.write(content)
+            if file_path in self._permissions:
+                os.chmod(target, self._permissions[file_path])
+        return destination
+
+
+class LocalClient:
+    """``dag`` stand-in creating the new directories of a call in memory."""
+
+    def directory(self) -> LocalDirectory:
+        """Return an empty directory."""
+        return LocalDirectory(None)
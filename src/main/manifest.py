@@ -0,0 +1,252 @@
+"""Version manifest (.versions.toml) compiled into an index of targets.
+
+Example manifest::
+
+    version_file = "VERSION"
+
+    [[targets]]
+    path = "pyproject.toml"
+
+    [[targets]]
+    path = "deploy/values.yaml"
+    pattern = '^  tag:.*$'
+    format = "yaml"
+
+    [[packages]]
+    root = "services/api"
+
+    [[packages.targets]]
+    path = "Chart.yaml"
+
+Target paths are relative to their package root. Without a pattern, the
+default pattern for the file name is used; without a format, the rewriter is
+picked from the file name as for command-line targets.
+"""
+
+import hashlib
+import posixpath
+import re
+import tomllib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Mapping, Optional
+
+from .filters import MANIFEST_FILE
+from .patterns import VersionPattern, compile_pattern
+from .rewriters import FORMATS
+
+# Compiled manifests kept in memory, keyed by content hash
+MANIFEST_CACHE_SIZE = 32
+
+_MANIFEST_KEYS = {"version_file", "targets", "packages"}
+_PACKAGE_KEYS = {"root", "version_file", "targets"}
+_TARGET_KEYS = {"path", "pattern", "format"}
+
+_compiled: "OrderedDict[tuple, Manifest]" = OrderedDict()
+
+
+@dataclass(frozen=True)
+class ManifestTarget:
+    """
+    One target of the manifest with its pattern compiled.
+
+    Attributes:
+        path: Target file relative to the source root
+        pattern: Compiled pattern matching the version line
+        format: Rewriter name, or None to pick the rewriter from the file name
+    """
+
+    path: str
+    pattern: VersionPattern
+    format: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class ManifestPackage:
+    """
+    A package root with its version file and targets.
+
+    Attributes:
+        root: Package directory relative to the source root ("" for the root)
+        version_file: Version file relative to the source root
+        targets: Targets synced from the version file, in manifest order
+    """
+
+    root: str
+    version_file: str
+    targets: tuple[ManifestTarget, ...]
+
+    def pairs(self) -> list[tuple[str, str]]:
+        """Return the targets as (target_file, version_pattern) pairs."""
+        return [(target.path, target.pattern.source) for target in self.targets]
+
+
+@dataclass(frozen=True)
+class Manifest:
+    """
+    Parsed manifest and its target index.
+
+    Attributes:
+        digest: SHA-256 of the manifest contents
+        root: The root package (its targets are the top-level ``[[targets]]``)
+        packages: Packages declared with ``[[packages]]``, sorted by root
+        index: Targets by path, across all packages
+        formats: Rewriter names by path, for targets declaring a format
+    """
+
+    digest: str
+    root: ManifestPackage
+    packages: tuple[ManifestPackage, ...]
+    index: dict[str, tuple[ManifestTarget, ...]]
+    formats: dict[str, str]
+
+
+def _invalid(detail: str) -> ValueError:
+    """Build the error raised for a malformed manifest."""
+    return ValueError(f"❌ Invalid {MANIFEST_FILE}: {detail}")
+
+
+def _check_keys(table: Any, allowed: set[str], where: str) -> dict:
+    """Check a table has only known keys."""
+    if not isinstance(table, dict):
+        raise _invalid(f"{where} must be a table")
+    unknown = sorted(set(table) - allowed)
+    if unknown:
+        raise _invalid(f"unknown key {unknown[0]!r} in {where}")
+    return table
+
+
+def _string(table: dict, key: str, where: str, default: Optional[str] = None) -> Optional[str]:
+    """Read an optional non-empty string."""
+    value = table.get(key, default)
+    if value is not None and (not isinstance(value, str) or not value.strip()):
+        raise _invalid(f"{where}.{key} must be a non-empty string")
+    return value
+
+
+def _compile_targets(
+    entries: Any,
+    root: str,
+    where: str,
+    default_patterns: Mapping[str, str]
+) -> tuple[ManifestTarget, ...]:
+    """Compile the target tables of one package."""
+    if not isinstance(entries, list):
+        raise _invalid(f"{where} must be an array of tables")
+
+    targets = []
+    for number, entry in enumerate(entries):
+        at = f"{where}[{number}]"
+        _check_keys(entry, _TARGET_KEYS, at)
+        path = _string(entry, "path", at)
+        if path is None:
+            raise _invalid(f"{at} has no path")
+        path = posixpath.normpath(posixpath.join(root, path))
+        prefix = f"{root}/" if root else ""
+        below = path[len(prefix):] if path.startswith(prefix) else ""
+        if below in ("", ".", "..") or below.startswith(("/", "../")):
+            raise _invalid(f"{at}.path must be a file below {root or 'the source root'}")
+
+        pattern = _string(entry, "pattern", at) or default_patterns.get(posixpath.basename(path))
+        if pattern is None:
+            raise _invalid(f"{at} needs a pattern (no default for {posixpath.basename(path)})")
+        try:
+            compiled = compile_pattern(pattern)
+        except re.error as e:
+            raise _invalid(f"{at}.pattern does not compile: {e}")
+
+        version_format = _string(entry, "format", at)
+        if version_format is not None and version_format not in FORMATS:
+            raise _invalid(
+                f"{at}.format {version_format!r} is unknown (use {', '.join(sorted(FORMATS))})"
+            )
+        targets.append(ManifestTarget(path, compiled, version_format))
+    return tuple(targets)
+
+
+def _compile(content: str, digest: str, default_patterns: Mapping[str, str]) -> Manifest:
+    """Parse and compile a manifest."""
+    try:
+        data = tomllib.loads(content)
+    except tomllib.TOMLDecodeError as e:
+        raise _invalid(str(e))
+    _check_keys(data, _MANIFEST_KEYS, "the manifest")
+
+    root = ManifestPackage(
+        "",
+        _string(data, "version_file", "manifest", "VERSION"),
+        _compile_targets(data.get("targets", []), "", "targets", default_patterns),
+    )
+
+    packages = []
+    entries = data.get("packages", [])
+    if not isinstance(entries, list):
+        raise _invalid("packages must be an array of tables")
+    for number, entry in enumerate(entries):
+        at = f"packages[{number}]"
+        _check_keys(entry, _PACKAGE_KEYS, at)
+        package_root = _string(entry, "root", at)
+        if package_root is None:
+            raise _invalid(f"{at} has no root")
+        package_root = posixpath.normpath(package_root).strip("/")
+        if package_root in ("", ".") or package_root.startswith(".."):
+            raise _invalid(f"{at}.root must be a directory below the source root")
+        targets = _compile_targets(
+            entry.get("targets", []), package_root, f"{at}.targets", default_patterns
+        )
+        if not targets:
+            raise _invalid(f"{at} has no targets")
+        version_file = posixpath.join(package_root, _string(entry, "version_file", at, "VERSION"))
+        packages.append(ManifestPackage(package_root, version_file, targets))
+    packages.sort(key=lambda package: package.root)
+
+    roots = [package.root for package in packages]
+    if len(set(roots)) != len(roots):
+        raise _invalid("a package root is declared twice")
+
+    # Index every target by path; one file is rewritten with one format
+    index: dict[str, list[ManifestTarget]] = {}
+    formats: dict[str, str] = {}
+    for package in (root, *packages):
+        for target in package.targets:
+            index.setdefault(target.path, []).append(target)
+            if target.format is None:
+                continue
+            if formats.setdefault(target.path, target.format) != target.format:
+                raise _invalid(f"{target.path} is declared with two formats")
+
+    return Manifest(
+        digest,
+        root,
+        tuple(packages),
+        {path: tuple(targets) for path, targets in index.items()},
+        formats,
+    )
+
+
+def load_manifest(content: str, default_patterns: Mapping[str, str]) -> Manifest:
+    """
+    Compile a manifest, reusing the result for identical contents.
+
+    Args:
+        content: Contents of the manifest file
+        default_patterns: Version pattern by file name, for targets without one
+
+    Returns:
+        Compiled manifest
+
+    Raises:
+        ValueError: If the manifest is malformed
+    """
+    digest = hashlib.sha256(content.encode()).hexdigest()
+    key = (digest, tuple(sorted(default_patterns.items())))
+    manifest = _compiled.get(key)
+    if manifest is not None:
+        _compiled.move_to_end(key)
+        return manifest
+
+    manifest = _compile(content, digest, default_patterns)
+    _compiled[key] = manifest
+    if len(_compiled) > MANIFEST_CACHE_SIZE:
+        _compiled.popitem(last=False)
+    return manifest
@@ -0,0 +1,131 @@
+"""Discovery of versioned packages in a monorepo."""
+
+import posixpath
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+# Directories never treated as part of a package tree
+SKIPPED_DIRECTORIES = frozenset({
+    ".git", "node_modules", ".venv", "venv", "__pycache__", ".tox", ".nox",
+})
+
+
+@dataclass
+class Package:
+    """
+    A package root paired with its version file and detected target.
+
+    Attributes:
+        root: Package directory relative to the source root ("" for the root)
+        version_file: Path of the package's version file
+        project_type: Detected project type, if a marker file was found
+        target_file: Path of the target file to validate or sync
+        version_pattern: Regex pattern matching the version line in the target
+        error: Why the package can't be processed, if anything
+        version_format: Rewriter name overriding the one picked by file name
+    """
+
+    root: str
+    version_file: str
+    project_type: Optional[str] = None
+    target_file: Optional[str] = None
+    version_pattern: Optional[str] = None
+    error: Optional[str] = None
+    version_format: Optional[str] = None
+
+
+def _skipped(path: str) -> bool:
+    """Whether a path lies inside a directory that is never scanned."""
+    return any(part in SKIPPED_DIRECTORIES for part in path.split("/")[:-1])
+
+
+def package_root(version_path: str) -> str:
+    """
+    Return the package directory that owns a version file.
+
+    Follows the same layout rules as the single-package auto-detection:
+    ``pkg/VERSION`` and ``pkg/version/VERSION`` both belong to ``pkg``.
+
+    Args:
+        version_path: Path of a VERSION file
+
+    Returns:
+        Package directory ("" for the source root)
+    """
+    parent = posixpath.dirname(version_path)
+    if posixpath.basename(parent) == "version":
+        return posixpath.dirname(parent)
+    return parent
+
+
+def changed_paths_command(diff_base: str) -> list[str]:
+    """
+    Return the git command listing the paths changed since a revision.
+
+    The index is diffed instead of the working tree: the uploaded working
+    tree is filtered, so every tracked file left out would show as deleted.
+    The index holds the commits and the staged changes. With rename
+    detection off, a move lists both the old and the new path, so the
+    packages on both sides are selected.
+
+    Args:
+        diff_base: Revision to diff against (e.g., HEAD or origin/main)
+
+    Returns:
+        Command arguments, to be run at the repository root
+    """
+    return [
+        "git", "-c", "safe.directory=*", "diff", "--cached", "--name-only", "--no-renames",
+        diff_base,
+    ]
+
+
+def discover_packages(
+    version_paths: Iterable[str],
+    marker_paths: Iterable[str],
+    project_types: list[tuple[str, str, str, str]]
+) -> list[Package]:
+    """
+    Pair every VERSION file with the target detected in its package root.
+
+    Args:
+        version_paths: Paths of every VERSION file in the tree
+        marker_paths: Paths of every marker file in the tree
+        project_types: (marker, project_type, target, pattern) in priority order
+
+    Returns:
+        Packages sorted by root
+    """
+    markers: dict[str, set[str]] = {}
+    for path in marker_paths:
+        if not _skipped(path):
+            markers.setdefault(posixpath.dirname(path), set()).add(posixpath.basename(path))
+
+    version_files: dict[str, list[str]] = {}
+    for path in version_paths:
+        if not _skipped(path):
+            version_files.setdefault(package_root(path), []).append(path)
+
+    packages = []
+    for root, paths in sorted(version_files.items()):
+        package = Package(root, sorted(paths)[0])
+        if len(paths) > 1:
+            package.error = (
+                f"❌ Ambiguous VERSION files detected:\n"
+                f"   Found {' and '.join(sorted(paths))}"
+            )
+        else:
+            found = markers.get(root, set())
+            for marker, project_type, target_file, pattern in project_types:
+                if marker in found:
+                    package.project_type = project_type
+                    package.target_file = posixpath.join(root, target_file)
+                    package.version_pattern = pattern
+                    break
+            else:
+                package.error = (
+                    f"❌ Could not detect project type in {root or '.'}\n"
+                    f"   No galaxy.yml, pyproject.toml, Chart.yaml or Dockerfile found"
+                )
+        packages.append(package)
+    return packages
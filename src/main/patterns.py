@@ -0,0 +1,199 @@
+"""Registry of compiled version patterns shared by extraction and sync."""
+
+import re
+from functools import lru_cache
+from typing import Iterator, Optional
+
+# Version inside a target file line: X.Y.Z with optional pre-release and
+# build metadata, e.g. 1.4.0-rc.2+sha.abc
+VERSION_RE = re.compile(
+    r'[0-9]+\.[0-9]+\.[0-9]+'
+    r'(?:-[0-9A-Za-z-]+(?:\.[0-9A-Za-z-]+)*)?'
+    r'(?:\+[0-9A-Za-z-]+(?:\.[0-9A-Za-z-]+)*)?'
+)
+
+# Maximum number of distinct user patterns kept compiled
+PATTERN_CACHE_SIZE = 128
+
+# Anchors and lookbehinds that see past the line when matched inside the
+# whole text; patterns using them are matched against each line on its own
+LINE_SENSITIVE = ("\\A", "\\Z", "(?<=", "(?<!")
+
+
+def iter_line_spans(text: str, pos: int = 0) -> Iterator[tuple[int, int]]:
+    """
+    Yield the (start, end) offsets of each line without building a line list.
+
+    The end offset excludes the line terminator, including the carriage
+    return of a CRLF ending.
+
+    Args:
+        text: Text to scan
+        pos: Offset of the first line
+
+    Yields:
+        Tuple of (line_start, line_end)
+    """
+    length = len(text)
+    while pos <= length:
+        newline = text.find('\n', pos)
+        end = length if newline < 0 else newline
+        line_end = end - 1 if end > pos and text[end - 1] == '\r' else end
+        yield pos, line_end
+        if newline < 0:
+            return
+        pos = newline + 1
+
+
+class VersionPattern:
+    """
+    A user-supplied version line pattern, compiled once.
+
+    The pattern is matched at the start of each line, as with ``re.match``
+    on a single line. Scans run over the whole text and stop at the first
+    match, reporting offsets so callers can splice without splitting lines.
+
+    Attributes:
+        source: The pattern as given by the caller
+        line: Pattern matched against one line via pos/endpos
+        scan: Line-anchored pattern searched across the whole text, or None
+            when the pattern can't be embedded (e.g. global inline flags)
+        combined: Single expression that matches the line and captures the
+            first version number in a ``version`` group, or None when the
+            pattern can't be embedded
+        isolated: Whether the pattern uses a LINE_SENSITIVE construct, so
+            each line is matched as a separate string
+    """
+
+    __slots__ = ("source", "line", "scan", "combined", "isolated")
+
+    def __init__(self, source: str):
+        self.source = source
+        self.line = re.compile(source, re.MULTILINE)
+        self.scan = None
+        self.combined = None
+        self.isolated = any(token in source for token in LINE_SENSITIVE)
+        try:
+            self.scan = re.compile(rf'^(?:{source})', re.MULTILINE)
+            self.combined = re.compile(
+                rf'^(?=(?:{source}))[^\n]*?(?P<version>{VERSION_RE.pattern})',
+                re.MULTILINE
+            )
+        except re.error:
+            pass
+
+    def _searchable(self, text: str) -> bool:
+        """
+        Whether a whole-text search finds exactly the per-line matches.
+
+        ``$`` doesn't match before a carriage return, and anchors and
+        lookbehinds see the neighbouring lines, so those cases are scanned
+        line by line.
+        """
+        return self.scan is not None and '\r' not in text and not self.isolated
+
+    def _line_matches(self, text: str, start: int, end: int) -> bool:
+        """Whether the line between two offsets matches on its own."""
+        if self.isolated:
+            # pos/endpos still let \A and lookbehinds see the rest of the text
+            return self.line.match(text[start:end]) is not None
+        return self.line.match(text, start, end) is not None
+
+    def _line_end(self, text: str, start: int) -> int:
+        """Return the end offset of the line starting at ``start``."""
+        newline = text.find('\n', start)
+        return len(text) if newline < 0 else newline
+
+    def _matching_lines(self, text: str) -> Iterator[tuple[int, int]]:
+        """Yield the spans of lines matching the pattern, in order."""
+        if not self._searchable(text):
+            for start, end in iter_line_spans(text):
+                if self._line_matches(text, start, end):
+                    yield start, end
+            return
+
+        pos = 0
+        while pos <= len(text):
+            match = self.scan.search(text, pos)
+            if match is None:
+                return
+            start = match.start()
+            end = self._line_end(text, start)
+            # A search match may run across lines; keep per-line semantics
+            if self.line.match(text, start, end):
+                yield start, end
+            pos = end + 1
+
+    def extract(self, line: str) -> Optional[str]:
+        """
+        Return the first version number of a line matching the pattern.
+
+        Args:
+            line: A single line of the target file
+
+        Returns:
+            Version string, or None if the line doesn't match or has no version
+        """
+        if self.combined is not None:
+            match = self.combined.match(line)
+            return match.group("version") if match else None
+
+        if not self.line.match(line):
+            return None
+        match = VERSION_RE.search(line)
+        return match.group(0) if match else None
+
+    def find_line(self, text: str) -> Optional[tuple[int, int]]:
+        """
+        Find the first line matching the pattern.
+
+        Args:
+            text: Content of the target file
+
+        Returns:
+            Tuple of (line_start, line_end) excluding the line terminator,
+            or None if no line matches
+        """
+        return next(self._matching_lines(text), None)
+
+    def find_version(self, text: str) -> Optional[tuple[int, int]]:
+        """
+        Find the version number on the first matching line that has one.
+
+        Args:
+            text: Content of the target file
+
+        Returns:
+            Tuple of (version_start, version_end), or None if not found
+        """
+        if self.combined is not None and self._searchable(text):
+            pos = 0
+            while pos <= len(text):
+                match = self.combined.search(text, pos)
+                if match is None:
+                    return None
+                end = self._line_end(text, match.start())
+                if self.line.match(text, match.start(), end):
+                    return match.span("version")
+                pos = end + 1
+            return None
+
+        for start, end in self._matching_lines(text):
+            match = VERSION_RE.search(text, start, end)
+            if match:
+                return match.span()
+        return None
+
+
+@lru_cache(maxsize=PATTERN_CACHE_SIZE)
+def compile_pattern(version_pattern: str) -> VersionPattern:
+    """
+    Compile a version pattern, reusing previously compiled patterns.
+
+    Args:
+        version_pattern: Regex pattern matching the version line
+
+    Returns:
+        Compiled pattern
+    """
+    return VersionPattern(version_pattern)
@@ -0,0 +1,238 @@
+"""Sync plans: the exact edits a sync would make, as JSON or a unified diff."""
+
+import json
+import re
+from dataclasses import asdict, dataclass, field
+from typing import Callable
+
+# Unchanged lines around each change in the unified diff
+CONTEXT_LINES = 3
+
+_HUNK_RE = re.compile(r'^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@')
+
+_NO_NEWLINE = "\\ No newline at end of file\n"
+
+
+@dataclass
+class Edit:
+    """
+    One replaced version value.
+
+    Attributes:
+        file: Target file
+        line: Line number of the value (1-based)
+        start: Byte offset of the value in the current file
+        end: Byte offset just past the value
+        old: Current value
+        new: Value written by the sync
+    """
+
+    file: str
+    line: int
+    start: int
+    end: int
+    old: str
+    new: str
+
+
+@dataclass
+class SyncPlan:
+    """
+    Everything a sync would change, computed without writing.
+
+    Attributes:
+        version: Version the targets are synced to
+        version_file: Path of the version file it was read from
+        edits: Replaced values, in target and file order
+        patch: The same edits as a git-compatible unified diff
+    """
+
+    version: str
+    version_file: str
+    edits: list[Edit] = field(default_factory=list)
+    patch: str = ""
+
+    def to_json(self) -> str:
+        """Serialize the plan as indented JSON."""
+        return json.dumps(asdict(self), indent=2, ensure_ascii=False)
+
+    @classmethod
+    def from_json(cls, text: str) -> "SyncPlan":
+        """
+        Load a plan serialized with to_json.
+
+        Args:
+            text: JSON plan
+
+        Returns:
+            Parsed plan
+
+        Raises:
+            ValueError: If the text isn't a plan
+        """
+        try:
+            data = json.loads(text)
+            return cls(
+                data["version"],
+                data["version_file"],
+                [Edit(**edit) for edit in data.get("edits", [])],
+                data.get("patch", ""),
+            )
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"❌ Invalid sync plan: {e}")
+
+
+def split_lines(text: str) -> list[str]:
+    """Split text after each newline only, keeping the newlines."""
+    parts = text.split("\n")
+    lines = [part + "\n" for part in parts[:-1]]
+    if parts[-1]:
+        lines.append(parts[-1])
+    return lines
+
+
+def _diff_line(prefix: str, line: str) -> str:
+    """Render one diff body line, marking a missing final newline."""
+    if line.endswith("\n"):
+        return prefix + line
+    return prefix + line + "\n" + _NO_NEWLINE
+
+
+def render_patch(path: str, old: str, new: str) -> str:
+    """
+    Render the unified diff of in-place line edits to one file.
+
+    Args:
+        path: File path, relative to the directory the patch applies to
+        old: Current contents
+        new: Contents with some lines replaced (same number of lines)
+
+    Returns:
+        Git-compatible diff, or "" if nothing changed
+
+    Raises:
+        ValueError: If the edits add or remove lines
+    """
+    old_lines = split_lines(old)
+    new_lines = split_lines(new)
+    if len(old_lines) != len(new_lines):
+        raise ValueError(f"edits to {path} change its number of lines")
+
+    changed = [index for index, line in enumerate(old_lines) if line != new_lines[index]]
+    if not changed:
+        return ""
+
+    # Changes whose context windows touch share one hunk
+    groups = [[changed[0]]]
+    for index in changed[1:]:
+        if index - groups[-1][-1] <= 2 * CONTEXT_LINES:
+            groups[-1].append(index)
+        else:
+            groups.append([index])
+
+    out = [f"diff --git a/{path} b/{path}\n", f"--- a/{path}\n", f"+++ b/{path}\n"]
+    for group in groups:
+        low = max(0, group[0] - CONTEXT_LINES)
+        high = min(len(old_lines), group[-1] + CONTEXT_LINES + 1)
+        out.append(f"@@ -{low + 1},{high - low} +{low + 1},{high - low} @@\n")
+        for index in range(low, high):
+            if old_lines[index] == new_lines[index]:
+                out.append(_diff_line(" ", old_lines[index]))
+            else:
+                out.append(_diff_line("-", old_lines[index]))
+                out.append(_diff_line("+", new_lines[index]))
+    return "".join(out)
+
+
+def _path(header: str) -> str:
+    """Return the file path of a ---/+++ header line."""
+    name = header[4:].rstrip("\r\n").split("\t", 1)[0]
+    return name[2:] if name[:2] in ("a/", "b/") else name
+
+
+def apply_patch(read: Callable[[str], str], patch: str) -> dict[str, str]:
+    """
+    Apply a unified diff that modifies existing files.
+
+    Used where the engine's ``Directory.with_patch`` isn't available (local
+    directories in server mode). Context and removed lines are checked, so a
+    patch planned against other contents is rejected.
+
+    Args:
+        read: Returns the current contents of a file
+        patch: Unified diff, e.g. from render_patch
+
+    Returns:
+        New contents by file path
+
+    Raises:
+        ValueError: If the patch is malformed or doesn't apply
+    """
+    lines = split_lines(patch)
+    files: dict[str, str] = {}
+    path = None
+    old_lines: list[str] = []
+    result: list[str] = []
+    position = 0
+
+    def finish() -> None:
+        if path is not None:
+            files[path] = "".join(result + old_lines[position:])
+
+    index = 0
+    while index < len(lines):
+        line = lines[index]
+        index += 1
+        if line.startswith("+++ "):
+            finish()
+            path = _path(line)
+            old_lines = split_lines(files[path] if path in files else read(path))
+            result, position = [], 0
+            continue
+        match = _HUNK_RE.match(line)
+        if not match:
+            continue
+        if path is None:
+            raise ValueError("patch hunk before a file header")
+
+        old_start, old_count, _, new_count = (
+            int(value) if value is not None else 1 for value in match.groups()
+        )
+        start = old_start if old_count == 0 else old_start - 1
+        if start < position or start > len(old_lines):
+            raise ValueError(f"patch does not apply to {path} at line {old_start}")
+        result.extend(old_lines[position:start])
+        position = start
+
+        # Read the hunk body by its line counts
+        body: list[tuple[str, str]] = []
+        while old_count > 0 or new_count > 0 or (
+            index < len(lines) and lines[index].startswith("\\")
+        ):
+            if index >= len(lines):
+                raise ValueError(f"truncated patch hunk for {path}")
+            body_line = lines[index]
+            index += 1
+            if body_line.startswith("\\"):
+                if body:
+                    op, text = body[-1]
+                    body[-1] = (op, text[:-1] if text.endswith("\n") else text)
+                continue
+            op, text = body_line[:1], body_line[1:]
+            if op in (" ", "-"):
+                old_count -= 1
+            if op in (" ", "+"):
+                new_count -= 1
+            if op not in (" ", "-", "+"):
+                raise ValueError(f"malformed patch line for {path}: {body_line!r}")
+            body.append((op, text))
+
+        for op, text in body:
+            if op in (" ", "-"):
+                if position >= len(old_lines) or old_lines[position] != text:
+                    raise ValueError(f"patch does not apply to {path} at line {position + 1}")
+                position += 1
+            if op in (" ", "+"):
+                result.append(text)
+    finish()
+    return files
@@ -0,0 +1,137 @@
+"""Opt-in timing of engine round-trips and internal helpers.
+
+Instrumentation is always in place but only records while a profiler is
+active for the current task (see :func:`profiling`), so normal calls pay a
+single context variable lookup per measured operation.
+"""
+
+import functools
+import inspect
+import json
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from typing import Callable, Iterator, Optional, TypeVar
+
+F = TypeVar("F", bound=Callable)
+
+
+@dataclass
+class OperationStats:
+    """
+    Aggregated measurements of one operation.
+
+    Attributes:
+        count: Number of calls
+        bytes: Bytes transferred or processed
+        total_ms: Wall time of all calls, including nested operations
+        max_ms: Slowest single call
+    """
+
+    count: int = 0
+    bytes: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+
+class Profiler:
+    """
+    Collect per-operation counts, bytes and latency for one top-level call.
+
+    Operation names are prefixed with ``engine.`` for round-trips to the
+    Dagger engine and ``helper.`` for internal helpers.
+    """
+
+    def __init__(self):
+        self.operations: dict[str, OperationStats] = {}
+        self._start = time.perf_counter()
+
+    def record(self, name: str, elapsed_ms: float, size: int = 0) -> None:
+        """Add one measured call of an operation."""
+        stats = self.operations.setdefault(name, OperationStats())
+        stats.count += 1
+        stats.bytes += size
+        stats.total_ms += elapsed_ms
+        stats.max_ms = max(stats.max_ms, elapsed_ms)
+
+    def to_dict(self) -> dict:
+        """Convert the measurements to plain data, slowest operations first."""
+        ordered = sorted(self.operations.items(), key=lambda item: -item[1].total_ms)
+        return {
+            "elapsed_ms": (time.perf_counter() - self._start) * 1000,
+            "operations": {name: asdict(stats) for name, stats in ordered},
+        }
+
+    def to_json(self) -> str:
+        """Serialize the measurements as indented JSON."""
+        return json.dumps(self.to_dict(), indent=2)
+
+
+_ACTIVE: ContextVar[Optional[Profiler]] = ContextVar("dvm_profiler", default=None)
+
+
+@contextmanager
+def profiling() -> Iterator[Profiler]:
+    """Activate a new profiler for the current task and the tasks it spawns."""
+    profiler = Profiler()
+    token = _ACTIVE.set(profiler)
+    try:
+        yield profiler
+    finally:
+        _ACTIVE.reset(token)
+
+
+class Span:
+    """Handle of one measured call; set ``bytes`` once the size is known."""
+
+    __slots__ = ("bytes",)
+
+    def __init__(self):
+        self.bytes = 0
+
+
+@contextmanager
+def measure(name: str) -> Iterator[Span]:
+    """
+    Time a block as one call of an operation, if a profiler is active.
+
+    Args:
+        name: Operation name (e.g. "engine.file.contents")
+
+    Yields:
+        Span whose ``bytes`` attribute is recorded with the call
+    """
+    span = Span()
+    profiler = _ACTIVE.get()
+    if profiler is None:
+        yield span
+        return
+
+    start = time.perf_counter()
+    try:
+        yield span
+    finally:
+        profiler.record(name, (time.perf_counter() - start) * 1000, span.bytes)
+
+
+def profiled(func: F) -> F:
+    """Measure every call of a helper, sync or async, as ``helper.<name>``."""
+    name = f"helper.{func.__name__}"
+
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            if _ACTIVE.get() is None:
+                return await func(*args, **kwargs)
+            with measure(name):
+                return await func(*args, **kwargs)
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if _ACTIVE.get() is None:
+            return func(*args, **kwargs)
+        with measure(name):
+            return func(*args, **kwargs)
+    return wrapper
@@ -0,0 +1,181 @@
+"""Structured validation results and their renderings."""
+
+import json
+from dataclasses import asdict, dataclass, field
+from typing import Optional
+
+# Status values of a single target check
+CONSISTENT = "consistent"
+MISMATCH = "mismatch"
+NOT_FOUND = "not_found"
+READ_ERROR = "read_error"
+INVALID_SPEC = "invalid_spec"
+SYNCED = "synced"
+
+
+@dataclass
+class TargetCheck:
+    """
+    Result of validating one target file against the source version.
+
+    Attributes:
+        target_file: Path of the target file
+        version_pattern: Regex pattern used to find the version line
+        status: One of consistent, mismatch, not_found, read_error, invalid_spec
+            or synced
+        target_version: Version found in the target file, if any
+        message: Human-readable result (same text as validate_version)
+        elapsed_ms: Time spent reading and checking the target
+    """
+
+    target_file: str
+    version_pattern: str
+    status: str
+    target_version: Optional[str] = None
+    message: str = ""
+    elapsed_ms: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        """True if the target matches (or now matches) the source version."""
+        return self.status in (CONSISTENT, SYNCED)
+
+
+@dataclass
+class ValidationReport:
+    """
+    Result of validating several target files against one version file.
+
+    Attributes:
+        version_file: Resolved path of the source version file
+        source_version: Version read from the version file, if readable
+        error: Error reading the version file, if any
+        targets: Per-target results in request order
+        elapsed_ms: Total wall time of the validation
+    """
+
+    version_file: str
+    source_version: Optional[str] = None
+    error: Optional[str] = None
+    targets: list[TargetCheck] = field(default_factory=list)
+    elapsed_ms: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        """True if the version file was read and every target matches."""
+        return self.error is None and all(check.ok for check in self.targets)
+
+    def to_dict(self) -> dict:
+        """Convert the report to plain data, including the derived ok flags."""
+        data = asdict(self)
+        data["ok"] = self.ok
+        for check, check_data in zip(self.targets, data["targets"]):
+            check_data["ok"] = check.ok
+        return data
+
+    def to_json(self) -> str:
+        """Serialize the report as indented JSON."""
+        return json.dumps(self.to_dict(), indent=2, ensure_ascii=False)
+
+    def render(self) -> str:
+        """Render the report as the human summary used by validate_version."""
+        if self.error:
+            return self.error
+
+        lines = [check.message for check in self.targets]
+        failed = sum(1 for check in self.targets if not check.ok)
+        if failed:
+            lines.append(f"❌ {failed} of {len(self.targets)} targets failed validation")
+        else:
+            lines.append(
+                f"✅ All {len(self.targets)} targets match "
+                f"{self.version_file}={self.source_version}"
+            )
+        return "\n".join(lines)
+
+
+@dataclass
+class PackageReport:
+    """
+    Result of validating or syncing one package of a monorepo.
+
+    Attributes:
+        package: Package directory relative to the source root
+        project_type: Detected project type, if any
+        version_file: Path of the package's version file
+        source_version: Version read from the version file, if readable
+        error: Why the package couldn't be processed, if anything
+        target: Result for the package's target file
+    """
+
+    package: str
+    project_type: Optional[str]
+    version_file: str
+    source_version: Optional[str] = None
+    error: Optional[str] = None
+    target: Optional[TargetCheck] = None
+
+    @property
+    def ok(self) -> bool:
+        """True if the package was processed and its target matches."""
+        return self.error is None and self.target is not None and self.target.ok
+
+
+@dataclass
+class MonorepoReport:
+    """
+    Result of validating or syncing every package of a monorepo.
+
+    Attributes:
+        packages: Per-package results sorted by package directory
+        elapsed_ms: Total wall time including discovery
+        changed_paths: Paths that selected the packages, for incremental runs
+    """
+
+    packages: list[PackageReport] = field(default_factory=list)
+    elapsed_ms: float = 0.0
+    changed_paths: Optional[list[str]] = None
+
+    @property
+    def ok(self) -> bool:
+        """
+        True if every package matches its version file.
+
+        A full run without packages fails; an incremental run whose changes
+        touch no package passes.
+        """
+        if not self.packages:
+            return self.changed_paths is not None
+        return all(package.ok for package in self.packages)
+
+    def to_dict(self) -> dict:
+        """Convert the report to plain data, including the derived ok flags."""
+        data = asdict(self)
+        data["ok"] = self.ok
+        for package, package_data in zip(self.packages, data["packages"]):
+            package_data["ok"] = package.ok
+            if package.target is not None:
+                package_data["target"]["ok"] = package.target.ok
+        return data
+
+    def to_json(self) -> str:
+        """Serialize the report as indented JSON."""
+        return json.dumps(self.to_dict(), indent=2, ensure_ascii=False)
+
+    def render(self) -> str:
+        """Render one line block per package followed by a summary line."""
+        lines = []
+        for package in self.packages:
+            message = package.error or package.target.message
+            lines.append(f"[{package.package or '.'}] {message}")
+
+        failed = sum(1 for package in self.packages if not package.ok)
+        if not self.packages and self.changed_paths is not None:
+            lines.append(f"✅ No packages affected by {len(self.changed_paths)} changed paths")
+        elif not self.packages:
+            lines.append("❌ No packages found (no VERSION files)")
+        elif failed:
+            lines.append(f"❌ {failed} of {len(self.packages)} packages failed")
+        else:
+            lines.append(f"✅ All {len(self.packages)} packages are consistent")
+        return "\n".join(lines)
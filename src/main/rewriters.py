@@ -0,0 +1,176 @@
+"""Format-aware rewriters that replace only the version value of a line."""
+
+import posixpath
+import re
+from typing import Optional
+
+from .patterns import VERSION_RE
+
+
+class Rewriter:
+    """
+    Locate the version value inside a matched line of one file format.
+
+    The value regex exposes the replaceable span as a ``value`` group, so
+    indentation, key spelling, quotes and trailing comments stay untouched.
+    It is compiled on first use, so importing the registry compiles nothing.
+
+    Attributes:
+        name: Format name
+        value_pattern: Expression with a ``value`` group
+        flags: Regex flags
+    """
+
+    __slots__ = ("name", "value_pattern", "flags", "_regex")
+
+    def __init__(self, name: str, value_pattern: str, flags: int = 0):
+        self.name = name
+        self.value_pattern = value_pattern
+        self.flags = flags
+        self._regex: Optional[re.Pattern[str]] = None
+
+    @property
+    def regex(self) -> "re.Pattern[str]":
+        """The compiled value expression."""
+        if self._regex is None:
+            self._regex = re.compile(self.value_pattern, self.flags)
+        return self._regex
+
+    def value_span(self, line: str) -> Optional[tuple[int, int]]:
+        """
+        Find the span of the version value in a line.
+
+        Args:
+            line: A single matched line of the target file
+
+        Returns:
+            Tuple of (start, end) within the line, or None if not found
+        """
+        match = self.regex.search(line)
+        return match.span("value") if match else None
+
+
+# key: value, optionally quoted, optionally followed by a comment
+YAML = Rewriter("yaml", r'''^\s*(?:-\s+)?[^\s:#][^:#]*:\s*(?P<q>["']?)(?P<value>[^\s"'#]+)(?P=q)''')
+
+# key = "value"
+TOML = Rewriter("toml", r'''^\s*[\w.\-"']+\s*=\s*(?P<q>["'])(?P<value>[^"'\n]*)(?P=q)''')
+
+# __version__ = "value"
+PYTHON = Rewriter("python", r'''^\s*\w+\s*(?::\s*\w+\s*)?=\s*(?P<q>["'])(?P<value>[^"'\n]*)(?P=q)''')
+
+# key = value  or  key: value
+SETUP_CFG = Rewriter("setup.cfg", r'^\s*[\w.\-]+\s*[=:]\s*(?P<value>[^\s#;]+)')
+
+# "version": "value"
+PACKAGE_JSON = Rewriter("package.json", r'"version"\s*:\s*"(?P<value>[^"]*)"')
+
+# LABEL version="value", ARG VERSION=value, org.opencontainers.image.version=value
+DOCKERFILE = Rewriter(
+    "dockerfile",
+    r'''\bversion\s*=\s*(?P<q>["']?)(?P<value>[^\s"']+)(?P=q)''',
+    re.IGNORECASE
+)
+
+# First version number anywhere in the line
+GENERIC = Rewriter("generic", rf'(?P<value>{VERSION_RE.pattern})')
+
+# Format names accepted by the manifest's "format" key
+FORMATS = {
+    rewriter.name: rewriter
+    for rewriter in (YAML, TOML, PYTHON, SETUP_CFG, PACKAGE_JSON, DOCKERFILE, GENERIC)
+}
+
+# Exact file names
+REWRITERS_BY_NAME = {
+    "galaxy.yml": YAML,
+    "Chart.yaml": YAML,
+    "pyproject.toml": TOML,
+    "Cargo.toml": TOML,
+    "package.json": PACKAGE_JSON,
+    "setup.cfg": SETUP_CFG,
+    "Dockerfile": DOCKERFILE,
+    "Containerfile": DOCKERFILE,
+}
+
+# File extensions
+REWRITERS_BY_SUFFIX = {
+    ".yml": YAML,
+    ".yaml": YAML,
+    ".toml": TOML,
+    ".json": PACKAGE_JSON,
+    ".cfg": SETUP_CFG,
+    ".ini": SETUP_CFG,
+    ".py": PYTHON,
+    ".dockerfile": DOCKERFILE,
+}
+
+# Line markers for files whose name doesn't identify the format
+REWRITERS_BY_MARKER = [
+    ("__version__", PYTHON),
+    ("LABEL ", DOCKERFILE),
+    ('"version"', PACKAGE_JSON),
+]
+
+
+def select_rewriter(target_file: str, line: str = "") -> Rewriter:
+    """
+    Pick the rewriter for a target file.
+
+    The file name and extension are looked up in constant time; files named
+    like ``Dockerfile.prod`` map to the Dockerfile rewriter. Unknown files
+    fall back to a marker found in the matched line, then to the generic
+    rewriter.
+
+    Args:
+        target_file: Path of the target file
+        line: The matched version line
+
+    Returns:
+        Rewriter for the file
+    """
+    name = posixpath.basename(target_file)
+    rewriter = REWRITERS_BY_NAME.get(name)
+    if rewriter is None:
+        rewriter = REWRITERS_BY_NAME.get(name.split(".", 1)[0])
+    if rewriter is None:
+        rewriter = REWRITERS_BY_SUFFIX.get(posixpath.splitext(name)[1])
+    if rewriter is not None:
+        return rewriter
+
+    for marker, marker_rewriter in REWRITERS_BY_MARKER:
+        if marker in line:
+            return marker_rewriter
+    return GENERIC
+
+
+def locate_version_value(
+    target_file: str,
+    line: str,
+    rewriter: Optional[Rewriter] = None
+) -> Optional[tuple[int, int]]:
+    """
+    Find the span of the version value in a matched line.
+
+    When the value contains a version number (e.g. ``v1.2.3`` or
+    ``repo:1.2.3``), only that number is replaced. Falls back to the first
+    version number in the line when the format's rewriter doesn't recognize
+    the line.
+
+    Args:
+        target_file: Path of the target file
+        line: The matched version line
+        rewriter: Format of the file, overriding the one picked by name
+
+    Returns:
+        Tuple of (start, end) within the line, or None if not found
+    """
+    span = (rewriter or select_rewriter(target_file, line)).value_span(line)
+    if span is None:
+        return GENERIC.value_span(line)
+
+    start, end = span
+    number = VERSION_RE.search(line, start, end)
+    if number:
+        return number.span()
+    return span
@@ -0,0 +1,143 @@
+"""Bounded, coalescing scheduler for engine round-trips."""
+
+import asyncio
+from dataclasses import asdict, dataclass
+from typing import Awaitable, Callable, Hashable, Optional, TypeVar
+
+from .limits import ENGINE_TIMEOUT, MAX_ENGINE_CALLS
+
+T = TypeVar("T")
+
+
+@dataclass
+class SchedulerStats:
+    """
+    Counters of a scheduler.
+
+    Attributes:
+        submitted: Engine calls requested
+        coalesced: Requests that joined an identical call already in flight
+        timeouts: Calls abandoned after their timeout
+        queued: Calls currently waiting for a slot
+        running: Calls currently in flight
+        max_queued: Deepest the queue has been
+        max_running: Most calls in flight at once
+    """
+
+    submitted: int = 0
+    coalesced: int = 0
+    timeouts: int = 0
+    queued: int = 0
+    running: int = 0
+    max_queued: int = 0
+    max_running: int = 0
+
+    def to_dict(self) -> dict:
+        """Convert to plain data."""
+        return asdict(self)
+
+
+class EngineScheduler:
+    """
+    Run engine calls with a concurrency limit, coalescing and timeouts.
+
+    At most ``max_concurrency`` calls are in flight; the rest wait in FIFO
+    order. A call submitted under the key of a call that is still in flight
+    shares its result instead of querying the engine again. Keys must
+    identify the queried object and query, e.g. ``("contents", id(dir), path)``;
+    the pending call keeps the object alive, so its id can't be reused.
+
+    Args:
+        max_concurrency: Engine calls in flight at once
+        timeout: Default per-call timeout in seconds (None disables it)
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = MAX_ENGINE_CALLS,
+        timeout: Optional[float] = ENGINE_TIMEOUT
+    ):
+        self.max_concurrency = max(1, max_concurrency)
+        self.timeout = timeout if timeout and timeout > 0 else None
+        self.stats = SchedulerStats()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._in_flight: dict[Hashable, asyncio.Future] = {}
+
+    def _bind(self) -> asyncio.Semaphore:
+        """Return the slots of the running event loop, creating them on first use."""
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+            self._in_flight = {}
+        return self._slots
+
+    async def run(
+        self,
+        key: Optional[Hashable],
+        call: Callable[[], Awaitable[T]],
+        apply_timeout: bool = True
+    ) -> T:
+        """
+        Run an engine call, or join the identical call in flight.
+
+        Args:
+            key: Coalescing key (None never coalesces)
+            call: Factory of the engine call's awaitable
+            apply_timeout: Apply the scheduler's timeout (False for container
+                executions, whose duration depends on the work they do); the
+                concurrency limit applies either way
+
+        Returns:
+            Result of the call
+
+        Raises:
+            TimeoutError: If the call doesn't finish in time
+            Exception: Whatever the call raises
+        """
+        slots = self._bind()
+        self.stats.submitted += 1
+        if key is not None and key in self._in_flight:
+            self.stats.coalesced += 1
+            return await asyncio.shield(self._in_flight[key])
+
+        timeout = self.timeout if apply_timeout else None
+        task = asyncio.ensure_future(self._execute(slots, call, timeout))
+        if key is not None:
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, done: asyncio.Future) -> None:
+        """Drop a finished call, unless its key now belongs to another one."""
+        if self._in_flight.get(key) is done:
+            del self._in_flight[key]
+
+    async def _execute(
+        self,
+        slots: asyncio.Semaphore,
+        call: Callable[[], Awaitable[T]],
+        timeout: Optional[float]
+    ) -> T:
+        """Wait for a slot, then run the call under its timeout."""
+        stats = self.stats
+        waiting = slots.locked()
+        if waiting:
+            stats.queued += 1
+            stats.max_queued = max(stats.max_queued, stats.queued)
+        try:
+            await slots.acquire()
+        finally:
+            if waiting:
+                stats.queued -= 1
+        stats.running += 1
+        stats.max_running = max(stats.max_running, stats.running)
+        try:
+            return await asyncio.wait_for(call(), timeout)
+        except asyncio.TimeoutError:
+            stats.timeouts += 1
+            raise TimeoutError(f"❌ Engine query timed out after {timeout:g}s") from None
+        finally:
+            stats.running -= 1
+            slots.release()
@@ -0,0 +1,222 @@
+"""Semantic Versioning 2.0.0: parsing, precedence and bumping."""
+
+import re
+from typing import Optional, Union
+
+# Grammar fragments from https://semver.org/spec/v2.0.0.html
+_NUMBER = r'0|[1-9][0-9]*'
+_PRERELEASE_ID = r'(?:0|[1-9][0-9]*|[0-9]*[a-zA-Z-][0-9a-zA-Z-]*)'
+_BUILD_ID = r'[0-9a-zA-Z-]+'
+
+# Complete version string accepted in a version file
+SEMVER_RE = re.compile(
+    rf'^(?P<major>{_NUMBER})\.(?P<minor>{_NUMBER})\.(?P<patch>{_NUMBER})'
+    rf'(?:-(?P<prerelease>{_PRERELEASE_ID}(?:\.{_PRERELEASE_ID})*))?'
+    rf'(?:\+(?P<build>{_BUILD_ID}(?:\.{_BUILD_ID})*))?\Z'
+)
+
+# Bump types accepted by Version.bump
+BUMP_TYPES = ("major", "minor", "patch", "prerelease", "finalize")
+
+# Label of a new pre-release series when none is given
+DEFAULT_PREID = "rc"
+
+# Precedence suffix of a release, above every pre-release
+_RELEASE = (1,)
+
+Identifier = Union[int, str]
+
+
+def _identifier_key(identifier: Identifier) -> tuple:
+    """Numeric identifiers sort numerically and below alphanumeric ones."""
+    if isinstance(identifier, int):
+        return (0, identifier, "")
+    return (1, 0, identifier)
+
+
+class Version:
+    """
+    Immutable semantic version with SemVer 2.0 precedence.
+
+    Versions compare and hash by precedence, so build metadata is ignored:
+    ``1.0.0+a == 1.0.0+b``. ``str()`` keeps the exact parsed text. For large
+    sorts, ``sorted(versions, key=lambda v: v.precedence)`` avoids a Python
+    method call per comparison.
+
+    Attributes:
+        major: Major version number
+        minor: Minor version number
+        patch: Patch version number
+        prerelease: Pre-release identifiers, numeric ones as int
+        build: Build metadata identifiers
+        precedence: Tuple ordering versions by SemVer precedence
+    """
+
+    __slots__ = ("major", "minor", "patch", "prerelease", "build", "precedence", "_text", "_hash")
+
+    def __init__(
+        self,
+        major: int,
+        minor: int,
+        patch: int,
+        prerelease: tuple[Identifier, ...] = (),
+        build: tuple[str, ...] = (),
+        text: Optional[str] = None
+    ):
+        setattr_ = object.__setattr__
+        setattr_(self, "major", major)
+        setattr_(self, "minor", minor)
+        setattr_(self, "patch", patch)
+        setattr_(self, "prerelease", prerelease)
+        setattr_(self, "build", build)
+        suffix = (0, tuple(map(_identifier_key, prerelease))) if prerelease else _RELEASE
+        setattr_(self, "precedence", (major, minor, patch, suffix))
+        setattr_(self, "_text", text)
+        setattr_(self, "_hash", None)
+
+    @classmethod
+    def parse(cls, text: str) -> "Version":
+        """
+        Parse a version string.
+
+        Args:
+            text: Version such as ``1.4.0-rc.2+sha.abc``
+
+        Returns:
+            Parsed version
+
+        Raises:
+            ValueError: If the text is not a valid semantic version
+        """
+        match = SEMVER_RE.match(text)
+        if match is None:
+            raise ValueError(f"invalid semantic version: {text!r}")
+
+        major, minor, patch, prerelease, build = match.groups()
+        return cls(
+            int(major),
+            int(minor),
+            int(patch),
+            tuple(
+                int(part) if part.isdigit() else part for part in prerelease.split(".")
+            ) if prerelease else (),
+            tuple(build.split(".")) if build else (),
+            text,
+        )
+
+    @property
+    def is_prerelease(self) -> bool:
+        """True for versions with pre-release identifiers."""
+        return bool(self.prerelease)
+
+    def bump(self, bump_type: str, preid: Optional[str] = None) -> "Version":
+        """
+        Return the next version; build metadata is always dropped.
+
+        A pre-release is completed by the bump that reaches it, following npm:
+        ``2.0.0-rc.1`` bumps to ``2.0.0`` for major, ``1.3.0-rc.1`` to ``1.3.0``
+        for minor and ``1.2.4-rc.1`` to ``1.2.4`` for patch.
+
+        - prerelease: ``1.2.3`` → ``1.2.4-rc.1``, ``1.2.4-rc.1`` → ``1.2.4-rc.2``;
+          a different ``preid`` starts a new series (``rc.2`` → ``1.2.4-final.1``)
+        - finalize: ``1.2.4-rc.2`` → ``1.2.4``
+
+        Args:
+            bump_type: One of major, minor, patch, prerelease or finalize
+            preid: Pre-release label for prerelease bumps (default: keep the
+                current label, or "rc")
+
+        Returns:
+            Bumped version
+
+        Raises:
+            ValueError: If the bump type is unknown or doesn't apply
+        """
+        major, minor, patch = self.major, self.minor, self.patch
+        if bump_type == "major":
+            if not (self.prerelease and minor == 0 and patch == 0):
+                major, minor, patch = major + 1, 0, 0
+            return Version(major, minor, patch)
+        if bump_type == "minor":
+            if not (self.prerelease and patch == 0):
+                minor, patch = minor + 1, 0
+            return Version(major, minor, patch)
+        if bump_type == "patch":
+            if not self.prerelease:
+                patch += 1
+            return Version(major, minor, patch)
+        if bump_type == "finalize":
+            if not self.prerelease:
+                raise ValueError(f"{self} is not a pre-release")
+            return Version(major, minor, patch)
+        if bump_type == "prerelease":
+            return self._bump_prerelease(preid)
+        raise ValueError(f"unknown bump type: {bump_type!r}")
+
+    def _bump_prerelease(self, preid: Optional[str]) -> "Version":
+        """Start or continue a pre-release series."""
+        if preid is not None and not re.fullmatch(r'[0-9A-Za-z-]+', preid):
+            raise ValueError(f"invalid pre-release label: {preid!r}")
+
+        if not self.prerelease:
+            return Version(self.major, self.minor, self.patch + 1, (preid or DEFAULT_PREID, 1))
+
+        current = self.prerelease
+        if preid is not None and current[0] != preid:
+            return Version(self.major, self.minor, self.patch, (preid, 1))
+
+        # Increment the last numeric identifier, or start counting
+        for index in range(len(current) - 1, -1, -1):
+            if isinstance(current[index], int):
+                bumped = current[:index] + (current[index] + 1,) + current[index + 1:]
+                return Version(self.major, self.minor, self.patch, bumped)
+        return Version(self.major, self.minor, self.patch, current + (1,))
+
+    def __str__(self) -> str:
+        if self._text is None:
+            text = f"{self.major}.{self.minor}.{self.patch}"
+            if self.prerelease:
+                text += "-" + ".".join(map(str, self.prerelease))
+            if self.build:
+                text += "+" + ".".join(self.build)
+            object.__setattr__(self, "_text", text)
+        return self._text
+
+    def __repr__(self) -> str:
+        return f"Version({str(self)!r})"
+
+    def __setattr__(self, name: str, value: object) -> None:
+        raise AttributeError("Version is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError("Version is immutable")
+
+    def __hash__(self) -> int:
+        if self._hash is None:
+            object.__setattr__(self, "_hash", hash(self.precedence))
+        return self._hash
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Version):
+            return NotImplemented
+        return self.precedence == other.precedence
+
+    def __lt__(self, other: "Version") -> bool:
+        if not isinstance(other, Version):
+            return NotImplemented
+        return self.precedence < other.precedence
+
+    def __le__(self, other: "Version") -> bool:
+        if not isinstance(other, Version):
+            return NotImplemented
+        return self.precedence <= other.precedence
+
+    def __gt__(self, other: "Version") -> bool:
+        if not isinstance(other, Version):
+            return NotImplemented
+        return self.precedence > other.precedence
+
+    def __ge__(self, other: "Version") -> bool:
+        if not isinstance(other, Version):
+            return NotImplemented
+        return self.precedence >= other.precedence
@@ -0,0 +1,269 @@
+"""Long-lived JSON-lines server that keeps the module warm between calls.
+
+CI runners that check many repositories pay a new ``dagger call`` session and
+module load for every run. The server loads the module once and answers
+calls against local checkouts over a Unix socket or TCP, reusing compiled
+patterns and a file content cache across requests.
+
+Start it with::
+
+    python -m main.server --socket /run/dvm.sock
+    python -m main.server --host 127.0.0.1 --port 8765
+
+Each request is one JSON object per line, answered by one JSON line::
+
+    {"id": 1, "function": "validate-version", "source": "/repos/a"}
+    {"id": 1, "ok": true, "result": "✅ Version 1.2.3 is consistent"}
+
+``args`` holds the other arguments of the function (in snake_case), and
+``export: true`` writes returned directories back into the checkout. A
+request with ``jobs`` runs a batch concurrently and answers with
+``results`` in request order. ``{"function": "stats"}`` reports throughput
+and cache counters.
+"""
+
+import argparse
+import asyncio
+import dataclasses
+import json
+import os
+import time
+import typing
+from typing import Any, Optional
+
+import dagger
+
+from . import VersionManager
+from .local import FileCache, LocalClient, LocalDirectory
+
+# Functions served. Those reading the git history run containers and need an
+# engine; so do validate_changed with diff_base and bump_version with "auto".
+FUNCTIONS = (
+    "get_version",
+    "validate_version",
+    "validate_versions",
+    "validate_all",
+    "validate_changed",
+    "sync_version",
+    "sync_versions",
+    "sync_all",
+    "plan_sync",
+    "apply_plan",
+    "bump_version",
+    "release",
+    "analyze_tags",
+    "setup_git_hooks",
+)
+
+# Jobs run at once across all connections
+MAX_CONCURRENCY = 32
+
+# Longest accepted request line
+MAX_REQUEST_BYTES = 16 * 1024 * 1024
+
+
+def _directory_arguments(method: Any) -> dict[str, list[str]]:
+    """Map each Directory argument of a function to its upload filter."""
+    arguments = {}
+    for name, hint in typing.get_type_hints(method, include_extras=True).items():
+        metadata: tuple = ()
+        if typing.get_origin(hint) is typing.Annotated:
+            hint, *metadata = typing.get_args(hint)
+        if dagger.Directory not in (hint, *typing.get_args(hint)):
+            continue
+        arguments[name] = next(
+            (list(meta.patterns) for meta in metadata if isinstance(meta, dagger.Ignore)), []
+        )
+    return arguments
+
+
+class VersionServer:
+    """
+    Serve the module's functions against local checkouts.
+
+    One VersionManager and one file cache are shared by every request.
+
+    Args:
+        manager: Version manager to call (a new one is created when omitted)
+        max_concurrency: Jobs run at once across all connections
+    """
+
+    def __init__(
+        self,
+        manager: Optional[VersionManager] = None,
+        max_concurrency: int = MAX_CONCURRENCY
+    ):
+        self.manager = manager if manager is not None else VersionManager()
+        self.manager._client = LocalClient()
+        self.cache = FileCache()
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._directories = {
+            name: _directory_arguments(getattr(type(self.manager), name)) for name in FUNCTIONS
+        }
+        self._started = time.perf_counter()
+        self.jobs = 0
+        self.errors = 0
+
+    def stats(self) -> dict:
+        """Throughput and cache counters since the server started."""
+        uptime = time.perf_counter() - self._started
+        return {
+            "jobs": self.jobs,
+            "errors": self.errors,
+            "uptime_s": round(uptime, 3),
+            "jobs_per_second": round(self.jobs / uptime, 1) if uptime else 0.0,
+            "file_cache": self.cache.to_dict(),
+            "scheduler": self.manager._engine().stats.to_dict(),
+        }
+
+    async def _result(self, value: Any, export: bool) -> Any:
+        """Convert a function result to JSON data, exporting directories if asked."""
+        if isinstance(value, LocalDirectory):
+            if export:
+                await value.export()
+            return {"files": sorted(value.written), "exported": export}
+        if dataclasses.is_dataclass(value):
+            return {
+                item.name: await self._result(getattr(value, item.name), export)
+                for item in dataclasses.fields(value)
+            }
+        return value
+
+    async def run_job(self, job: dict) -> dict:
+        """
+        Run one function call.
+
+        Args:
+            job: Request with function, source, args and export
+
+        Returns:
+            Response with ok and result, or ok=false and error
+        """
+        response: dict[str, Any] = {"id": job.get("id")}
+        name = str(job.get("function", "")).replace("-", "_")
+        if name == "stats":
+            return {**response, "ok": True, "result": self.stats()}
+        if name not in self._directories:
+            self.errors += 1
+            error = f"❌ Unknown function: {job.get('function')}"
+            return {**response, "ok": False, "error": error}
+
+        arguments = dict(job.get("args") or {})
+        if "source" in job:
+            arguments["source"] = job["source"]
+        async with self._semaphore:
+            try:
+                for argument, exclude in self._directories[name].items():
+                    path = arguments.get(argument)
+                    if path is None:
+                        continue
+                    if not os.path.isdir(path):
+                        raise ValueError(f"{argument}: {path} is not a directory")
+                    arguments[argument] = LocalDirectory(path, exclude, self.cache)
+                value = await getattr(self.manager, name)(**arguments)
+                response.update(ok=True, result=await self._result(value, bool(job.get("export"))))
+            except Exception as e:
+                self.errors += 1
+                response.update(ok=False, error=f"❌ {name} failed: {e}")
+            finally:
+                self.jobs += 1
+        return response
+
+    async def handle(self, request: dict) -> dict:
+        """
+        Answer one request: a single job, or a batch under ``jobs``.
+
+        Args:
+            request: Decoded request line
+
+        Returns:
+            Response object
+        """
+        if "jobs" not in request:
+            return await self.run_job(request)
+        results = await asyncio.gather(*(self.run_job(job) for job in request["jobs"]))
+        return {"id": request.get("id"), "ok": all(r["ok"] for r in results), "results": results}
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Answer the requests of one connection, one line each, in order."""
+        try:
+            while line := await reader.readline():
+                if not line.strip():
+                    continue
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError("request must be a JSON object")
+                except ValueError as e:
+                    response = {"id": None, "ok": False, "error": f"❌ Invalid request: {e}"}
+                else:
+                    response = await self.handle(request)
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def start_unix(self, path: str) -> asyncio.AbstractServer:
+        """Listen on a Unix socket (replacing a stale socket file)."""
+        if os.path.exists(path):
+            os.unlink(path)
+        return await asyncio.start_unix_server(self._serve, path, limit=MAX_REQUEST_BYTES)
+
+    async def start_tcp(self, host: str, port: int) -> asyncio.AbstractServer:
+        """Listen on a TCP port."""
+        return await asyncio.start_server(self._serve, host, port, limit=MAX_REQUEST_BYTES)
+
+
+async def serve(
+    socket_path: Optional[str] = None,
+    host: str = "127.0.0.1",
+    port: Optional[int] = None,
+    max_concurrency: int = MAX_CONCURRENCY
+) -> None:
+    """
+    Run the server until cancelled.
+
+    Args:
+        socket_path: Unix socket to listen on
+        host: TCP address to listen on (with port)
+        port: TCP port to listen on
+        max_concurrency: Jobs run at once across all connections
+    """
+    server = VersionServer(max_concurrency=max_concurrency)
+    if socket_path:
+        listener = await server.start_unix(socket_path)
+        address = socket_path
+    else:
+        listener = await server.start_tcp(host, port or 0)
+        address = "{}:{}".format(*listener.sockets[0].getsockname()[:2])
+    print(f"✅ Dagger Version Manager listening on {address}", flush=True)
+    async with listener:
+        await listener.serve_forever()
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(
+        prog="python -m main.server",
+        description="Serve version manager functions over JSON lines.",
+    )
+    parser.add_argument("--socket", help="Unix socket to listen on")
+    parser.add_argument("--host", default="127.0.0.1", help="TCP address (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, help="TCP port (0 picks a free port)")
+    parser.add_argument(
+        "--max-concurrency", type=int, default=MAX_CONCURRENCY,
+        help=f"Jobs run at once (default: {MAX_CONCURRENCY})",
+    )
+    args = parser.parse_args(argv)
+    if not args.socket and args.port is None:
+        parser.error("one of --socket or --port is required")
+    try:
+        asyncio.run(serve(args.socket, args.host, args.port, args.max_concurrency))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""Snapshot of the small metadata files a call reads, taken in one container exec."""
+
+import posixpath
+from dataclasses import dataclass, field
+from typing import Iterable, Optional
+
+from .filters import MANIFEST_FILE, MARKER_FILES
+
+# Files most calls look at: version files, manifest, project markers and git hooks
+SNAPSHOT_FILES = (
+    "VERSION",
+    "version/VERSION",
+    MANIFEST_FILE,
+    *MARKER_FILES,
+    "dagger.json",
+    ".git/hooks/pre-commit",
+    ".git/hooks/pre-push",
+)
+
+# POSIX sh, runnable in the git image and on any developer machine.
+#
+# Inputs (environment):
+#   DVM_SNAPSHOT_DIRS       Newline-separated directories to list
+#   DVM_SNAPSHOT_FILES      Newline-separated files to read
+#   DVM_SNAPSHOT_MAX_BYTES  Total bytes of file contents to print
+#
+# Output, one record per input path:
+#   D <size> <dir>\n<size bytes: entries, one per line, "/" after directories>
+#   F <size> <file>\n<size bytes: contents>
+#   D - <dir>\n / F - <file>\n   no such directory or file
+#   F + <file>\n                 over the size cap, left for a normal read
+SNAPSHOT_SCRIPT = r'''set -u
+max_bytes="${DVM_SNAPSHOT_MAX_BYTES:-0}"
+total=0
+
+while IFS= read -r dir; do
+    [ -n "$dir" ] || continue
+    if [ -d "$dir" ]; then
+        listing=$(ls -A1p -- "$dir")
+        size=$(printf '%s' "$listing" | wc -c | tr -d ' ')
+        printf 'D %s %s\n%s' "$size" "$dir" "$listing"
+    else
+        printf 'D - %s\n' "$dir"
+    fi
+done <<EOF
+${DVM_SNAPSHOT_DIRS:-}
+EOF
+
+while IFS= read -r path; do
+    [ -n "$path" ] || continue
+    if [ ! -f "$path" ]; then
+        printf 'F - %s\n' "$path"
+        continue
+    fi
+    size=$(wc -c < "$path" | tr -d ' ')
+    if [ $((total + size)) -gt "$max_bytes" ]; then
+        printf 'F + %s\n' "$path"
+        continue
+    fi
+    total=$((total + size))
+    printf 'F %s %s\n' "$size" "$path"
+    cat -- "$path"
+done <<EOF
+${DVM_SNAPSHOT_FILES:-}
+EOF
+'''
+
+
+def snapshot_paths(extra_files: Iterable[Optional[str]]) -> tuple[list[str], list[str]]:
+    """
+    Choose what a snapshot lists and reads.
+
+    Args:
+        extra_files: Call-specific files (version file, targets, changelog)
+
+    Returns:
+        Tuple of (directories, files). The directories are the parents of the
+        files, so existence checks are answered from the snapshot too.
+    """
+    files = list(dict.fromkeys(
+        posixpath.normpath(path).lstrip("/")
+        for path in (*SNAPSHOT_FILES, *extra_files) if path
+    ))
+    directories = list(dict.fromkeys(posixpath.dirname(path) or "." for path in files))
+    return directories, files
+
+
+@dataclass
+class Snapshot:
+    """
+    Directory listings and file contents captured in one query.
+
+    Attributes:
+        entries: Entry names by directory; None if the directory doesn't exist
+        files: Contents by file path; None if the file doesn't exist
+        skipped: Files over the size cap, not captured
+    """
+
+    entries: dict[str, Optional[list[str]]] = field(default_factory=dict)
+    files: dict[str, Optional[str]] = field(default_factory=dict)
+    skipped: list[str] = field(default_factory=list)
+
+    @classmethod
+    def from_output(cls, output: str) -> "Snapshot":
+        """
+        Parse the records printed by the snapshot script.
+
+        Args:
+            output: Standard output of SNAPSHOT_SCRIPT
+
+        Returns:
+            Parsed snapshot
+
+        Raises:
+            ValueError: If a record is malformed or truncated
+        """
+        snapshot = cls()
+        data = output.encode()
+        pos = 0
+        while pos < len(data):
+            newline = data.find(b"\n", pos)
+            if newline < 0:
+                raise ValueError(f"truncated snapshot record at byte {pos}")
+            try:
+                kind, size, path = data[pos:newline].decode().split(" ", 2)
+            except ValueError:
+                raise ValueError(f"malformed snapshot record at byte {pos}")
+            pos = newline + 1
+
+            if size in ("-", "+"):
+                body = None
+            elif size.isdigit():
+                end = pos + int(size)
+                if end > len(data):
+                    raise ValueError(f"truncated snapshot of {path}")
+                body = data[pos:end].decode()
+                pos = end
+            else:
+                raise ValueError(f"malformed snapshot record at byte {pos}")
+
+            if kind == "D":
+                snapshot.entries[path] = None if body is None else body.splitlines()
+            elif kind == "F" and size == "+":
+                snapshot.skipped.append(path)
+            elif kind == "F":
+                snapshot.files[path] = body
+            else:
+                raise ValueError(f"unknown snapshot record type: {kind!r}")
+        return snapshot
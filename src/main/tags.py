@@ -0,0 +1,243 @@
+"""Bulk analysis of release tags: sorting, gaps and the next free version."""
+
+from bisect import bisect_left
+from typing import Iterable, Optional
+
+from .semver import Version
+
+# Where git keeps tags, relative to the repository root
+LOOSE_TAGS_DIRECTORY = ".git/refs/tags"
+PACKED_REFS_FILE = ".git/packed-refs"
+
+# Prefix of every tag reference in packed-refs
+_TAG_REF_PREFIX = "refs/tags/"
+
+
+def parse_packed_refs(content: str) -> list[str]:
+    """
+    Extract tag names from a packed-refs file.
+
+    Header lines (``#``) and peeled object lines (``^``) are skipped.
+
+    Args:
+        content: Contents of .git/packed-refs
+
+    Returns:
+        Tag names in file order
+    """
+    names = []
+    for line in content.splitlines():
+        if not line or line[0] in "#^":
+            continue
+        _, _, ref = line.partition(" ")
+        if ref.startswith(_TAG_REF_PREFIX):
+            names.append(ref[len(_TAG_REF_PREFIX):])
+    return names
+
+
+def loose_tag_names(paths: Iterable[str]) -> list[str]:
+    """
+    Turn glob results below .git/refs/tags into tag names.
+
+    Directories (nested tags such as ``release/v1.0.0``) are dropped, whether
+    or not the engine reports them with a trailing slash.
+
+    Args:
+        paths: Paths relative to the repository root
+
+    Returns:
+        Sorted tag names
+    """
+    prefix = LOOSE_TAGS_DIRECTORY + "/"
+    names = sorted(
+        path[len(prefix):] for path in paths
+        if path.startswith(prefix) and not path.endswith("/")
+    )
+    return [
+        name for index, name in enumerate(names)
+        if index + 1 == len(names) or not names[index + 1].startswith(name + "/")
+    ]
+
+
+class TagIndex:
+    """
+    Sorted index of the versions named by a set of tags.
+
+    Tags are parsed once and kept sorted by precedence next to a parallel list
+    of precedence keys, so membership and per-major lookups are binary searches
+    rather than rescans of the tag list.
+
+    Attributes:
+        prefix: Prefix stripped from every tag (e.g. "v")
+        versions: Parsed versions in ascending precedence
+        tags: Tag name of each version, in the same order
+        skipped: Tags without the prefix or without a valid version
+    """
+
+    def __init__(self, tags: Iterable[str], prefix: str = "v"):
+        self.prefix = prefix
+        self.skipped: list[str] = []
+
+        parsed = []
+        for tag in dict.fromkeys(tags):
+            if not tag.startswith(prefix):
+                self.skipped.append(tag)
+                continue
+            try:
+                parsed.append((Version.parse(tag[len(prefix):]), tag))
+            except ValueError:
+                self.skipped.append(tag)
+
+        parsed.sort(key=lambda item: item[0].precedence)
+        self.versions: list[Version] = [version for version, _ in parsed]
+        self.tags: list[str] = [tag for _, tag in parsed]
+        self._keys = [version.precedence for version in self.versions]
+
+    def __len__(self) -> int:
+        return len(self.versions)
+
+    def __contains__(self, version: Version) -> bool:
+        index = bisect_left(self._keys, version.precedence)
+        return index < len(self._keys) and self._keys[index] == version.precedence
+
+    def latest(self, include_prereleases: bool = True) -> Optional[Version]:
+        """
+        Return the highest version.
+
+        Args:
+            include_prereleases: Consider pre-releases as well as releases
+
+        Returns:
+            Highest version, or None if there is none
+        """
+        for version in reversed(self.versions):
+            if include_prereleases or not version.prerelease:
+                return version
+        return None
+
+    def latest_in_major(self, major: int, include_prereleases: bool = False) -> Optional[Version]:
+        """
+        Return the highest version of one major line.
+
+        Args:
+            major: Major version number
+            include_prereleases: Consider pre-releases as well as releases
+
+        Returns:
+            Highest version of the line, or None if there is none
+        """
+        start = bisect_left(self._keys, (major,))
+        for index in range(bisect_left(self._keys, (major + 1,)) - 1, start - 1, -1):
+            if include_prereleases or not self.versions[index].prerelease:
+                return self.versions[index]
+        return None
+
+    def latest_per_major(self) -> dict[int, Version]:
+        """
+        Return the latest release of every major line.
+
+        Returns:
+            Mapping of major version number to its latest release, ascending
+        """
+        latest = {}
+        index = 0
+        while index < len(self._keys):
+            major = self._keys[index][0]
+            end = bisect_left(self._keys, (major + 1,))
+            release = self.latest_in_major(major)
+            if release is not None:
+                latest[major] = release
+            index = end
+        return latest
+
+    def gaps(self) -> list[tuple[Version, Version, Version]]:
+        """
+        Find releases that don't directly follow the previous release.
+
+        Consecutive releases ``a < b`` form a gap when ``b`` isn't the major,
+        minor or patch bump of ``a`` at the level where they differ, e.g.
+        ``1.2.3`` → ``1.2.6`` (expected ``1.2.4``) or ``1.2.3`` → ``1.4.0``
+        (expected ``1.3.0``). Pre-releases are ignored.
+
+        Returns:
+            List of (previous, next, expected) versions
+        """
+        found = []
+        releases = [version for version in self.versions if not version.prerelease]
+        for previous, current in zip(releases, releases[1:]):
+            if current.major != previous.major:
+                expected = previous.bump("major")
+            elif current.minor != previous.minor:
+                expected = previous.bump("minor")
+            else:
+                expected = previous.bump("patch")
+            if current.precedence != expected.precedence:
+                found.append((previous, current, expected))
+        return found
+
+    def next_version(
+        self,
+        bump_type: str,
+        preid: Optional[str] = None,
+        major: Optional[int] = None
+    ) -> Version:
+        """
+        Compute the next version that isn't tagged yet.
+
+        The highest version (of the major line, if given) is bumped, and bumped
+        again for as long as the result is already tagged. Without any tag the
+        bump starts from 0.0.0.
+
+        Args:
+            bump_type: One of major, minor, patch, prerelease or finalize
+            preid: Pre-release label for prerelease bumps
+            major: Restrict the starting point to a major line (for maintenance
+                releases such as the next 1.x patch)
+
+        Returns:
+            First untagged version
+
+        Raises:
+            ValueError: If the bump type is unknown or doesn't apply
+        """
+        if major is None:
+            base = self.latest()
+        else:
+            base = self.latest_in_major(major, include_prereleases=True)
+        candidate = (base or Version(0, 0, 0)).bump(bump_type, preid)
+        while candidate in self:
+            candidate = candidate.bump(bump_type, preid)
+        return candidate
+
+    def to_dict(self, bump_type: str, preid: Optional[str] = None) -> dict:
+        """
+        Summarize the index for dashboards.
+
+        Args:
+            bump_type: Bump type used to compute the next version
+            preid: Pre-release label for prerelease bumps
+
+        Returns:
+            Plain data with the sorted versions, latest releases, gaps and
+            next free version
+        """
+        latest = self.latest()
+        latest_release = self.latest(include_prereleases=False)
+        return {
+            "count": len(self),
+            "versions": [str(version) for version in self.versions],
+            "latest": str(latest) if latest else None,
+            "latest_release": str(latest_release) if latest_release else None,
+            "latest_per_major": {
+                str(major): str(version) for major, version in self.latest_per_major().items()
+            },
+            "gaps": [
+                {"after": str(previous), "before": str(current), "expected": str(expected)}
+                for previous, current, expected in self.gaps()
+            ],
+            "next": {
+                "bump_type": bump_type,
+                "version": str(self.next_version(bump_type, preid)),
+            },
+            "skipped": self.skipped,
+        }
@@ -0,0 +1,8 @@
+"""Engine-cost benchmarks for Dagger Version Manager.
+
+Round-trip, byte and upload counts are deterministic and run with the unit
+tests. Wall-clock and throughput checks depend on the machine and carry the
+``benchmark`` marker, which the default run excludes::
+
+    python -m pytest -m benchmark tests/benchmarks
+"""
@@ -0,0 +1,73 @@
+"""Cold start of the module, measured with ``python -X importtime``.
+
+The Dagger SDK is imported first: every function call loads it regardless,
+so the budget covers only what this module adds on top, including the
+registration of the object types and functions. Bytecode is cached in a
+temporary prefix, as a deployed module would have it.
+"""
+
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+# Budget for importing src.main once the SDK is loaded (cumulative, µs)
+IMPORT_BUDGET_US = 20_000
+
+# Submodules that only specific functions need
+DEFERRED_MODULES = [
+    "src.main.commits",
+    "src.main.hooks",
+    "src.main.manifest",
+    "src.main.plan",
+    "src.main.rewriters",
+    "src.main.scheduler",
+    "src.main.semver",
+    "src.main.snapshot",
+    "src.main.tags",
+]
+
+ROOT = Path(__file__).resolve().parents[2]
+
+SCRIPT = f"""
+import sys
+import dagger
+import src.main
+print(",".join(sorted(name for name in {DEFERRED_MODULES!r} if name in sys.modules)))
+"""
+
+
+def cold_import(pycache: Path) -> tuple[int, str]:
+    """Import the module in a fresh interpreter; return (µs, loaded deferred modules)."""
+    env = {key: value for key, value in os.environ.items() if key != "PYTHONDONTWRITEBYTECODE"}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-X", f"pycache_prefix={pycache}", "-c", SCRIPT],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+    )
+    (line,) = [
+        line for line in result.stderr.splitlines()
+        if re.search(r"\|\s*src\.main$", line)
+    ]
+    return int(line.split("|")[1]), result.stdout.strip()
+
+
+class TestColdStart:
+    """Module import time against the tracked budget."""
+
+    def test_submodules_deferred(self, tmp_path):
+        """Test importing the module loads none of the deferred submodules."""
+        _, loaded = cold_import(tmp_path)
+        assert loaded == ""
+
+    @pytest.mark.benchmark
+    def test_import_within_budget(self, tmp_path):
+        """Test importing the module stays within budget."""
+        cold_import(tmp_path)  # write bytecode caches
+        timings = [cold_import(tmp_path)[0] for _ in range(10)]
+        best = min(timings)
+        assert best <= IMPORT_BUDGET_US, (
+            f"import src.main: {best / 1000:.1f}ms (budget {IMPORT_BUDGET_US / 1000:.0f}ms)"
+        )
@@ -0,0 +1,107 @@
+"""Commit scan latency on a 20k-commit release branch."""
+
+import os
+import shutil
+import subprocess
+import time
+
+import pytest
+
+from src.main.commits import SCAN_SCRIPT, BumpInference
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git is not installed")
+
+COMMITS = 20_000
+
+# Ceilings on a slow CI runner
+MAX_FULL_SCAN_SECONDS = 5.0
+MAX_EARLY_EXIT_SECONDS = 1.0
+MAX_CACHED_SECONDS = 0.5
+NEW_COMMITS = 5
+
+GIT_ENV = {
+    "GIT_AUTHOR_NAME": "Bench",
+    "GIT_AUTHOR_EMAIL": "bench@example.com",
+    "GIT_COMMITTER_NAME": "Bench",
+    "GIT_COMMITTER_EMAIL": "bench@example.com",
+}
+
+
+def fast_import(path, messages: list[str]) -> None:
+    """Create a linear history in one git fast-import run (commits chain on main)."""
+    stream = []
+    for mark, message in enumerate(messages, 1):
+        data = message.encode()
+        stream.append(
+            f"commit refs/heads/main\nmark :{mark}\n"
+            f"committer Bench <bench@example.com> {1_700_000_000 + mark} +0000\n"
+            f"data {len(data)}\n".encode() + data + b"\n"
+        )
+    subprocess.run(["git", "init", "-q", "-b", "main"], cwd=path, check=True)
+    subprocess.run(["git", "fast-import", "--quiet"], cwd=path, input=b"".join(stream), check=True)
+    subprocess.run(["git", "tag", "v1.0.0", ":/^chore: release"], cwd=path, check=True)
+
+
+def scan(path, cache_dir: str = "") -> tuple[BumpInference, float]:
+    """Run the scan script and time it."""
+    env = dict(os.environ, DVM_CACHE_DIR=cache_dir, DVM_SINCE="", DVM_TAG_PREFIX="v")
+    start = time.perf_counter()
+    result = subprocess.run(
+        ["sh", "-c", SCAN_SCRIPT], cwd=path, env=env, check=True, capture_output=True, text=True
+    )
+    return BumpInference.from_output(result.stdout), time.perf_counter() - start
+
+
+@pytest.fixture(scope="module")
+def scans(tmp_path_factory) -> dict[str, tuple[BumpInference, float]]:
+    """Full, early-exit, first cached and cached rescans of a long branch."""
+    tmp_path = tmp_path_factory.mktemp("scans")
+    fixes = [f"fix: bug {i}\n\nDetails of the fix.\n" for i in range(COMMITS)]
+
+    plain = tmp_path / "plain"
+    plain.mkdir()
+    fast_import(plain, ["chore: release"] + fixes)
+    results = {"full": scan(plain)}
+
+    breaking = tmp_path / "breaking"
+    breaking.mkdir()
+    fast_import(breaking, ["chore: release"] + fixes + ["feat!: new api", "fix: late"])
+    results["early"] = scan(breaking)
+
+    cache_dir = str(tmp_path / "cache")
+    results["first"] = scan(plain, cache_dir)
+    for i in range(NEW_COMMITS):
+        subprocess.run(
+            ["git", "commit", "-q", "--allow-empty", "-m", f"feat: new {i}"],
+            cwd=plain, env=dict(os.environ, **GIT_ENV), check=True
+        )
+    results["cached"] = scan(plain, cache_dir)
+    return results
+
+
+class TestCommitScan:
+    """Full, early-exit and cached scans of a long branch."""
+
+    def test_commits_read(self, scans):
+        """Test each scan mode reads only the commits it needs."""
+        assert (scans["full"][0].bump_type, scans["full"][0].scanned) == ("patch", COMMITS)
+        assert (scans["early"][0].bump_type, scans["early"][0].scanned) == ("major", 2)
+        assert (scans["cached"][0].bump_type, scans["cached"][0].scanned) == (
+            "minor", NEW_COMMITS
+        )
+
+    @pytest.mark.benchmark
+    def test_long_history(self, scans):
+        """Test each scan mode stays within its ceiling."""
+        full_time, early_time = scans["full"][1], scans["early"][1]
+        first_time, cached_time = scans["first"][1], scans["cached"][1]
+        assert full_time <= MAX_FULL_SCAN_SECONDS, (
+            f"{COMMITS} commits: full scan {full_time * 1000:.0f}ms"
+        )
+        assert early_time <= MAX_EARLY_EXIT_SECONDS, (
+            f"early exit {early_time * 1000:.0f}ms ({scans['early'][0].scanned} read)"
+        )
+        assert cached_time <= MAX_CACHED_SECONDS, (
+            f"cached rescan after {NEW_COMMITS} commits {cached_time * 1000:.0f}ms "
+            f"(first cached scan {first_time * 1000:.0f}ms)"
+        )
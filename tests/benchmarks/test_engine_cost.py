@@ -0,0 +1,78 @@
+"""Engine round-trips and bytes transferred per public function."""
+
+import pytest
+
+from src.main import VersionManager
+from tests.fakes import FakeDirectory
+
+# Large enough that streaming a file just to test existence is visible
+FILLER = "# filler\n" * 200_000
+
+# Cost of the contents()-probing implementation on the same tree, recorded
+# before existence checks moved to directory listings: (round_trips, bytes)
+BEFORE = {
+    "get_version": (3, 12),
+    "validate_version": (4, 1_800_035),
+    "sync_version": (4, 1_800_035),
+    "bump_version": (5, 18),
+    "release": (13, 3_600_088),
+    "setup_git_hooks": (8, 1_800_088),
+}
+
+# Directory listings transfer entry names instead of contents; allow for them
+LISTING_OVERHEAD = 256
+
+CALLS = {
+    "get_version": lambda vm, src: vm.get_version(src),
+    "validate_version": lambda vm, src: vm.validate_version(src),
+    "sync_version": lambda vm, src: vm.sync_version(src),
+    "bump_version": lambda vm, src: vm.bump_version(src, "patch"),
+    "release": lambda vm, src: vm.release(src),
+    "setup_git_hooks": lambda vm, src: vm.setup_git_hooks(src),
+}
+
+
+def large_tree() -> FakeDirectory:
+    """Ansible collection with multi-MB marker files and an existing hook."""
+    return FakeDirectory({
+        "VERSION": "1.2.3\n",
+        "galaxy.yml": "name: c\nversion: 1.2.3\n" + FILLER,
+        "Dockerfile": "FROM python:3.11\n" + FILLER,
+        ".git/HEAD": "ref: refs/heads/main\n",
+        ".git/hooks/pre-commit": "#!/bin/sh\n# DAGGER-VERSION-MANAGER: v1.2.3\n",
+    })
+
+
+async def measure(name: str) -> tuple[int, int]:
+    """Run one public function against a fresh tree and return its cost."""
+    source = large_tree()
+    await CALLS[name](VersionManager(), source)
+    return source.stats.round_trips, source.stats.bytes
+
+
+class TestEngineCost:
+    """Compare engine cost per public function against the recorded baseline."""
+
+    @pytest.mark.parametrize("name", sorted(CALLS))
+    async def test_cost_does_not_regress(self, name):
+        """Every public function costs at most what it did before (plus listing names)."""
+        trips, transferred = await measure(name)
+        before_trips, before_bytes = BEFORE[name]
+        assert trips <= before_trips, f"{name}: round-trips {before_trips} -> {trips}"
+        assert transferred <= before_bytes + LISTING_OVERHEAD, (
+            f"{name}: bytes {before_bytes} -> {transferred}"
+        )
+
+    async def test_hook_setup_never_streams_marker_files(self):
+        """Marker detection answers from listings, not file contents."""
+        source = large_tree()
+        await VersionManager().setup_git_hooks(source)
+        assert source.stats.count("contents", "galaxy.yml") == 0
+        assert source.stats.count("contents", "Dockerfile") == 0
+        assert source.stats.bytes < 1_000
+
+    async def test_missing_files_are_not_fetched(self):
+        """Probing for absent files never issues a contents() call."""
+        source = large_tree()
+        await VersionManager().get_version(source)
+        assert source.stats.count("contents", "version/VERSION") == 0
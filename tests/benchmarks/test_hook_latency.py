@@ -0,0 +1,84 @@
+"""Latency of the generated pre-commit hook on its fast and Dagger paths."""
+
+import os
+import stat
+import subprocess
+import time
+
+import pytest
+
+from src.main import VersionManager
+
+# Modeled cost of one `dagger call`: engine session, module load and upload
+DAGGER_STARTUP = 1.0
+
+# Budget for a commit that the embedded check decides on its own
+FAST_PATH_BUDGET = 0.5
+
+DAGGER_SHIM = f"""#!/bin/sh
+sleep {DAGGER_STARTUP}
+echo "✅ Version 1.2.3 is consistent"
+"""
+
+
+def setup_project(tmp_path) -> tuple[str, dict[str, str]]:
+    """Write an Ansible git project with a generated hook and a slow dagger shim."""
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    subprocess.run(["git", "init", "-q", str(repo)], check=True)
+    (repo / "VERSION").write_text("1.2.3\n")
+    (repo / "galaxy.yml").write_text(
+        "".join(f"key_{i}: value\n" for i in range(2_000)) + "version: 1.2.3\n"
+    )
+    hook = repo / "pre-commit"
+    hook.write_text(
+        VersionManager()._generate_hook_content("pre-commit", "1.2.3", "galaxy.yml", r'^version:.*$')
+    )
+
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    shim = bin_dir / "dagger"
+    shim.write_text(DAGGER_SHIM)
+    shim.chmod(shim.stat().st_mode | stat.S_IEXEC)
+    env = dict(os.environ)
+    env["PATH"] = f"{bin_dir}{os.pathsep}{env['PATH']}"
+    env.pop("DVM_HOOK_FORCE_DAGGER", None)
+    return str(repo), env
+
+
+def best_of(repo: str, env: dict[str, str], repeat: int = 3) -> float:
+    """Return the fastest of several hook runs."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = subprocess.run(["bash", "pre-commit"], cwd=repo, env=env, capture_output=True)
+        timings.append(time.perf_counter() - start)
+        assert result.returncode == 0
+    return min(timings)
+
+
+@pytest.mark.benchmark
+class TestHookLatency:
+    """Embedded check against the Dagger call it replaces."""
+
+    def test_fast_path_skips_engine(self, tmp_path):
+        """Test a decidable commit never pays the engine startup."""
+        repo, env = setup_project(tmp_path)
+
+        fast = best_of(repo, {**env, "DVM_NO_CACHE": "1"})
+        dagger = best_of(repo, {**env, "DVM_HOOK_FORCE_DAGGER": "1", "DVM_NO_CACHE": "1"}, repeat=1)
+        assert fast < FAST_PATH_BUDGET, f"pre-commit hook: fast path {fast * 1000:.0f}ms"
+        assert dagger >= DAGGER_STARTUP, f"pre-commit hook: dagger path {dagger * 1000:.0f}ms"
+
+    def test_cache_skips_engine_on_repeat(self, tmp_path):
+        """Test an undecidable commit only pays the engine startup once."""
+        repo, env = setup_project(tmp_path)
+        # Both VERSION layouts: only the module may decide
+        os.makedirs(os.path.join(repo, "version"))
+        with open(os.path.join(repo, "version", "VERSION"), "w") as handle:
+            handle.write("1.2.3\n")
+
+        first = best_of(repo, env, repeat=1)
+        cached = best_of(repo, env)
+        assert first >= DAGGER_STARTUP, f"pre-commit hook: uncached {first * 1000:.0f}ms"
+        assert cached < FAST_PATH_BUDGET, f"pre-commit hook: cached {cached * 1000:.0f}ms"
@@ -0,0 +1,76 @@
+"""Microbenchmark of version extraction over large target files."""
+
+import re
+import time
+
+import pytest
+
+from src.main import VersionManager
+
+# Generated manifest with the version line at the very end
+LINES = 100_000
+TARGET = "".join(f"key_{i}: value {i}\n" for i in range(LINES)) + "version: 4.5.6\n"
+PATTERN = r'^version:.*$'
+
+
+def legacy_extract(content: str, version_pattern: str):
+    """Reference: per-line re.match on the raw pattern plus a second search."""
+    for line in content.split('\n'):
+        if re.match(version_pattern, line):
+            version_match = re.search(r'\d+\.\d+\.\d+', line)
+            if version_match:
+                return version_match.group(0)
+    return None
+
+
+def best_of(fn, repeat: int = 3) -> float:
+    """Return the fastest of several timed runs."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+class TestPatternScan:
+    """Compiled pattern registry against per-call re.match."""
+
+    def test_extract_100k_lines(self):
+        """Test extraction over 100k lines agrees with the reference."""
+        vm = VersionManager()
+        assert vm._extract_version_from_target(TARGET, PATTERN) == "4.5.6"
+        assert legacy_extract(TARGET, PATTERN) == "4.5.6"
+
+    @pytest.mark.benchmark
+    def test_extract_speed(self):
+        """Test extraction over 100k lines is at least as fast as before."""
+        vm = VersionManager()
+        legacy = best_of(lambda: legacy_extract(TARGET, PATTERN))
+        registry = best_of(lambda: vm._extract_version_from_target(TARGET, PATTERN))
+        assert registry <= legacy * 1.1, (
+            f"extract {LINES} lines: legacy {legacy * 1000:.1f}ms -> {registry * 1000:.1f}ms"
+        )
+
+    def test_sync_100k_lines(self):
+        """Test rewriting the version line of a 100k-line file."""
+        vm = VersionManager()
+        updated = vm._update_target_content(TARGET, "big.yml", PATTERN, "4.5.7")
+        assert updated.endswith("version: 4.5.7\n")
+
+    @pytest.mark.benchmark
+    def test_early_exit(self):
+        """Test a version near the top is found without scanning the rest."""
+        vm = VersionManager()
+        head = "version: 1.0.0\n" + TARGET
+        elapsed = best_of(lambda: vm._extract_version_from_target(head, PATTERN))
+        full = best_of(lambda: vm._extract_version_from_target(TARGET, PATTERN))
+        assert elapsed < full / 10, (
+            f"early exit: {elapsed * 1000:.3f}ms vs full scan {full * 1000:.1f}ms"
+        )
+
+    def test_crlf_100k_lines(self):
+        """Test CRLF files are scanned line by line without a line list."""
+        vm = VersionManager()
+        crlf = TARGET.replace("\n", "\r\n")
+        assert vm._extract_version_from_target(crlf, PATTERN) == "4.5.6"
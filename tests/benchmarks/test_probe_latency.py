@@ -0,0 +1,91 @@
+"""Wall-time of existence probes against an engine with per-call latency."""
+
+import asyncio
+import time
+
+import pytest
+
+from src.main import VersionManager
+from src.main.context import CallContext
+from tests.fakes import FakeDirectory
+
+# Simulated round-trip to a remote engine
+LATENCY = 0.02
+
+MARKERS = ["galaxy.yml", "pyproject.toml", "Chart.yaml", "Dockerfile"]
+
+
+def remote_tree() -> FakeDirectory:
+    """Docker project (lowest priority marker) behind a slow engine."""
+    return FakeDirectory(
+        {
+            "version/VERSION": "1.2.3\n",
+            "Dockerfile": 'FROM python:3.11\nLABEL version="1.2.3"\n',
+            ".git/HEAD": "ref: refs/heads/main\n",
+            ".git/hooks/pre-commit": "#!/bin/sh\n# DAGGER-VERSION-MANAGER: v1.2.3\n",
+        },
+        latency=LATENCY,
+    )
+
+
+async def timed(coro) -> tuple[object, float]:
+    """Await a coroutine and return its result with the elapsed wall time."""
+    start = time.perf_counter()
+    result = await coro
+    return result, time.perf_counter() - start
+
+
+async def serial_marker_probes(source: FakeDirectory) -> None:
+    """Reference: one awaited contents() probe per marker, as before."""
+    for marker in MARKERS:
+        try:
+            await source.file(marker).contents()
+            return
+        except Exception:
+            continue
+
+
+class TestProbeLatency:
+    """Probes run concurrently, so latency no longer scales with probe count."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.vm = VersionManager()
+
+    @pytest.mark.benchmark
+    async def test_detect_project_type(self):
+        """Test marker detection costs one round-trip and keeps priority order."""
+        _, serial = await timed(serial_marker_probes(remote_tree()))
+        source = remote_tree()
+        result, concurrent = await timed(self.vm._detect_project_type(source, CallContext()))
+        assert result[0] == "Docker"
+        assert concurrent < 1.5 * LATENCY < serial, (
+            f"_detect_project_type: serial {serial:.3f}s -> concurrent {concurrent:.3f}s"
+        )
+
+    @pytest.mark.benchmark
+    async def test_resolve_version_file(self):
+        """Test both VERSION locations are probed in parallel."""
+        source = remote_tree()
+        result, elapsed = await timed(
+            self.vm._resolve_version_file(source, "VERSION", CallContext())
+        )
+        assert result == ("version/VERSION", None)
+        assert elapsed < 1.5 * LATENCY, f"_resolve_version_file: {elapsed:.3f}s for 2 probes"
+
+    @pytest.mark.benchmark
+    async def test_setup_git_hooks(self):
+        """Test hook setup lists every directory it needs in one concurrent round."""
+        source = remote_tree()
+        _, elapsed = await timed(self.vm.setup_git_hooks(source))
+        # listings (1 round) + VERSION read + existing hook read
+        assert elapsed < 3.5 * LATENCY, (
+            f"setup_git_hooks: {elapsed:.3f}s, {source.stats.round_trips} round-trips"
+        )
+
+    async def test_concurrent_queries_share_listing(self):
+        """Test concurrent probes of one directory issue a single listing."""
+        source = remote_tree()
+        ctx = CallContext()
+        await asyncio.gather(*(ctx.exists(source, marker) for marker in MARKERS))
+        assert source.stats.count("entries", ".") == 1
@@ -0,0 +1,62 @@
+"""Throughput of the format-aware rewriters, per format."""
+
+import time
+
+import pytest
+
+from src.main import VersionManager
+from src.main.rewriters import locate_version_value
+
+FILLER_LINES = 50_000
+
+# target file, pattern, filler line, version line
+FORMATS = [
+    ("galaxy.yml", r'^version:.*$', "key: value\n", "version: 1.0.0  # pinned\n"),
+    ("pyproject.toml", r'^version\s*=\s*".*"$', 'key = "value"\n', 'version = "1.0.0"\n'),
+    ("Dockerfile", r'LABEL version=".*"$', "RUN true\n", 'LABEL version="1.0.0"\n'),
+    ("package.json", r'^\s*"version"', '  "key": "value",\n', '  "version": "1.0.0",\n'),
+    ("setup.cfg", r'^version\s*=', "key = value\n", "version = 1.0.0\n"),
+    ("__init__.py", r'^__version__', "x = 1\n", '__version__ = "1.0.0"\n'),
+]
+
+
+def best_of(fn, repeat: int = 3) -> float:
+    """Return the fastest of several timed runs."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+class TestRewriterThroughput:
+    """Sync throughput for each supported format."""
+
+    @pytest.mark.parametrize("target_file, pattern, filler, version_line", FORMATS)
+    def test_sync_large_file(self, target_file, pattern, filler, version_line):
+        """Test only the version value at the end of a large file is rewritten."""
+        content = filler * FILLER_LINES + version_line
+        updated = VersionManager()._update_target_content(content, target_file, pattern, "2.0.0")
+        assert updated == content[:-len(version_line)] + version_line.replace("1.0.0", "2.0.0")
+
+    @pytest.mark.benchmark
+    @pytest.mark.parametrize("target_file, pattern, filler, version_line", FORMATS)
+    def test_sync_throughput(self, target_file, pattern, filler, version_line):
+        """Test a version line at the end of a large file is rewritten quickly."""
+        vm = VersionManager()
+        content = filler * FILLER_LINES + version_line
+        elapsed = best_of(
+            lambda: vm._update_target_content(content, target_file, pattern, "2.0.0")
+        )
+        megabytes = len(content) / 1_000_000
+        assert megabytes / elapsed > 5, f"{target_file}: {megabytes / elapsed:.0f} MB/s"
+
+    @pytest.mark.benchmark
+    @pytest.mark.parametrize("target_file, pattern, filler, version_line", FORMATS)
+    def test_line_rewrite_rate(self, target_file, pattern, filler, version_line):
+        """Test locating the value in a single line stays in the microsecond range."""
+        line = version_line.rstrip("\n")
+        rounds = 20_000
+        elapsed = best_of(lambda: [locate_version_value(target_file, line) for _ in range(rounds)])
+        assert elapsed / rounds < 50e-6, f"{target_file}: {rounds / elapsed:,.0f} lines/s"
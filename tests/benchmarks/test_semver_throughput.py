@@ -0,0 +1,63 @@
+"""Parse and sort throughput of the Version type over 100k versions."""
+
+import random
+import time
+
+import pytest
+
+from src.main.semver import Version
+
+COUNT = 100_000
+
+# Throughput floors on a slow CI runner
+MIN_PARSE_PER_SECOND = 50_000
+MAX_SORT_SECONDS = 1.0
+
+
+def generate(count: int) -> list[str]:
+    """Tag-like versions, a fifth of them pre-releases with build metadata."""
+    rng = random.Random(17)
+    versions = []
+    for i in range(count):
+        text = f"{rng.randrange(10)}.{rng.randrange(50)}.{rng.randrange(200)}"
+        if i % 5 == 0:
+            text += f"-{rng.choice(['alpha', 'beta', 'rc'])}.{rng.randrange(12)}+sha.{i:x}"
+        versions.append(text)
+    return versions
+
+
+def best_of(fn, repeat: int = 3) -> tuple[object, float]:
+    """Return the result and the fastest time of several runs."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return result, min(timings)
+
+
+class TestSemverThroughput:
+    """Parsing and sorting large tag sets."""
+
+    def test_orderings_agree(self):
+        """Test sorting 100k versions by key and by comparison agree."""
+        versions = [Version.parse(text) for text in generate(COUNT)]
+        by_key = sorted(versions, key=lambda v: v.precedence)
+        assert by_key == sorted(versions)
+        assert all(a <= b for a, b in zip(by_key, by_key[1:]))
+
+    @pytest.mark.benchmark
+    def test_parse_and_sort_100k(self):
+        """Test 100k versions parse and sort within the floors."""
+        texts = generate(COUNT)
+        versions, parse = best_of(lambda: [Version.parse(text) for text in texts])
+        by_key, key_sort = best_of(lambda: sorted(versions, key=lambda v: v.precedence))
+        by_cmp, cmp_sort = best_of(lambda: sorted(versions))
+        _, hashing = best_of(lambda: len(set(versions)))
+
+        assert by_key == by_cmp
+        assert COUNT / parse >= MIN_PARSE_PER_SECOND, (
+            f"{COUNT} versions: parse {parse * 1000:.0f}ms ({COUNT / parse / 1000:.0f}k/s)"
+        )
+        assert key_sort <= MAX_SORT_SECONDS, f"sort by key {key_sort * 1000:.0f}ms"
+        assert cmp_sort <= MAX_SORT_SECONDS, f"sort by comparison {cmp_sort * 1000:.0f}ms"
@@ -0,0 +1,75 @@
+"""Validations per second through the server, over a Unix socket."""
+
+import asyncio
+import json
+import time
+
+import pytest
+
+from src.main.server import VersionServer
+
+REPOSITORIES = 200
+ROUNDS = 5
+
+# Floors on a slow CI runner
+MIN_BATCH_PER_SECOND = 800
+MIN_SEQUENTIAL_PER_SECOND = 400
+
+
+async def request(reader, writer, payload: dict) -> dict:
+    """Send one request line and read its response."""
+    writer.write(json.dumps(payload).encode() + b"\n")
+    await writer.drain()
+    return json.loads(await reader.readline())
+
+
+async def serve(tmp_path) -> tuple[float, float, dict]:
+    """Validate every checkout batched, then one per request; return rates and stats."""
+    jobs = []
+    for i in range(REPOSITORIES):
+        repo = tmp_path / f"repo{i}"
+        (repo / "roles").mkdir(parents=True)
+        (repo / "VERSION").write_text("1.2.3\n")
+        (repo / "galaxy.yml").write_text(f"namespace: acme\nname: r{i}\nversion: 1.2.3\n")
+        (repo / "roles/main.yml").write_text("- name: task\n" * 200)
+        jobs.append({"id": i, "function": "validate-version", "source": str(repo)})
+
+    path = str(tmp_path / "dvm.sock")
+    listener = await VersionServer().start_unix(path)
+    async with listener:
+        reader, writer = await asyncio.open_unix_connection(path)
+
+        start = time.perf_counter()
+        for _ in range(ROUNDS):
+            response = await request(reader, writer, {"jobs": jobs})
+            assert response["ok"]
+        batch_rate = ROUNDS * REPOSITORIES / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for job in jobs:
+            assert (await request(reader, writer, job))["ok"]
+        sequential_rate = REPOSITORIES / (time.perf_counter() - start)
+
+        stats = (await request(reader, writer, {"function": "stats"}))["result"]
+        writer.close()
+    return batch_rate, sequential_rate, stats
+
+
+class TestServerThroughput:
+    """Batched and one-by-one validation of many checkouts."""
+
+    async def test_files_read_once(self, tmp_path):
+        """Test repeated validations are answered from the file cache."""
+        _, _, stats = await serve(tmp_path)
+        assert stats["file_cache"]["misses"] == 2 * REPOSITORIES
+
+    @pytest.mark.benchmark
+    async def test_validations_per_second(self, tmp_path):
+        """Test both request styles stay above their floor."""
+        batch_rate, sequential_rate, stats = await serve(tmp_path)
+        assert batch_rate >= MIN_BATCH_PER_SECOND, (
+            f"{REPOSITORIES} checkouts: batched {batch_rate:.0f} validations/s"
+        )
+        assert sequential_rate >= MIN_SEQUENTIAL_PER_SECOND, (
+            f"{REPOSITORIES} checkouts: one per request {sequential_rate:.0f} validations/s"
+        )
@@ -0,0 +1,138 @@
+"""Benchmark suite of the public functions with saved baselines.
+
+Every function runs against small, large and monorepo-scale fixtures behind a
+fake engine with per-call latency. Round-trips and bytes read are compared
+with ``baselines.json``; any regression fails. Wall time is compared only in
+benchmark runs (``-m benchmark``). After an intended change, refresh the
+baselines with::
+
+    DVM_UPDATE_BASELINES=1 python -m pytest tests/benchmarks/test_suite.py
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from src.main import VersionManager
+from tests.fakes import FakeDirectory
+
+BASELINES = Path(__file__).with_name("baselines.json")
+FIXTURES = Path(__file__).parent.parent / "fixtures"
+
+# Simulated engine round-trip
+LATENCY = 0.005
+
+# Wall time may exceed the baseline by this factor plus a fixed slack
+WALL_TOLERANCE = 1.5
+WALL_SLACK_MS = 25.0
+
+CALLS = {
+    "get_version": lambda vm, src: vm.get_version(src),
+    "validate_version": lambda vm, src: vm.validate_version(src),
+    "sync_version": lambda vm, src: vm.sync_version(src),
+    "bump_version": lambda vm, src: vm.bump_version(src, "patch"),
+    "release": lambda vm, src: vm.release(src),
+    "setup_git_hooks": lambda vm, src: vm.setup_git_hooks(src),
+}
+
+
+def small_files() -> dict[str, str]:
+    """The Ansible collection fixture with a bare git directory."""
+    files = {
+        path.relative_to(FIXTURES / "ansible-collection").as_posix(): path.read_text()
+        for path in (FIXTURES / "ansible-collection").rglob("*") if path.is_file()
+    }
+    files[".git/HEAD"] = "ref: refs/heads/main\n"
+    return files
+
+
+def large_files() -> dict[str, str]:
+    """Collection with a 2 MB galaxy.yml, a large Dockerfile and existing hooks."""
+    filler = "".join(f"key_{i}: value {i}\n" for i in range(100_000))
+    return {
+        "version/VERSION": "4.5.6\n",
+        "galaxy.yml": "namespace: acme\nname: big\n" + filler + "version: 4.5.5\n",
+        "Dockerfile": "FROM python:3.11\n" + "RUN true\n" * 50_000,
+        ".git/HEAD": "ref: refs/heads/main\n",
+        ".git/hooks/pre-commit": "#!/bin/sh\n# DAGGER-VERSION-MANAGER: v4.5.5\n",
+        ".git/hooks/pre-push": "#!/bin/sh\necho custom\n",
+    }
+
+
+def monorepo_files() -> dict[str, str]:
+    """Root collection next to 500 packages and their sources."""
+    files = small_files()
+    for i in range(500):
+        files[f"packages/p{i}/VERSION"] = "0.1.0\n"
+        files[f"packages/p{i}/pyproject.toml"] = '[project]\nversion = "0.1.0"\n'
+        for j in range(10):
+            files[f"packages/p{i}/src/m{j}.py"] = "x = 1\n" * 100
+    return files
+
+
+FIXTURE_FILES = {"small": small_files, "large": large_files, "monorepo": monorepo_files}
+
+
+def load_baselines() -> dict:
+    """Read the saved baselines, or nothing when they don't exist yet."""
+    if BASELINES.exists():
+        return json.loads(BASELINES.read_text())
+    return {}
+
+
+async def run(name: str, fixture: str) -> dict:
+    """Run one function on a fresh fixture and return its cost."""
+    source = FakeDirectory(FIXTURE_FILES[fixture](), latency=LATENCY)
+    start = time.perf_counter()
+    await CALLS[name](VersionManager(), source)
+    return {
+        "round_trips": source.stats.round_trips,
+        "bytes": source.stats.bytes,
+        "wall_ms": round((time.perf_counter() - start) * 1000, 1),
+    }
+
+
+@pytest.fixture(scope="module")
+def baselines():
+    """Saved baselines, written back at the end when updating."""
+    saved = load_baselines()
+    updated = dict(saved)
+    yield updated
+    if os.environ.get("DVM_UPDATE_BASELINES") and updated != saved:
+        BASELINES.write_text(json.dumps(updated, indent=2, sort_keys=True) + "\n")
+
+
+class TestBenchmarkSuite:
+    """Public functions against the saved baselines."""
+
+    @pytest.mark.parametrize("fixture", sorted(FIXTURE_FILES))
+    @pytest.mark.parametrize("name", sorted(CALLS))
+    async def test_no_regression(self, name, fixture, baselines, record_property):
+        """Round-trips and bytes never exceed the baseline."""
+        key = f"{name}[{fixture}]"
+        result = await run(name, fixture)
+        for metric, value in result.items():
+            record_property(metric, value)
+        if os.environ.get("DVM_UPDATE_BASELINES"):
+            baselines[key] = result
+            return
+
+        assert key in baselines, f"No baseline for {key}; run with DVM_UPDATE_BASELINES=1"
+        baseline = baselines[key]
+        assert result["round_trips"] <= baseline["round_trips"]
+        assert result["bytes"] <= baseline["bytes"]
+
+    @pytest.mark.benchmark
+    @pytest.mark.parametrize("fixture", sorted(FIXTURE_FILES))
+    @pytest.mark.parametrize("name", sorted(CALLS))
+    async def test_wall_time(self, name, fixture, baselines):
+        """Wall time stays close to the baseline."""
+        key = f"{name}[{fixture}]"
+        assert key in baselines, f"No baseline for {key}; run with DVM_UPDATE_BASELINES=1"
+        result = await run(name, fixture)
+        assert result["wall_ms"] <= baselines[key]["wall_ms"] * WALL_TOLERANCE + WALL_SLACK_MS, (
+            f"{key}: {result['wall_ms']}ms (baseline {baselines[key]['wall_ms']}ms)"
+        )
@@ -0,0 +1,72 @@
+"""Bulk tag analysis over a large release history."""
+
+import random
+import time
+
+import pytest
+
+from src.main.semver import Version
+from src.main.tags import TagIndex
+
+COUNT = 20_000
+LOOKUPS = 20_000
+
+# Ceilings on a slow CI runner
+MAX_BUILD_SECONDS = 1.0
+MAX_LOOKUP_SECONDS = 0.2
+
+
+def history(count: int) -> list[str]:
+    """Shuffled v-prefixed tags over many major lines, with pre-releases."""
+    rng = random.Random(18)
+    tags = set()
+    while len(tags) < count:
+        tag = f"v{rng.randrange(40)}.{rng.randrange(30)}.{rng.randrange(60)}"
+        if rng.random() < 0.2:
+            tag += f"-rc.{rng.randrange(1, 5)}"
+        tags.add(tag)
+    tags = sorted(tags)
+    rng.shuffle(tags)
+    return tags
+
+
+class TestTagAnalysis:
+    """Index construction and lookups on thousands of tags."""
+
+    def test_lookups_match_linear_scan(self):
+        """Test indexed lookups agree with scanning the sorted versions."""
+        index = TagIndex(history(COUNT))
+        rng = random.Random(1)
+        probes = [
+            Version(rng.randrange(40), rng.randrange(30), rng.randrange(60))
+            for _ in range(200)
+        ]
+        assert len(index) == COUNT
+        assert [probe in index for probe in probes] == [
+            probe in index.versions for probe in probes
+        ]
+
+    @pytest.mark.benchmark
+    def test_index_and_lookups(self):
+        """Test the index builds once and answers lookups by binary search."""
+        tags = history(COUNT)
+
+        start = time.perf_counter()
+        index = TagIndex(tags)
+        build = time.perf_counter() - start
+
+        rng = random.Random(1)
+        probes = [
+            Version(rng.randrange(40), rng.randrange(30), rng.randrange(60))
+            for _ in range(LOOKUPS)
+        ]
+        start = time.perf_counter()
+        hits = sum(probe in index for probe in probes)
+        latest = index.latest_per_major()
+        next_patch = index.next_version("patch")
+        lookups = time.perf_counter() - start
+
+        assert build <= MAX_BUILD_SECONDS, f"{COUNT} tags: index {build * 1000:.0f}ms"
+        assert lookups <= MAX_LOOKUP_SECONDS, (
+            f"{LOOKUPS} lookups + per-major + next {lookups * 1000:.1f}ms"
+        )
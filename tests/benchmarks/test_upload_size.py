@@ -0,0 +1,76 @@
+"""Modeled upload of a synthetic 1 GB repository through each source filter."""
+
+from src.main.filters import (
+    CHANGED_IGNORE,
+    HOOKS_IGNORE,
+    MONOREPO_IGNORE,
+    SOURCE_IGNORE,
+    is_ignored,
+)
+
+# Modeled client-to-engine transfer: throughput plus a fixed cost per file
+BANDWIDTH = 100 * 1024 * 1024
+PER_FILE = 0.0002
+
+MB = 1024 * 1024
+
+
+def synthetic_tree() -> dict[str, int]:
+    """File sizes of a ~1 GB repository dominated by dependencies and history."""
+    sizes = {
+        "VERSION": 6,
+        "galaxy.yml": 400,
+        "pyproject.toml": 900,
+        "Dockerfile": 700,
+        ".git/HEAD": 21,
+        ".git/hooks/pre-commit": 2_000,
+    }
+    for i in range(20):
+        sizes[f".git/objects/pack/pack-{i}.pack"] = 20 * MB
+    for i in range(20_000):
+        sizes[f"node_modules/pkg{i % 800}/lib/file{i}.js"] = 25 * 1024
+    for i in range(400):
+        sizes[f"dist/bundle{i}.js"] = 256 * 1024
+    for i in range(200):
+        sizes[f"services/svc{i % 10}/build/obj{i}.o"] = 128 * 1024
+    for i in range(10):
+        sizes[f"services/svc{i}/VERSION"] = 6
+        sizes[f"services/svc{i}/Chart.yaml"] = 300
+    for i in range(4_000):
+        sizes[f"src/module{i % 40}/file{i}.py"] = 4 * 1024
+    return sizes
+
+
+def upload(sizes: dict[str, int], patterns: list[str]) -> tuple[int, int, float]:
+    """Return uploaded files, bytes and modeled seconds for a filter."""
+    kept = [size for path, size in sizes.items() if not is_ignored(path, patterns)]
+    total = sum(kept)
+    return len(kept), total, total / BANDWIDTH + len(kept) * PER_FILE
+
+
+class TestUploadSize:
+    """Filtered uploads against passing the whole repository."""
+
+    def test_filters_on_1gb_tree(self):
+        """Test every filter uploads a small fraction of a 1 GB tree."""
+        sizes = synthetic_tree()
+        _, full_bytes, _ = upload(sizes, [])
+        assert full_bytes > 1000 * MB
+
+        results = {
+            "source": upload(sizes, SOURCE_IGNORE),
+            "monorepo": upload(sizes, MONOREPO_IGNORE),
+            "changed": upload(sizes, CHANGED_IGNORE),
+            "hooks": upload(sizes, HOOKS_IGNORE),
+        }
+
+        assert results["source"][1] < full_bytes * 0.05, (
+            f"source: {results['source'][1] / MB:.2f} MB of {full_bytes / MB:.0f} MB"
+        )
+        # Manifest targets can be any file, so these keep the source tree
+        assert results["monorepo"] == results["source"]
+        assert results["hooks"][1] < full_bytes * 0.05, (
+            f"hooks: {results['hooks'][1] / MB:.2f} MB of {full_bytes / MB:.0f} MB"
+        )
+        # The git history is the price of diffing inside the engine
+        assert results["changed"][1] < full_bytes * 0.5
@@ -0,0 +1,11 @@
+"""Shared fixtures."""
+
+import pytest
+
+from tests.fakes import FakeClient
+
+
+@pytest.fixture(autouse=True)
+def fake_client(monkeypatch):
+    """Create the new directories of a call in memory instead of the engine."""
+    monkeypatch.setattr("src.main.context.dag", FakeClient())
@@ -0,0 +1,204 @@
+"""In-memory stand-ins for the Dagger objects used by the module.
+
+The fakes record every simulated engine round-trip and the number of bytes
+transferred so tests and benchmarks can assert on engine cost without a
+running Dagger engine.
+"""
+
+import asyncio
+import posixpath
+from dataclasses import dataclass, field
+from typing import Optional
+
+from src.main.filters import glob_regex, is_ignored
+from src.main.plan import apply_patch
+
+
+@dataclass
+class EngineStats:
+    """Counters shared by every fake object derived from the same tree."""
+
+    round_trips: int = 0
+    bytes: int = 0
+    calls: list[tuple[str, str]] = field(default_factory=list)
+    in_flight: int = 0
+    max_in_flight: int = 0
+
+    def record(self, op: str, path: str, size: int = 0) -> None:
+        self.round_trips += 1
+        self.bytes += size
+        self.calls.append((op, path))
+
+    def count(self, op: str, path: Optional[str] = None) -> int:
+        return sum(
+            1 for call_op, call_path in self.calls
+            if call_op == op and (path is None or call_path == path)
+        )
+
+    def reset(self) -> None:
+        self.round_trips = 0
+        self.bytes = 0
+        self.calls.clear()
+        self.max_in_flight = 0
+
+
+def apply_ignore(files: dict[str, str], patterns: list[str]) -> dict[str, str]:
+    """Return the files a directory argument with these patterns uploads."""
+    return {path: content for path, content in files.items() if not is_ignored(path, patterns)}
+
+
+def _norm(path: str) -> str:
+    path = posixpath.normpath(path or ".")
+    return "" if path == "." else path.lstrip("/")
+
+
+class FakeFile:
+    """Lazy file handle; the engine is only "contacted" when awaited."""
+
+    def __init__(self, tree: "FakeDirectory", path: str):
+        self._tree = tree
+        self._path = path
+
+    async def _fetch(self, op: str) -> str:
+        stats = self._tree.stats
+        stats.in_flight += 1
+        stats.max_in_flight = max(stats.max_in_flight, stats.in_flight)
+        try:
+            await self._tree._delay()
+        finally:
+            stats.in_flight -= 1
+        content = self._tree._files.get(self._path)
+        if content is None:
+            self._tree.stats.record(op, self._path)
+            raise Exception(f"{self._path}: no such file or directory")
+        size = len(content.encode()) if op == "contents" else 0
+        self._tree.stats.record(op, self._path, size)
+        return content
+
+    async def contents(self) -> str:
+        return await self._fetch("contents")
+
+    async def size(self) -> int:
+        return len((await self._fetch("size")).encode())
+
+
+class FakeDirectory:
+    """
+    Minimal in-memory replacement for ``dagger.Directory``.
+
+    Args:
+        files: Mapping of relative file path to file contents
+        stats: Shared counters (a new instance is created when omitted)
+        latency: Simulated per-call engine latency in seconds
+    """
+
+    def __init__(
+        self,
+        files: dict[str, str],
+        stats: Optional[EngineStats] = None,
+        latency: float = 0.0,
+        permissions: Optional[dict[str, int]] = None,
+    ):
+        self._files = {_norm(path): content for path, content in files.items()}
+        self.stats = stats if stats is not None else EngineStats()
+        self.latency = latency
+        self.permissions = dict(permissions or {})
+
+    async def _delay(self) -> None:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+    def _derive(self, files: dict[str, str], permissions: dict[str, int]) -> "FakeDirectory":
+        return FakeDirectory(files, self.stats, self.latency, permissions)
+
+    @property
+    def files(self) -> dict[str, str]:
+        return dict(self._files)
+
+    def file(self, path: str) -> FakeFile:
+        return FakeFile(self, _norm(path))
+
+    def directory(self, path: str) -> "FakeDirectory":
+        prefix = _norm(path) + "/"
+        return self._derive(
+            {p[len(prefix):]: c for p, c in self._files.items() if p.startswith(prefix)},
+            {},
+        )
+
+    def filter(
+        self, exclude: Optional[list[str]] = None, include: Optional[list[str]] = None
+    ) -> "FakeDirectory":
+        files = {
+            path: content for path, content in self._files.items()
+            if (include is None or is_ignored(path, include))
+            and not (exclude and is_ignored(path, exclude))
+        }
+        perms = {path: mode for path, mode in self.permissions.items() if path in files}
+        return self._derive(files, perms)
+
+    async def entries(self, path: Optional[str] = None) -> list[str]:
+        await self._delay()
+        base = _norm(path or ".")
+        prefix = base + "/" if base else ""
+        names = set()
+        for file_path in self._files:
+            if not file_path.startswith(prefix):
+                continue
+            head, sep, _ = file_path[len(prefix):].partition("/")
+            names.add(head + "/" if sep else head)
+        if base and not names:
+            self.stats.record("entries", base)
+            raise Exception(f"{base}: no such file or directory")
+        result = sorted(names)
+        self.stats.record("entries", base or ".", sum(len(n) for n in result))
+        return result
+
+    async def glob(self, pattern: str) -> list[str]:
+        await self._delay()
+        regex = glob_regex(pattern)
+        result = sorted(p for p in self._files if regex.match(p))
+        self.stats.record("glob", pattern, sum(len(p) for p in result))
+        return result
+
+    async def exists(self, path: str) -> bool:
+        await self._delay()
+        base = _norm(path)
+        self.stats.record("exists", base)
+        return base in self._files or any(p.startswith(base + "/") for p in self._files)
+
+    def with_new_file(
+        self, path: str, contents: str, permissions: Optional[int] = 420
+    ) -> "FakeDirectory":
+        files = dict(self._files)
+        files[_norm(path)] = contents
+        perms = dict(self.permissions)
+        perms[_norm(path)] = permissions
+        return self._derive(files, perms)
+
+    def with_directory(self, path: str, source: "FakeDirectory", **kwargs) -> "FakeDirectory":
+        prefix = _norm(path)
+        files = dict(self._files)
+        perms = dict(self.permissions)
+        for file_path, content in source._files.items():
+            target = posixpath.join(prefix, file_path) if prefix else file_path
+            files[target] = content
+            if file_path in source.permissions:
+                perms[target] = source.permissions[file_path]
+        return self._derive(files, perms)
+
+    def with_patch(self, patch: str) -> "FakeDirectory":
+        def read(path: str) -> str:
+            if _norm(path) not in self._files:
+                raise Exception(f"{path}: no such file or directory")
+            return self._files[_norm(path)]
+
+        files = dict(self._files)
+        files.update(apply_patch(read, patch))
+        return self._derive(files, dict(self.permissions))
+
+
+class FakeClient:
+    """Minimal in-memory replacement for ``dag``."""
+
+    def directory(self) -> FakeDirectory:
+        return FakeDirectory({})
@@ -0,0 +1,81 @@
+"""Unit tests for the request-scoped call context."""
+
+import pytest
+
+from src.main import VersionManager
+from src.main.context import CallContext
+from tests.fakes import FakeDirectory
+
+
+def ansible_tree() -> FakeDirectory:
+    """Ansible collection with a consistent version."""
+    return FakeDirectory({
+        "VERSION": "1.2.3\n",
+        "galaxy.yml": "name: test\nversion: 1.0.0\n",
+    })
+
+
+class TestCallContext:
+    """Test memoization of reads within one call."""
+
+    async def test_read_fetches_once(self):
+        """Test repeated reads of the same file hit the engine once."""
+        source = ansible_tree()
+        ctx = CallContext()
+        for _ in range(3):
+            assert await ctx.read(source, "VERSION") == "1.2.3\n"
+        assert ctx.fetches["VERSION"] == 1
+        assert source.stats.count("contents", "VERSION") == 1
+
+    async def test_read_failure_is_cached(self):
+        """Test a missing file is not fetched again after the first failure."""
+        source = ansible_tree()
+        ctx = CallContext()
+        for _ in range(2):
+            with pytest.raises(Exception):
+                await ctx.read(source, "Chart.yaml")
+        assert ctx.fetches["Chart.yaml"] == 1
+
+    async def test_derived_directory_reuses_cache(self):
+        """Test a directory written through the context answers from memory."""
+        source = ansible_tree()
+        ctx = CallContext()
+        await ctx.read(source, "VERSION")
+        updated = ctx.with_new_file(source, "galaxy.yml", "version: 1.2.3\n")
+        assert await ctx.read(updated, "galaxy.yml") == "version: 1.2.3\n"
+        assert await ctx.read(updated, "VERSION") == "1.2.3\n"
+        assert await ctx.exists(updated, "galaxy.yml")
+        assert source.stats.count("contents") == 1
+
+    async def test_distinct_directories_are_not_shared(self):
+        """Test the cache is keyed by directory identity."""
+        ctx = CallContext()
+        first = FakeDirectory({"VERSION": "1.0.0"})
+        second = FakeDirectory({"VERSION": "2.0.0"})
+        assert await ctx.read(first, "VERSION") == "1.0.0"
+        assert await ctx.read(second, "VERSION") == "2.0.0"
+
+
+class TestSingleFetchPerCall:
+    """Test each public function fetches every file at most once."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.vm = VersionManager()
+
+    async def test_release_reads_each_file_once(self):
+        """Test release resolves, syncs and validates from one read per file."""
+        source = ansible_tree()
+        result = await self.vm.release(source)
+        assert "✅ Version 1.2.3 is consistent" in result.report
+        assert source.stats.count("contents", "VERSION") == 1
+        assert source.stats.count("contents", "galaxy.yml") == 1
+        assert source.stats.count("entries", ".") == 1
+
+    async def test_bump_version_reads_version_once(self):
+        """Test bump_version resolves and reads the version file once."""
+        source = ansible_tree()
+        updated = await self.vm.bump_version(source, "minor")
+        assert updated.files["VERSION"] == "1.3.0"
+        assert source.stats.count("contents", "VERSION") == 1
+        assert source.stats.count("entries", ".") == 1
@@ -0,0 +1,228 @@
+"""Unit tests for bump inference from Conventional Commits."""
+
+import json
+import os
+import shutil
+import subprocess
+
+import pytest
+
+from src.main import VersionManager
+from src.main.commits import SCAN_SCRIPT, BumpInference
+from tests.fakes import FakeDirectory
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git is not installed")
+
+GIT_ENV = {
+    "GIT_AUTHOR_NAME": "Test",
+    "GIT_AUTHOR_EMAIL": "test@example.com",
+    "GIT_COMMITTER_NAME": "Test",
+    "GIT_COMMITTER_EMAIL": "test@example.com",
+    "GIT_CONFIG_GLOBAL": os.devnull,
+    "GIT_CONFIG_NOSYSTEM": "1",
+}
+
+
+class Repository:
+    """Temporary git repository with empty commits."""
+
+    def __init__(self, path):
+        self.path = path
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.env = {**os.environ, **GIT_ENV}
+        self.git("init", "-q")
+
+    def git(self, *args: str) -> str:
+        """Run git in the repository."""
+        return subprocess.run(
+            ["git", *args], cwd=self.path, env=self.env,
+            check=True, capture_output=True, text=True
+        ).stdout
+
+    def commit(self, *messages: str) -> None:
+        """Create one empty commit per message."""
+        for message in messages:
+            self.git("commit", "-q", "--allow-empty", "-m", message)
+
+    def scan(self, cache_dir=None, since: str = "", tag_prefix: str = "v") -> BumpInference:
+        """Run the scan script the way the container does."""
+        env = dict(self.env, DVM_SINCE=since, DVM_TAG_PREFIX=tag_prefix)
+        env["DVM_CACHE_DIR"] = str(cache_dir) if cache_dir else ""
+        result = subprocess.run(
+            ["sh", "-c", SCAN_SCRIPT], cwd=self.path, env=env,
+            check=True, capture_output=True, text=True
+        )
+        return BumpInference.from_output(result.stdout)
+
+
+class TestScanScript:
+    """Test the commit scan run against real git histories."""
+
+    @pytest.fixture(autouse=True)
+    def cache_dir(self, tmp_path):
+        """Resume cache directory of the test."""
+        self.cache = tmp_path / "cache"
+
+    @pytest.fixture
+    def repo(self, tmp_path):
+        """Repository released as v1.0.0."""
+        repo = Repository(tmp_path / "repo")
+        repo.commit("feat!: initial api")
+        repo.git("tag", "v1.0.0")
+        return repo
+
+    @pytest.mark.parametrize("messages, bump", [
+        (["docs: readme", "chore: deps"], None),
+        (["fix: crash", "docs: readme"], "patch"),
+        (["fix: crash", "feat(cli): new flag"], "minor"),
+        (["Feat: capitalized type"], "minor"),
+        (["fix(api)!: drop field"], "major"),
+        (["fix: crash\n\nBREAKING CHANGE: config renamed"], "major"),
+        (["fix: crash\n\nBREAKING-CHANGE: config renamed"], "major"),
+        (["fix: mention BREAKING CHANGE: inline"], "patch"),
+        (["feature: not a conventional type"], None),
+    ])
+    def test_classification(self, repo, messages, bump):
+        """Test each commit type maps to its bump."""
+        repo.commit(*messages)
+        inference = repo.scan()
+        assert inference.bump_type == bump
+        assert inference.since == "v1.0.0"
+        assert inference.scanned == len(messages)
+
+    def test_early_exit_on_major(self, repo):
+        """Test the scan stops at the newest breaking change."""
+        repo.commit(*[f"fix: bug {i}" for i in range(50)], "feat!: new api", "fix: a", "fix: b")
+        inference = repo.scan()
+        assert inference.bump_type == "major"
+        assert inference.scanned == 3
+
+    def test_since_override(self, repo):
+        """Test an explicit revision and a custom tag prefix."""
+        repo.commit("feat: a")
+        repo.git("tag", "release-1.1.0")
+        repo.commit("fix: b")
+        assert repo.scan(since="release-1.1.0").bump_type == "patch"
+        assert repo.scan(tag_prefix="release-").bump_type == "patch"
+        assert repo.scan(since="v1.0.0").bump_type == "minor"
+
+    def test_without_tags(self, tmp_path):
+        """Test the whole history is read when there is no release tag."""
+        repo = Repository(tmp_path / "fresh")
+        repo.commit("chore: init", "fix: a")
+        inference = repo.scan()
+        assert (inference.bump_type, inference.scanned, inference.since) == ("patch", 2, "")
+
+    def test_cache_resumes(self, repo):
+        """Test repeated scans only read commits added since the last one."""
+        repo.commit("fix: a", "docs: b")
+        first = repo.scan(self.cache)
+        assert (first.bump_type, first.scanned, first.resumed_from) == ("patch", 2, None)
+
+        repeat = repo.scan(self.cache)
+        assert (repeat.bump_type, repeat.scanned, repeat.resumed_from) == ("patch", 0, first.head)
+
+        repo.commit("docs: c", "feat: d")
+        more = repo.scan(self.cache)
+        assert (more.bump_type, more.scanned, more.resumed_from) == ("minor", 2, first.head)
+
+    def test_cache_keeps_floor(self, repo):
+        """Test a cached bump is kept when new commits warrant less."""
+        repo.commit("feat: a")
+        repo.scan(self.cache)
+        repo.commit("docs: b")
+        assert repo.scan(self.cache).bump_type == "minor"
+
+    def test_cache_skips_after_major(self, repo):
+        """Test a cached major bump skips the scan."""
+        repo.commit("feat!: a")
+        repo.scan(self.cache)
+        repo.commit("fix: b", "fix: c")
+        inference = repo.scan(self.cache)
+        assert (inference.bump_type, inference.scanned) == ("major", 0)
+
+    def test_cache_rewritten_history(self, repo):
+        """Test a cached head that is no longer an ancestor triggers a full scan."""
+        repo.commit("feat: a")
+        repo.scan(self.cache)
+        repo.git("reset", "-q", "--hard", "v1.0.0")
+        repo.commit("fix: b")
+        inference = repo.scan(self.cache)
+        assert (inference.bump_type, inference.scanned, inference.resumed_from) == (
+            "patch", 1, None
+        )
+
+
+class TestBumpInference:
+    """Test parsing of the scan output."""
+
+    def test_parse(self):
+        """Test every field is read and none means no bump."""
+        inference = BumpInference.from_output(
+            "bump=none\nscanned=4\nsince=v1.0.0\nhead=abc\nresumed_from=\n"
+        )
+        assert inference.to_dict() == {
+            "bump_type": None, "scanned": 4, "since": "v1.0.0",
+            "head": "abc", "resumed_from": None,
+        }
+
+    @pytest.mark.parametrize("output", ["", "bump=huge\nscanned=1\nsince=\nhead=a\n", "bump=patch\n"])
+    def test_parse_invalid(self, output):
+        """Test incomplete or unknown output is rejected."""
+        with pytest.raises(ValueError):
+            BumpInference.from_output(output)
+
+
+class LocalScanVersionManager(VersionManager):
+    """Runs the scan script in a local repository instead of a container."""
+
+    repository = None
+
+    async def _scan_commits(self, source, since, tag_prefix, use_cache) -> str:
+        env = dict(self.repository.env, DVM_SINCE=since or "", DVM_TAG_PREFIX=tag_prefix)
+        return subprocess.run(
+            ["sh", "-c", SCAN_SCRIPT], cwd=self.repository.path, env=env,
+            check=True, capture_output=True, text=True
+        ).stdout
+
+
+class TestAutoBump:
+    """Test bump_version and infer_bump with inferred bump types."""
+
+    @pytest.fixture
+    def vm(self, tmp_path):
+        """Version manager reading a repository released as v1.2.3."""
+        repo = Repository(tmp_path / "repo")
+        repo.commit("chore: init")
+        repo.git("tag", "v1.2.3")
+        vm = LocalScanVersionManager()
+        vm.repository = repo
+        return vm
+
+    async def test_auto_bump(self, vm):
+        """Test the inferred bump is applied to the version file."""
+        vm.repository.commit("fix: a", "feat: b")
+        result = await vm.bump_version(
+            FakeDirectory({"VERSION": "1.2.3\n"}), "auto", history=FakeDirectory({})
+        )
+        assert result.files["VERSION"] == "1.3.0"
+
+    async def test_nothing_to_release(self, vm):
+        """Test auto bumps fail without releasable commits."""
+        vm.repository.commit("docs: a")
+        with pytest.raises(Exception, match="nothing to release"):
+            await vm.bump_version(
+                FakeDirectory({"VERSION": "1.2.3\n"}), "auto", history=FakeDirectory({})
+            )
+
+    async def test_history_required(self, vm):
+        """Test auto bumps need the repository history."""
+        with pytest.raises(Exception, match="--history"):
+            await vm.bump_version(FakeDirectory({"VERSION": "1.2.3\n"}), "auto")
+
+    async def test_infer_bump(self, vm):
+        """Test the inference report."""
+        vm.repository.commit("fix!: a")
+        report = json.loads(await vm.infer_bump(FakeDirectory({})))
+        assert report["bump_type"] == "major"
+        assert report["since"] == "v1.2.3"
@@ -0,0 +1,157 @@
+"""Unit tests for the upload filters declared on directory arguments."""
+
+import json
+import typing
+
+import pytest
+from dagger import Ignore
+
+from src.main import PROJECT_TYPES, VersionManager
+from src.main.filters import (
+    CHANGED_IGNORE,
+    HISTORY_IGNORE,
+    HOOKS_IGNORE,
+    MARKER_FILES,
+    MONOREPO_IGNORE,
+    SOURCE_IGNORE,
+    TAGS_IGNORE,
+    is_ignored,
+)
+from tests.fakes import FakeDirectory, apply_ignore
+
+# Project with everything a large repository drags along
+PROJECT = {
+    "VERSION": "1.2.3\n",
+    "galaxy.yml": "name: x\nversion: 1.2.3\n",
+    "deploy/app.yaml": "app:\n  version: 1.2.3\n",
+    "src/main.py": "print('x')\n",
+    "node_modules/lib/package.json": '{"version": "9.9.9"}\n',
+    "dist/x-1.2.3.tar.gz": "binary",
+    "target/release/x": "binary",
+    "svc/build/out.bin": "binary",
+    "deploy/target/values.yaml": "image:\n  tag: 1.2.3\n",
+    ".git/HEAD": "ref: refs/heads/main\n",
+    ".git/objects/pack/pack-1.pack": "binary",
+    ".git/hooks/pre-push": "#!/bin/sh\n# DAGGER-VERSION-MANAGER: v1.0.0\n",
+    ".git/refs/tags/v1.2.3": "1111111111111111111111111111111111111111\n",
+    ".git/packed-refs": "# pack-refs with: peeled\n2222 refs/tags/v1.2.2\n",
+    "pkg/VERSION": "2.0.0\n",
+    "pkg/pyproject.toml": '[project]\nversion = "2.0.0"\n',
+    "pkg/src/pkg/__init__.py": "",
+    "pkg/node_modules/dep/VERSION": "0.0.1\n",
+}
+
+
+def source_ignore(method) -> list[str]:
+    """Return the Ignore patterns declared on a function's source argument."""
+    hints = typing.get_type_hints(method, include_extras=True)
+    (ignore,) = [meta for meta in hints["source"].__metadata__ if isinstance(meta, Ignore)]
+    return ignore.patterns
+
+
+def filtered(patterns: list[str]) -> FakeDirectory:
+    """The project as uploaded through a filter."""
+    return FakeDirectory(apply_ignore(PROJECT, patterns))
+
+
+class TestIgnoreSemantics:
+    """Test the .dockerignore rules shared by the local directory and the fakes."""
+
+    def test_last_match_wins(self):
+        """Test re-included files below an excluded directory."""
+        assert is_ignored("src/main.py", ["*"])
+        assert not is_ignored("pkg/VERSION", ["*", "!**/VERSION"])
+        assert is_ignored("node_modules/x/VERSION", ["*", "!**/VERSION", "**/node_modules"])
+
+
+class TestDeclaredFilters:
+    """Test every function declares the filter matching what it reads."""
+
+    @pytest.mark.parametrize("name, patterns", [
+        ("get_version", SOURCE_IGNORE),
+        ("validate_version", SOURCE_IGNORE),
+        ("validate_versions", SOURCE_IGNORE),
+        ("sync_version", SOURCE_IGNORE),
+        ("sync_versions", SOURCE_IGNORE),
+        ("plan_sync", SOURCE_IGNORE),
+        ("apply_plan", SOURCE_IGNORE),
+        ("bump_version", SOURCE_IGNORE),
+        ("release", SOURCE_IGNORE),
+        ("profile_release", SOURCE_IGNORE),
+        ("validate_all", MONOREPO_IGNORE),
+        ("sync_all", MONOREPO_IGNORE),
+        ("validate_changed", CHANGED_IGNORE),
+        ("setup_git_hooks", HOOKS_IGNORE),
+        ("analyze_tags", TAGS_IGNORE),
+        ("infer_bump", HISTORY_IGNORE),
+    ])
+    def test_source_filter(self, name, patterns):
+        """Test the source argument carries the expected Ignore patterns."""
+        assert source_ignore(getattr(VersionManager, name)) == patterns
+
+    def test_markers_follow_project_types(self):
+        """Test the filters keep every marker file used for detection."""
+        assert MARKER_FILES == [marker for marker, _, _, _ in PROJECT_TYPES]
+
+    def test_uploaded_files(self):
+        """Test what each filter keeps from a heavy project."""
+        source_files = apply_ignore(PROJECT, SOURCE_IGNORE)
+        assert sorted(source_files) == [
+            "VERSION", "deploy/app.yaml", "deploy/target/values.yaml", "galaxy.yml",
+            "pkg/VERSION", "pkg/pyproject.toml", "pkg/src/pkg/__init__.py", "src/main.py",
+            "svc/build/out.bin",
+        ]
+        assert apply_ignore(PROJECT, MONOREPO_IGNORE) == source_files
+        assert ".git/objects/pack/pack-1.pack" in apply_ignore(PROJECT, CHANGED_IGNORE)
+        assert sorted(set(apply_ignore(PROJECT, HOOKS_IGNORE)) - set(source_files)) == [
+            ".git/HEAD", ".git/hooks/pre-push",
+        ]
+        assert sorted(apply_ignore(PROJECT, TAGS_IGNORE)) == [
+            ".git/packed-refs", ".git/refs/tags/v1.2.3",
+        ]
+
+
+class TestFilteredResults:
+    """Test functions give the same answers on filtered uploads."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.vm = VersionManager()
+
+    async def test_custom_target(self):
+        """Test caller-chosen targets survive the source filter."""
+        source = filtered(SOURCE_IGNORE)
+        assert await self.vm.get_version(source) == "1.2.3"
+        result = await self.vm.validate_versions(
+            source, ["galaxy.yml", "deploy/app.yaml:^  version:.*$"], output_format="text"
+        )
+        assert result.endswith("✅ All 2 targets match VERSION=1.2.3")
+
+    async def test_monorepo(self):
+        """Test discovery finds the same packages with only markers uploaded."""
+        full = json.loads(await self.vm.validate_all(FakeDirectory(PROJECT)))
+        narrow = json.loads(await self.vm.validate_all(filtered(MONOREPO_IGNORE)))
+        for report in (full, narrow):
+            for package in report["packages"]:
+                package["target"].pop("elapsed_ms")
+            report.pop("elapsed_ms")
+        assert narrow == full
+
+    async def test_changed(self):
+        """Test incremental validation finds the owning package."""
+        report = json.loads(await self.vm.validate_changed(
+            filtered(CHANGED_IGNORE), changed_paths=["pkg/src/pkg/__init__.py"]
+        ))
+        assert [package["package"] for package in report["packages"]] == ["pkg"]
+        assert report["ok"]
+
+    async def test_hooks(self):
+        """Test hooks install with only the root files, HEAD and hooks uploaded."""
+        result = await self.vm.setup_git_hooks(filtered(HOOKS_IGNORE))
+        assert "# DAGGER-VERSION-MANAGER:" in result.files[".git/hooks/pre-commit"]
+
+    async def test_tags(self):
+        """Test tag analysis reads loose and packed tags from the filtered upload."""
+        report = json.loads(await self.vm.analyze_tags(filtered(TAGS_IGNORE)))
+        assert report["versions"] == ["1.2.2", "1.2.3"]
+        assert report["next"]["version"] == "1.2.4"
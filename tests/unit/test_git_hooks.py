@@ -0,0 +1,264 @@
+"""Unit tests for the fast-path check embedded in generated git hooks."""
+
+import os
+import stat
+import subprocess
+import sys
+
+import pytest
+
+from src.main import VersionManager
+from src.main.hooks import (
+    CACHE_MAX_ENTRIES,
+    FAST_CHECK_MISMATCH,
+    FAST_CHECK_OK,
+    render_fast_check,
+)
+
+YAML_PATTERN = r'^version:.*$'
+
+# Stand-in for the dagger CLI that records every fallback call
+DAGGER_SHIM = """#!/bin/sh
+echo "$@" >> "$DVM_SHIM_LOG"
+echo "✅ Version 1.0.0 is consistent"
+"""
+
+
+def write_tree(root, files: dict[str, str]) -> None:
+    """Write files below a directory, creating parents as needed."""
+    for path, content in files.items():
+        target = root / path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(content.encode())
+
+
+def install_shim(tmp_path) -> dict[str, str]:
+    """Put the dagger shim first on PATH and return the hook environment."""
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    shim = bin_dir / "dagger"
+    shim.write_text(DAGGER_SHIM)
+    shim.chmod(shim.stat().st_mode | stat.S_IEXEC)
+    env = dict(os.environ)
+    env["PATH"] = f"{bin_dir}{os.pathsep}{env['PATH']}"
+    env["DVM_SHIM_LOG"] = str(tmp_path / "dagger.log")
+    env.pop("DVM_HOOK_FORCE_DAGGER", None)
+    return env
+
+
+class TestFastCheck:
+    """Test the stdlib-only validator against the module's own extraction."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.vm = VersionManager()
+
+    def run_check(self, tmp_path, files: dict[str, str], target="galaxy.yml", pattern=YAML_PATTERN):
+        """Run the rendered check in a project directory."""
+        repo = tmp_path / "repo"
+        write_tree(repo, files)
+        return subprocess.run(
+            [sys.executable, "-c", render_fast_check(target, pattern)],
+            cwd=repo, capture_output=True, text=True,
+        )
+
+    def test_consistent(self, tmp_path):
+        """Test a matching target exits with the OK status."""
+        result = self.run_check(tmp_path, {"VERSION": "1.2.3\n", "galaxy.yml": "version: 1.2.3\n"})
+        assert result.returncode == FAST_CHECK_OK
+
+    def test_mismatch(self, tmp_path):
+        """Test a differing target exits with the mismatch status and message."""
+        result = self.run_check(tmp_path, {
+            "version/VERSION": "1.2.3\n",
+            "galaxy.yml": "name: x\nversion: 1.0.0\n",
+        })
+        assert result.returncode == FAST_CHECK_MISMATCH
+        assert "Mismatch: version/VERSION=1.2.3, galaxy.yml=1.0.0" in result.stdout
+
+    @pytest.mark.parametrize("files", [
+        {"galaxy.yml": "version: 1.2.3\n"},
+        {"VERSION": "1.2.3", "version/VERSION": "1.2.3", "galaxy.yml": "version: 1.2.3\n"},
+        {"VERSION": "not-a-version\n", "galaxy.yml": "version: 1.2.3\n"},
+        {"VERSION": "1.2.3\n"},
+        {"VERSION": "1.2.3\n", "galaxy.yml": "name: x\n"},
+    ])
+    def test_undecided(self, tmp_path, files):
+        """Test cases the module must judge are left undecided."""
+        result = self.run_check(tmp_path, files)
+        assert result.returncode not in (FAST_CHECK_OK, FAST_CHECK_MISMATCH)
+        assert "falling back to Dagger" in result.stderr
+
+    @pytest.mark.parametrize("content", [
+        "version: 1.2.3\r\nname: x\r\n",
+        "# version: 9.9.9\nversion: \"v1.2.3\"  # comment\n",
+        "version:\nversion: 2.0.0\n",
+        "versions: 1.2.3\n",
+    ])
+    def test_agrees_with_module(self, tmp_path, content):
+        """Test the fast check extracts the same version as validate_version."""
+        expected = self.vm._extract_version_from_target(content, YAML_PATTERN)
+        result = self.run_check(tmp_path, {"VERSION": "1.2.3\n", "galaxy.yml": content})
+        if expected is None:
+            assert result.returncode not in (FAST_CHECK_OK, FAST_CHECK_MISMATCH)
+        elif expected == "1.2.3":
+            assert result.returncode == FAST_CHECK_OK
+        else:
+            assert result.returncode == FAST_CHECK_MISMATCH
+
+    def test_pattern_with_quotes(self, tmp_path):
+        """Test patterns with quotes and backslashes are embedded verbatim."""
+        result = self.run_check(
+            tmp_path,
+            {"VERSION": "1.2.3\n", "Dockerfile": "FROM x\nLABEL version='1.2.3'\n"},
+            target="Dockerfile",
+            pattern=r'''^LABEL version=["']\d.*$''',
+        )
+        assert result.returncode == FAST_CHECK_OK
+
+
+class TestGeneratedHook:
+    """Test the generated hook script end to end with a dagger shim."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.vm = VersionManager()
+
+    def run_hook(self, tmp_path, files: dict[str, str], **env_overrides):
+        """Install a generated pre-commit hook and run it from the project root."""
+        repo = tmp_path / "repo"
+        write_tree(repo, files)
+        hook = repo / "pre-commit"
+        hook.write_text(self.vm._generate_hook_content("pre-commit", "1.0.0", "galaxy.yml", YAML_PATTERN))
+        env = install_shim(tmp_path)
+        env.update(env_overrides)
+        result = subprocess.run(["bash", str(hook)], cwd=repo, env=env, capture_output=True, text=True)
+        log = tmp_path / "dagger.log"
+        return result, log.read_text().splitlines() if log.exists() else []
+
+    def test_consistent_skips_dagger(self, tmp_path):
+        """Test a consistent project passes without calling dagger."""
+        result, calls = self.run_hook(tmp_path, {"VERSION": "1.2.3\n", "galaxy.yml": "version: 1.2.3\n"})
+        assert result.returncode == 0
+        assert "✅ Version check passed" in result.stdout
+        assert calls == []
+
+    def test_mismatch_blocks_without_dagger(self, tmp_path):
+        """Test a mismatch blocks the commit without calling dagger."""
+        result, calls = self.run_hook(tmp_path, {"VERSION": "1.2.3\n", "galaxy.yml": "version: 1.0.0\n"})
+        assert result.returncode == 1
+        assert "❌ Version mismatch detected!" in result.stdout
+        assert calls == []
+
+    def test_undecided_falls_back_to_dagger(self, tmp_path):
+        """Test an undecided check defers to the module."""
+        result, calls = self.run_hook(tmp_path, {
+            "VERSION": "1.2.3\n", "version/VERSION": "1.2.3\n", "galaxy.yml": "version: 1.2.3\n",
+        })
+        assert result.returncode == 0
+        assert calls == [
+            "call version-manager validate-version --source=. --target-file=galaxy.yml "
+            f"--version-pattern={YAML_PATTERN}"
+        ]
+
+    def test_force_dagger(self, tmp_path):
+        """Test DVM_HOOK_FORCE_DAGGER skips the fast path."""
+        result, calls = self.run_hook(
+            tmp_path, {"VERSION": "1.2.3\n", "galaxy.yml": "version: 1.2.3\n"},
+            DVM_HOOK_FORCE_DAGGER="1",
+        )
+        assert result.returncode == 0
+        assert len(calls) == 1
+
+
+class TestHookCache:
+    """Test the content-hash result cache used by generated hooks."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.vm = VersionManager()
+
+    def make_repo(self, tmp_path, files: dict[str, str], use_cache: bool = True):
+        """Create a git repository with a generated pre-commit hook."""
+        repo = tmp_path / "repo"
+        write_tree(repo, files)
+        subprocess.run(["git", "init", "-q", str(repo)], check=True)
+        hook = repo / ".git" / "hooks" / "pre-commit"
+        hook.write_text(self.vm._generate_hook_content(
+            "pre-commit", "1.0.0", "galaxy.yml", YAML_PATTERN, use_cache
+        ))
+        return repo, install_shim(tmp_path)
+
+    def run_hook(self, repo, env, **env_overrides):
+        """Run the hook and return its result with the dagger calls so far."""
+        result = subprocess.run(
+            ["bash", ".git/hooks/pre-commit"], cwd=repo, env={**env, **env_overrides},
+            capture_output=True, text=True,
+        )
+        log = repo.parent / "dagger.log"
+        return result, log.read_text().splitlines() if log.exists() else []
+
+    def cache_dir(self, repo):
+        """Directory holding the cached results."""
+        return repo / ".git" / "dagger-version-manager" / "cache"
+
+    def test_dagger_result_is_reused(self, tmp_path):
+        """Test a repeated run on unchanged inputs skips dagger."""
+        repo, env = self.make_repo(tmp_path, {
+            "VERSION": "1.2.3\n", "version/VERSION": "1.2.3\n", "galaxy.yml": "version: 1.2.3\n",
+        })
+        assert len(self.run_hook(repo, env)[1]) == 1
+        result, calls = self.run_hook(repo, env)
+        assert result.returncode == 0
+        assert len(calls) == 1
+
+    def test_changed_inputs_miss(self, tmp_path):
+        """Test editing the target file invalidates the cached result."""
+        repo, env = self.make_repo(tmp_path, {
+            "VERSION": "1.2.3\n", "version/VERSION": "1.2.3\n", "galaxy.yml": "version: 1.2.3\n",
+        })
+        self.run_hook(repo, env)
+        (repo / "galaxy.yml").write_text("name: x\nversion: 1.2.3\n")
+        assert len(self.run_hook(repo, env)[1]) == 2
+
+    def test_cached_mismatch_still_blocks(self, tmp_path):
+        """Test a cached mismatch blocks with the original message."""
+        repo, env = self.make_repo(tmp_path, {"VERSION": "1.2.3\n", "galaxy.yml": "version: 1.0.0\n"})
+        self.run_hook(repo, env)
+        assert len(list(self.cache_dir(repo).iterdir())) == 1
+        result, calls = self.run_hook(repo, env)
+        assert result.returncode == 1
+        assert "Mismatch: VERSION=1.2.3, galaxy.yml=1.0.0" in result.stdout
+        assert calls == []
+
+    def test_bypass(self, tmp_path):
+        """Test DVM_NO_CACHE=1 ignores the cache."""
+        repo, env = self.make_repo(tmp_path, {
+            "VERSION": "1.2.3\n", "version/VERSION": "1.2.3\n", "galaxy.yml": "version: 1.2.3\n",
+        })
+        self.run_hook(repo, env)
+        assert len(self.run_hook(repo, env, DVM_NO_CACHE="1")[1]) == 2
+
+    def test_disabled_at_setup(self, tmp_path):
+        """Test hooks generated without the cache never write one."""
+        repo, env = self.make_repo(
+            tmp_path, {"VERSION": "1.2.3\n", "galaxy.yml": "version: 1.2.3\n"}, use_cache=False
+        )
+        assert self.run_hook(repo, env)[0].returncode == 0
+        assert not self.cache_dir(repo).exists()
+
+    def test_lru_eviction(self, tmp_path):
+        """Test the cache stays bounded and evicts the least recently used entry."""
+        repo, env = self.make_repo(tmp_path, {"VERSION": "1.2.3\n", "galaxy.yml": "version: 1.2.3\n"})
+        cache = self.cache_dir(repo)
+        cache.mkdir(parents=True)
+        for i in range(CACHE_MAX_ENTRIES):
+            entry = cache / f"{i:064x}"
+            entry.write_text("0\n")
+            os.utime(entry, (1_000 + i, 1_000 + i))
+
+        assert self.run_hook(repo, env)[0].returncode == 0
+        names = {entry.name for entry in cache.iterdir()}
+        assert len(names) == CACHE_MAX_ENTRIES
+        assert f"{0:064x}" not in names
+        assert f"{1:064x}" in names
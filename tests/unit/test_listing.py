@@ -0,0 +1,44 @@
+"""Unit tests for directory listing based existence checks."""
+
+from src.main.listing import DirectoryListing
+from tests.fakes import FakeDirectory
+
+
+class TestDirectoryListing:
+    """Test existence queries answered from directory entries."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.source = FakeDirectory({
+            "VERSION": "1.0.0",
+            "galaxy.yml": "version: 1.0.0",
+            "version/VERSION": "1.0.0",
+            ".git/hooks/pre-commit": "#!/bin/sh",
+        })
+        self.listing = DirectoryListing(self.source)
+
+    async def test_file_exists(self):
+        """Test files at root and in subdirectories are found."""
+        assert await self.listing.exists("VERSION")
+        assert await self.listing.exists("./galaxy.yml")
+        assert await self.listing.exists("version/VERSION")
+        assert await self.listing.exists(".git/hooks/pre-commit")
+
+    async def test_missing_file(self):
+        """Test missing files and missing directories report False."""
+        assert not await self.listing.exists("Dockerfile")
+        assert not await self.listing.exists("missing/VERSION")
+
+    async def test_directory_is_not_a_file(self):
+        """Test directories are not reported as files and vice versa."""
+        assert not await self.listing.exists("version")
+        assert await self.listing.is_directory("version")
+        assert await self.listing.is_directory(".git")
+        assert not await self.listing.is_directory("VERSION")
+
+    async def test_each_directory_listed_once(self):
+        """Test repeated queries reuse the cached listing."""
+        for name in ["VERSION", "galaxy.yml", "Chart.yaml", "Dockerfile"]:
+            await self.listing.exists(name)
+        assert self.source.stats.round_trips == 1
+        assert self.source.stats.count("contents") == 0
@@ -0,0 +1,100 @@
+"""Unit tests for the local filesystem Directory adapter."""
+
+import os
+
+import pytest
+
+from src.main.context import CallContext
+from src.main.filters import SOURCE_IGNORE, TAGS_IGNORE
+from src.main.local import FileCache, LocalClient, LocalDirectory
+
+
+@pytest.fixture
+def checkout(tmp_path):
+    """Checkout with a dependency directory, git refs and a package."""
+    files = {
+        "VERSION": "1.2.3\n",
+        "galaxy.yml": "name: tools\r\nversion: 1.2.0\r\n",
+        "node_modules/lib/VERSION": "9.9.9\n",
+        ".git/HEAD": "ref: refs/heads/main\n",
+        ".git/refs/tags/v1.2.3": "abc\n",
+        "packages/api/VERSION": "0.1.0\n",
+    }
+    for path, content in files.items():
+        target = tmp_path / path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(content.encode())
+    return tmp_path
+
+
+class TestLocalDirectory:
+    """Test the Directory API over a local checkout."""
+
+    async def test_contents(self, checkout):
+        """Test files are read with their line endings."""
+        source = LocalDirectory(str(checkout))
+        assert await source.file("VERSION").contents() == "1.2.3\n"
+        assert await source.file("./galaxy.yml").contents() == "name: tools\r\nversion: 1.2.0\r\n"
+        with pytest.raises(Exception, match="no such file"):
+            await source.file("missing").contents()
+        with pytest.raises(ValueError, match="outside"):
+            source.file("../secret")
+
+    async def test_upload_filter(self, checkout):
+        """Test ignored paths are invisible, as in the engine."""
+        source = LocalDirectory(str(checkout), SOURCE_IGNORE)
+        assert await source.entries() == ["VERSION", "galaxy.yml", "packages/"]
+        assert await source.glob("**/VERSION") == ["VERSION", "packages/api/VERSION"]
+        with pytest.raises(Exception, match="no such file"):
+            await source.file(".git/HEAD").contents()
+
+    async def test_negated_filter(self, checkout):
+        """Test ``!`` patterns re-include paths below ignored directories."""
+        source = LocalDirectory(str(checkout), TAGS_IGNORE)
+        assert await source.entries() == [".git/"]
+        assert await source.entries(".git") == ["refs/"]
+        assert await source.glob(".git/refs/tags/**") == [".git/refs/tags/v1.2.3"]
+
+    async def test_writes_stay_in_memory(self, checkout):
+        """Test writes are visible to derived directories until exported."""
+        source = LocalDirectory(str(checkout), SOURCE_IGNORE)
+        updated = CallContext(client=LocalClient()).with_new_files(
+            source, {"VERSION": "2.0.0\n", "docs/CHANGELOG.md": "# Changelog\n"}
+        )
+        assert await updated.file("VERSION").contents() == "2.0.0\n"
+        assert "docs/" in await updated.entries()
+        assert await updated.glob("**/CHANGELOG.md") == ["docs/CHANGELOG.md"]
+        assert (checkout / "VERSION").read_text() == "1.2.3\n"
+        assert await source.file("VERSION").contents() == "1.2.3\n"
+
+        await updated.export()
+        assert (checkout / "VERSION").read_text() == "2.0.0\n"
+        assert (checkout / "docs/CHANGELOG.md").read_text() == "# Changelog\n"
+
+    async def test_export_permissions(self, checkout, tmp_path):
+        """Test file modes are applied on export."""
+        source = LocalDirectory(str(checkout))
+        updated = source.with_new_file("hook", "#!/bin/sh\n", permissions=0o755)
+        destination = await updated.export(str(tmp_path / "out"))
+        assert os.stat(os.path.join(destination, "hook")).st_mode & 0o777 == 0o755
+
+
+class TestFileCache:
+    """Test file contents are reused while files are unchanged."""
+
+    def test_hits_until_changed(self, checkout):
+        """Test a changed file is read again."""
+        cache = FileCache()
+        path = str(checkout / "VERSION")
+        assert cache.read(path) == "1.2.3\n"
+        assert cache.read(path) == "1.2.3\n"
+        (checkout / "VERSION").write_text("1.2.40\n")
+        assert cache.read(path) == "1.2.40\n"
+        assert (cache.hits, cache.misses) == (1, 2)
+
+    def test_budget(self, checkout):
+        """Test least recently used files are dropped beyond the budget."""
+        cache = FileCache(max_bytes=10)
+        cache.read(str(checkout / "VERSION"))
+        cache.read(str(checkout / "packages/api/VERSION"))
+        assert cache.to_dict()["files"] == 1
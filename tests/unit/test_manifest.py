@@ -0,0 +1,287 @@
+"""Unit tests for the .versions.toml manifest."""
+
+import json
+import subprocess
+import sys
+
+import pytest
+
+from src.main import DEFAULT_PATTERNS, VersionManager
+from src.main.filters import HOOKS_IGNORE, MONOREPO_IGNORE
+from src.main.hooks import FAST_CHECK_MISMATCH, FAST_CHECK_OK, render_fast_check
+from src.main.local import LocalDirectory
+from src.main.manifest import load_manifest
+from tests.fakes import FakeDirectory
+
+MANIFEST = '''
+[[targets]]
+path = "pyproject.toml"
+
+[[targets]]
+path = "deploy/values.yaml"
+pattern = '^  tag:.*$'
+format = "yaml"
+
+[[packages]]
+root = "services/api"
+
+[[packages.targets]]
+path = "Chart.yaml"
+
+[[packages.targets]]
+path = "Chart.yaml"
+pattern = '^appVersion:.*$'
+'''
+
+
+def project(pyproject: str = "1.2.3", tag: str = "1.2.3", manifest: str = MANIFEST) -> dict:
+    """Files of a project whose targets are listed in a manifest."""
+    return {
+        ".versions.toml": manifest,
+        "VERSION": "1.2.3\n",
+        "pyproject.toml": f'[project]\nname = "x"\nversion = "{pyproject}"\n',
+        "deploy/values.yaml": f"image:\n  repository: acme/x\n  tag: v{tag}  # pinned\n",
+        "galaxy.yml": "version: 0.0.1\n",
+        "services/api/VERSION": "2.0.0\n",
+        "services/api/Chart.yaml": "name: api\nversion: 2.0.0\nappVersion: 1.9.0\n",
+    }
+
+
+class TestLoadManifest:
+    """Test parsing and compiling the manifest."""
+
+    def test_index(self):
+        """Test targets are indexed by path with defaults and formats applied."""
+        manifest = load_manifest(MANIFEST, DEFAULT_PATTERNS)
+        assert manifest.root.version_file == "VERSION"
+        assert manifest.root.pairs() == [
+            ("pyproject.toml", DEFAULT_PATTERNS["pyproject.toml"]),
+            ("deploy/values.yaml", r'^  tag:.*$'),
+        ]
+        (package,) = manifest.packages
+        assert (package.root, package.version_file) == ("services/api", "services/api/VERSION")
+        assert [target.pattern.source for target in manifest.index["services/api/Chart.yaml"]] == [
+            r'^version:.*$', r'^appVersion:.*$'
+        ]
+        assert manifest.formats == {"deploy/values.yaml": "yaml"}
+
+    def test_cached_by_content(self):
+        """Test identical contents compile once and edits compile again."""
+        first = load_manifest(MANIFEST, DEFAULT_PATTERNS)
+        assert load_manifest(MANIFEST, DEFAULT_PATTERNS) is first
+        edited = load_manifest(MANIFEST + "\n", DEFAULT_PATTERNS)
+        assert edited is not first
+        assert edited.digest != first.digest
+
+    @pytest.mark.parametrize("content, error", [
+        ("targets = [", "Invalid .versions.toml"),
+        ("versions_file = 'VERSION'", "unknown key 'versions_file'"),
+        ("[[targets]]\npattern = '^v.*$'", "targets[0] has no path"),
+        ("[[targets]]\npath = 'notes.txt'", "needs a pattern"),
+        ("[[targets]]\npath = 'a.yaml'\npattern = '^v.*$'\nformat = 'xml'", "is unknown"),
+        ("[[targets]]\npath = 'a.yaml'\npattern = '^(v'", "does not compile"),
+        ("[[packages]]\nroot = 'a'", "packages[0] has no targets"),
+        ("[[packages]]\nroot = '../a'\ntargets = [{path = 'Chart.yaml'}]", "below the source root"),
+        ("[[targets]]\npath = '../outside.toml'", "path must be a file below the source root"),
+        ("[[targets]]\npath = '/etc/Chart.yaml'", "path must be a file below the source root"),
+        (
+            "[[packages]]\nroot = 'a'\ntargets = [{path = '../../Chart.yaml'}]",
+            "packages[0].targets[0].path must be a file below a",
+        ),
+        (
+            "[[packages]]\nroot = 'a/b'\ntargets = [{path = '../Chart.yaml'}]",
+            "path must be a file below a/b",
+        ),
+        (
+            "[[targets]]\npath = 'a/Chart.yaml'\nformat = 'yaml'\n"
+            "[[packages]]\nroot = 'a'\ntargets = [{path = 'Chart.yaml', format = 'generic'}]",
+            "two formats",
+        ),
+    ])
+    def test_invalid(self, content, error):
+        """Test malformed manifests are rejected with the offending entry."""
+        with pytest.raises(ValueError, match="❌") as excinfo:
+            load_manifest(content, DEFAULT_PATTERNS)
+        assert error in str(excinfo.value)
+
+
+class TestManifestFunctions:
+    """Test functions take their targets from the manifest."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.vm = VersionManager()
+
+    async def test_validate_version(self):
+        """Test every root target is validated and only failures are listed."""
+        assert await self.vm.validate_version(FakeDirectory(project())) == (
+            "✅ Version 1.2.3 is consistent"
+        )
+        result = await self.vm.validate_version(FakeDirectory(project(tag="1.2.0")))
+        assert "deploy/values.yaml=1.2.0" in result
+        assert "pyproject.toml" not in result
+
+    async def test_explicit_target_wins(self):
+        """Test --target-file bypasses the manifest."""
+        result = await self.vm.validate_version(
+            FakeDirectory(project()), target_file="galaxy.yml"
+        )
+        assert "galaxy.yml=0.0.1" in result
+
+    async def test_sync_version(self):
+        """Test every root target is synced in one write."""
+        source = FakeDirectory(project(pyproject="1.0.0", tag="1.0.0"))
+        files = (await self.vm.sync_version(source)).files
+        assert 'version = "1.2.3"' in files["pyproject.toml"]
+        assert "  tag: v1.2.3  # pinned\n" in files["deploy/values.yaml"]
+        assert files["galaxy.yml"] == "version: 0.0.1\n"
+
+    async def test_release(self):
+        """Test a release bumps and syncs the manifest targets."""
+        result = await self.vm.release(FakeDirectory(project()), bump_type="patch")
+        assert result.version == "1.2.4"
+        assert result.files == ["VERSION", "pyproject.toml", "deploy/values.yaml"]
+
+    async def test_version_file(self):
+        """Test the manifest's version file replaces the default."""
+        files = project(manifest='version_file = "meta/version.txt"\n' + MANIFEST)
+        files["meta/version.txt"] = "3.0.0\n"
+        result = await self.vm.validate_version(FakeDirectory(files))
+        assert "meta/version.txt=3.0.0" in result
+
+    async def test_errors(self):
+        """Test malformed manifests and manifests without root targets are reported."""
+        broken = FakeDirectory(project(manifest="[[targets]]\npath = 'notes.txt'\n"))
+        assert "needs a pattern" in await self.vm.validate_version(broken)
+        packages_only = project(manifest=MANIFEST[MANIFEST.index("[[packages]]"):])
+        with pytest.raises(Exception, match="no root targets"):
+            await self.vm.sync_version(FakeDirectory(packages_only))
+
+    async def test_validate_all(self):
+        """Test declared packages replace discovery, one entry per target."""
+        report = json.loads(await self.vm.validate_all(FakeDirectory(project())))
+        statuses = [
+            (p["package"], p["target"]["target_file"], p["target"]["status"])
+            for p in report["packages"]
+        ]
+        assert statuses == [
+            ("services/api", "services/api/Chart.yaml", "consistent"),
+            ("services/api", "services/api/Chart.yaml", "mismatch"),
+        ]
+
+    async def test_declared_packages_skip_discovery(self):
+        """Test no marker or VERSION globs run when the manifest declares packages."""
+        source = FakeDirectory(project())
+        await self.vm.validate_all(source)
+        assert source.stats.count("glob") == 0
+
+    async def test_sync_all(self):
+        """Test two targets in one file are both synced."""
+        files = project()
+        files["services/api/Chart.yaml"] = "name: api\nversion: 1.0.0\nappVersion: 1.9.0\n"
+        result = await self.vm.sync_all(FakeDirectory(files))
+        assert result.directory.files["services/api/Chart.yaml"] == (
+            "name: api\nversion: 2.0.0\nappVersion: 2.0.0\n"
+        )
+
+    def test_format_override(self):
+        """Test a declared format locates the value instead of the file name."""
+        content = "build-1.5.0: 1.0.0\n"
+        pattern = r'^build.*$'
+        assert self.vm._update_target_content(content, "notes.txt", pattern, "2.0.0") == (
+            "build-2.0.0: 1.0.0\n"
+        )
+        assert self.vm._update_target_content(
+            content, "notes.txt", pattern, "2.0.0", "yaml"
+        ) == "build-1.5.0: 2.0.0\n"
+
+
+class TestManifestHooks:
+    """Test hooks check every manifest target without Dagger."""
+
+    async def test_setup_git_hooks(self):
+        """Test the hook checks the manifest targets and its fallback takes no flags."""
+        source = FakeDirectory({**project(), ".git/HEAD": "ref: refs/heads/main\n"})
+        hook = (await VersionManager().setup_git_hooks(source)).files[".git/hooks/pre-commit"]
+        assert "'deploy/values.yaml'" in hook
+        assert "--target-file" not in hook
+        assert "validate-version --source=. 2>&1" in hook
+
+    @pytest.mark.parametrize("tag, status", [
+        ("1.2.3", FAST_CHECK_OK),
+        ("1.2.0", FAST_CHECK_MISMATCH),
+    ])
+    def test_fast_check(self, tmp_path, tag, status):
+        """Test the embedded check validates every target against one version file."""
+        for path, content in {**project(tag=tag), "meta/version.txt": "1.2.3"}.items():
+            (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+            (tmp_path / path).write_text(content)
+        check = render_fast_check(
+            "pyproject.toml", DEFAULT_PATTERNS["pyproject.toml"],
+            [("deploy/values.yaml", r'^  tag:.*$')], ["meta/version.txt"]
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", check], cwd=tmp_path, capture_output=True, text=True
+        )
+        assert result.returncode == status
+        if status == FAST_CHECK_MISMATCH:
+            assert result.stdout.strip() == (
+                "⚠️  Mismatch: meta/version.txt=1.2.3, deploy/values.yaml=1.2.0"
+            )
+
+
+class TestManifestUploads:
+    """Test manifest targets outside the marker files survive the upload filters."""
+
+    MANIFEST = '''
+version_file = "app/VERSION"
+
+[[targets]]
+path = "galaxy.yml"
+
+[[packages]]
+root = "services/api"
+
+[[packages.targets]]
+path = "deploy/values.yaml"
+pattern = '^  tag:.*$'
+format = "yaml"
+'''
+
+    @pytest.fixture
+    def checkout(self, tmp_path):
+        """Checkout whose manifest targets a values file and a nested version file."""
+        files = {
+            ".versions.toml": self.MANIFEST,
+            "app/VERSION": "1.2.3\n",
+            "galaxy.yml": "version: 1.2.3\n",
+            "services/api/VERSION": "2.0.0\n",
+            "services/api/deploy/values.yaml": "image:\n  tag: v1.9.0\n",
+            ".git/HEAD": "ref: refs/heads/main\n",
+        }
+        for path, content in files.items():
+            (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+            (tmp_path / path).write_text(content)
+        return tmp_path
+
+    async def test_validate_all(self, checkout):
+        """Test the package target is read and its mismatch reported."""
+        source = LocalDirectory(str(checkout), MONOREPO_IGNORE)
+        report = json.loads(await VersionManager().validate_all(source))
+        (package,) = report["packages"]
+        assert package["target"]["target_file"] == "services/api/deploy/values.yaml"
+        assert package["target"]["status"] == "mismatch"
+
+    async def test_sync_all(self, checkout):
+        """Test the package target is synced."""
+        source = LocalDirectory(str(checkout), MONOREPO_IGNORE)
+        result = await VersionManager().sync_all(source)
+        assert result.directory.written["services/api/deploy/values.yaml"] == (
+            "image:\n  tag: v2.0.0\n"
+        )
+
+    async def test_setup_git_hooks(self, checkout):
+        """Test the hook reads the manifest's version file."""
+        source = LocalDirectory(str(checkout), HOOKS_IGNORE)
+        result = await VersionManager().setup_git_hooks(source)
+        assert "'app/VERSION'" in result.written[".git/hooks/pre-commit"]
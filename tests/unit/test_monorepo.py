@@ -0,0 +1,221 @@
+"""Unit tests for monorepo discovery, validation and sync."""
+
+import json
+import os
+import shutil
+import subprocess
+
+import pytest
+
+from src.main import PROJECT_TYPES, VersionManager
+from src.main.filters import CHANGED_IGNORE, is_ignored
+from src.main.monorepo import changed_paths_command, discover_packages, package_root
+from tests.fakes import FakeDirectory
+
+
+def monorepo_tree(latency: float = 0.0) -> FakeDirectory:
+    """Monorepo with collections, Python packages and broken packages."""
+    files = {
+        "collections/a/VERSION": "1.0.0\n",
+        "collections/a/galaxy.yml": "name: a\nversion: 1.0.0\n",
+        "collections/b/version/VERSION": "2.0.0\n",
+        "collections/b/galaxy.yml": "name: b\nversion: 1.9.0\n",
+        "python/c/VERSION": "3.0.0\n",
+        "python/c/pyproject.toml": '[project]\nversion = "3.0.0"\n',
+        "python/c/Dockerfile": 'LABEL version="0.0.1"\n',
+        "docs/VERSION": "1.0.0\n",
+        "node_modules/x/VERSION": "9.9.9\n",
+    }
+    for i in range(20):
+        files[f"many/p{i}/VERSION"] = "1.0.0\n"
+        files[f"many/p{i}/Chart.yaml"] = "version: 0.1.0\n"
+    return FakeDirectory(files, latency=latency)
+
+
+class TestDiscoverPackages:
+    """Test pairing VERSION files with their targets."""
+
+    def test_package_root(self):
+        """Test both VERSION layouts belong to the enclosing package."""
+        assert package_root("VERSION") == ""
+        assert package_root("pkg/VERSION") == "pkg"
+        assert package_root("pkg/version/VERSION") == "pkg"
+
+    def test_priority_and_errors(self):
+        """Test marker priority, ambiguity and missing markers."""
+        packages = discover_packages(
+            ["a/VERSION", "b/VERSION", "b/version/VERSION", "c/VERSION", "node_modules/d/VERSION"],
+            ["a/Dockerfile", "a/pyproject.toml", "b/galaxy.yml", "node_modules/d/galaxy.yml"],
+            PROJECT_TYPES,
+        )
+        by_root = {package.root: package for package in packages}
+        assert sorted(by_root) == ["a", "b", "c"]
+        assert by_root["a"].project_type == "Python"
+        assert by_root["a"].target_file == "a/pyproject.toml"
+        assert "Ambiguous" in by_root["b"].error
+        assert "Could not detect project type" in by_root["c"].error
+
+
+class TestMonorepoFunctions:
+    """Test validate_all and sync_all."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.vm = VersionManager()
+
+    async def test_validate_all(self):
+        """Test every package is reported with its status."""
+        report = json.loads(await self.vm.validate_all(monorepo_tree()))
+        by_package = {p["package"]: p for p in report["packages"]}
+        assert len(by_package) == 24
+        assert by_package["collections/a"]["ok"]
+        assert by_package["collections/b"]["target"]["status"] == "mismatch"
+        assert by_package["python/c"]["target"]["target_file"] == "python/c/pyproject.toml"
+        assert by_package["docs"]["error"]
+        assert not report["ok"]
+
+    async def test_sync_all(self):
+        """Test mismatched targets are rewritten into one merged directory."""
+        source = monorepo_tree()
+        result = await self.vm.sync_all(source)
+        files = result.directory.files
+        assert "version: 2.0.0" in files["collections/b/galaxy.yml"]
+        assert all("version: 1.0.0" in files[f"many/p{i}/Chart.yaml"] for i in range(20))
+        report = json.loads(result.report)
+        statuses = {p["package"]: (p["target"] or {}).get("status") for p in report["packages"]}
+        assert statuses["collections/a"] == "consistent"
+        assert statuses["collections/b"] == "synced"
+
+    async def test_discovery_is_one_round(self):
+        """Test discovery uses one glob per file name, not one per package."""
+        source = monorepo_tree()
+        await self.vm.validate_all(source)
+        assert source.stats.count("glob") == 1 + len(PROJECT_TYPES)
+        # Only the root is listed, to look for a manifest
+        assert [call for call in source.stats.calls if call[0] == "entries"] == [("entries", ".")]
+
+    async def test_concurrency_limit(self):
+        """Test no more than max_concurrency packages read at once."""
+        source = monorepo_tree(latency=0.001)
+        await self.vm.validate_all(source, max_concurrency=4)
+        assert 1 < source.stats.max_in_flight <= 4
+
+    async def test_text_report(self):
+        """Test the text rendering lists packages and a summary."""
+        text = await self.vm.validate_all(monorepo_tree(), output_format="text")
+        assert "[collections/a] ✅ Version 1.0.0 is consistent" in text
+        assert text.splitlines()[-1].startswith("❌")
+
+
+class TestValidateChanged:
+    """Test validation limited to packages touched by a change."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.vm = VersionManager()
+
+    async def test_only_owning_packages_are_read(self):
+        """Test only the affected packages are listed and read."""
+        source = monorepo_tree()
+        report = json.loads(await self.vm.validate_changed(
+            source,
+            changed_paths=["collections/b/roles/x/tasks/main.yml", "collections/b/galaxy.yml"],
+        ))
+        assert [p["package"] for p in report["packages"]] == ["collections/b"]
+        assert report["packages"][0]["version_file"] == "collections/b/version/VERSION"
+        assert report["packages"][0]["target"]["status"] == "mismatch"
+        read = {path for op, path in source.stats.calls if op == "contents"}
+        assert read == {"collections/b/version/VERSION", "collections/b/galaxy.yml"}
+        assert source.stats.count("glob") == 0
+
+    async def test_cost_scales_with_change(self):
+        """Test listing count depends on the changed paths, not the tree size."""
+        source = monorepo_tree()
+        await self.vm.validate_changed(source, changed_paths=["many/p3/Chart.yaml"])
+        assert source.stats.count("entries") <= 2
+        assert source.stats.count("contents") == 2
+
+    async def test_version_module_directory_is_not_a_package(self):
+        """Test a version/ directory without VERSION doesn't claim ownership."""
+        source = FakeDirectory({
+            "pkg/VERSION": "1.0.0\n",
+            "pkg/pyproject.toml": 'version = "1.0.0"\n',
+            "pkg/src/version/__init__.py": "",
+        })
+        report = json.loads(await self.vm.validate_changed(
+            source, changed_paths=["pkg/src/version/__init__.py"]
+        ))
+        assert [p["package"] for p in report["packages"]] == ["pkg"]
+        assert report["ok"]
+
+    async def test_no_affected_packages(self):
+        """Test a change outside every package passes."""
+        text = await self.vm.validate_changed(
+            monorepo_tree(), changed_paths=["README.md"], output_format="text"
+        )
+        assert text == "✅ No packages affected by 1 changed paths"
+
+    async def test_requires_paths_or_base(self):
+        """Test one of changed_paths or diff_base is required."""
+        result = await self.vm.validate_changed(monorepo_tree())
+        assert result.startswith("❌")
+
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="git is not available")
+class TestChangedPathsCommand:
+    """Test the diff run for --diff-base on a checkout uploaded through CHANGED_IGNORE."""
+
+    @pytest.fixture
+    def repo(self, tmp_path):
+        """Repository with tracked files the upload filter leaves out."""
+        repo = tmp_path / "repo"
+        files = {
+            "pkg/VERSION": "1.0.0\n",
+            "pkg/pyproject.toml": 'version = "1.0.0"\n',
+            "pkg/dist/app.js": "bundle\n",
+            "web/VERSION": "2.0.0\n",
+            "web/node_modules/lib/index.js": "lib\n",
+        }
+        for path, content in files.items():
+            (repo / path).parent.mkdir(parents=True, exist_ok=True)
+            (repo / path).write_text(content)
+        self.git(repo, "init", "-q")
+        self.git(repo, "add", "-A")
+        self.git(repo, "commit", "-q", "-m", "base")
+        return repo
+
+    @staticmethod
+    def git(repo, *args) -> str:
+        """Run git in a repository."""
+        return subprocess.run(
+            ["git", "-c", "user.name=t", "-c", "user.email=t@example.com", *args],
+            cwd=repo, check=True, capture_output=True, text=True,
+        ).stdout
+
+    @staticmethod
+    def upload(repo, destination):
+        """Copy the files the engine receives through CHANGED_IGNORE."""
+        for directory, _, names in os.walk(repo):
+            for name in names:
+                path = os.path.relpath(os.path.join(directory, name), repo).replace(os.sep, "/")
+                if not is_ignored(path, CHANGED_IGNORE):
+                    (destination / path).parent.mkdir(parents=True, exist_ok=True)
+                    shutil.copy2(os.path.join(directory, name), destination / path)
+        return destination
+
+    def changed(self, repo, tmp_path, diff_base) -> list[str]:
+        """Run the changed-paths command on the uploaded checkout."""
+        upload = self.upload(repo, tmp_path / "upload")
+        return self.git(upload, *changed_paths_command(diff_base)[1:]).splitlines()
+
+    def test_clean_tree(self, repo, tmp_path):
+        """Test files left out of the upload aren't reported as deleted."""
+        assert self.changed(repo, tmp_path, "HEAD") == []
+
+    def test_commits_and_staged_changes(self, repo, tmp_path):
+        """Test committed and staged changes since the base are listed."""
+        (repo / "pkg/pyproject.toml").write_text('version = "1.1.0"\n')
+        self.git(repo, "commit", "-q", "-am", "bump")
+        (repo / "web/VERSION").write_text("2.1.0\n")
+        self.git(repo, "add", "web/VERSION")
+        assert self.changed(repo, tmp_path, "HEAD~1") == ["pkg/pyproject.toml", "web/VERSION"]
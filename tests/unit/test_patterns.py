@@ -0,0 +1,120 @@
+"""Unit tests for the compiled version pattern registry."""
+
+import re
+
+import pytest
+
+from src.main.patterns import compile_pattern
+
+
+class TestPatternRegistry:
+    """Test compiled patterns and their cache."""
+
+    def test_patterns_are_compiled_once(self):
+        """Test the same pattern string returns the cached compiled pattern."""
+        assert compile_pattern(r'^version:.*$') is compile_pattern(r'^version:.*$')
+
+    def test_combined_extraction(self):
+        """Test the line match and version capture in one expression."""
+        pattern = compile_pattern(r'^version\s*=\s*".*"$')
+        assert pattern.combined is not None
+        assert pattern.extract('version = "1.2.3"') == "1.2.3"
+        assert pattern.extract('name = "1.2.3"') is None
+        assert pattern.extract('version = "dev"') is None
+
+    def test_first_version_in_line(self):
+        """Test the first version number of a matching line is captured."""
+        pattern = compile_pattern(r'^LABEL')
+        assert pattern.extract('LABEL a="10.20.30" b="4.5.6"') == "10.20.30"
+
+    def test_global_flags_fall_back(self):
+        """Test patterns that can't be embedded still match line by line."""
+        pattern = compile_pattern(r'(?i)^VERSION:.*$')
+        assert pattern.combined is None
+        assert pattern.extract("version: 1.0.0") == "1.0.0"
+        assert pattern.extract("name: 1.0.0") is None
+
+
+class TestStreamingScan:
+    """Test whole-text scanning and byte-for-byte splicing."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        from src.main import VersionManager
+        self.vm = VersionManager()
+
+    def test_find_line_offsets(self):
+        """Test the span excludes the line terminator."""
+        text = "name: x\nversion: 1.0.0\nother: y\n"
+        start, end = compile_pattern(r'^version:.*$').find_line(text)
+        assert text[start:end] == "version: 1.0.0"
+
+    def test_match_does_not_cross_lines(self):
+        """Test a pattern is only matched within one line."""
+        text = "version\n= 1.0.0\nversion = 2.0.0\n"
+        pattern = compile_pattern(r'^version\s*=\s*\d')
+        start, end = pattern.find_line(text)
+        assert text[start:end] == "version = 2.0.0"
+        assert text[slice(*pattern.find_version(text))] == "2.0.0"
+
+    def test_skips_matching_lines_without_version(self):
+        """Test extraction continues past matching lines with no version."""
+        text = "version: unknown\nversion: 3.2.1\n"
+        assert self.vm._extract_version_from_target(text, r'^version:.*$') == "3.2.1"
+
+    def test_crlf_preserved(self):
+        """Test CRLF files keep their line endings and match $ anchors."""
+        text = 'name = "x"\r\nversion = "1.0.0"\r\nend = 1\r\n'
+        pattern = r'^version\s*=\s*".*"$'
+        assert self.vm._extract_version_from_target(text, pattern) == "1.0.0"
+        updated = self.vm._update_target_content(text, "x.toml", pattern, "1.1.0")
+        assert updated == 'name = "x"\r\nversion = "1.1.0"\r\nend = 1\r\n'
+
+    def test_missing_trailing_newline_preserved(self):
+        """Test a final line without newline is rewritten without adding one."""
+        text = "name: x\nversion: 1.0.0"
+        updated = self.vm._update_target_content(text, "x.yml", r'^version:.*$', "2.0.0")
+        assert updated == "name: x\nversion: 2.0.0"
+
+    def test_untouched_bytes_identical(self):
+        """Test everything outside the version line is left as is."""
+        text = "a: 1\r\n\nversion: 1.0.0\n  b: 2\r\n"
+        updated = self.vm._update_target_content(text, "x.yml", r'^version:.*$', "9.9.9")
+        assert updated == "a: 1\r\n\nversion: 9.9.9\n  b: 2\r\n"
+
+
+def baseline_extract(content: str, version_pattern: str):
+    """Reference: the original per-line extraction, each line its own string."""
+    for line in content.split('\n'):
+        if re.match(version_pattern, line):
+            version_match = re.search(r'\d+\.\d+\.\d+', line)
+            if version_match:
+                return version_match.group(0)
+    return None
+
+
+class TestLineSensitivePatterns:
+    """Test anchors and lookbehinds keep their per-line meaning."""
+
+    TEXT = "name: x\nversion: 1.2.3"
+
+    @pytest.mark.parametrize("pattern, expected", [
+        (r'\Aversion:.*', "1.2.3"),
+        (r'version:.*\Z', "1.2.3"),
+        (r'(?<=\n)version:.*', None),
+        (r'(?<!\n)version:.*', "1.2.3"),
+        (r'(?<=name: x\n)version:.*', None),
+    ])
+    def test_matches_baseline(self, pattern, expected):
+        """Test each pattern extracts what the original per-line scan did."""
+        assert baseline_extract(self.TEXT, pattern) == expected
+        assert compile_pattern(pattern).isolated
+        span = compile_pattern(pattern).find_version(self.TEXT)
+        assert (self.TEXT[slice(*span)] if span else None) == expected
+
+    @pytest.mark.parametrize("pattern", [r'\Aversion:.*', r'(?<!\n)version:.*'])
+    def test_sync(self, pattern):
+        """Test sync rewrites the line the pattern matches on its own."""
+        from src.main import VersionManager
+        updated = VersionManager()._update_target_content(self.TEXT, "x.yml", pattern, "2.0.0")
+        assert updated == "name: x\nversion: 2.0.0"
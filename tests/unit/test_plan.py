@@ -0,0 +1,184 @@
+"""Unit tests for sync plans and their application."""
+
+import json
+import shutil
+import subprocess
+
+import pytest
+
+from src.main import VersionManager
+from src.main.local import LocalDirectory
+from src.main.plan import SyncPlan, apply_patch, render_patch
+from tests.fakes import FakeDirectory
+
+GALAXY = "namespace: acme\nname: tools\nversion: 1.0.0\ndescription: ünïcode\n"
+
+
+def read_from(files: dict[str, str]):
+    """Reader over a dict of file contents."""
+    return lambda path: files[path]
+
+
+class TestRenderPatch:
+    """Test the unified diffs of in-place edits."""
+
+    def test_single_edit(self):
+        """Test one changed line with its context."""
+        patch = render_patch("galaxy.yml", GALAXY, GALAXY.replace("1.0.0", "1.2.3"))
+        assert patch == (
+            "diff --git a/galaxy.yml b/galaxy.yml\n"
+            "--- a/galaxy.yml\n"
+            "+++ b/galaxy.yml\n"
+            "@@ -1,4 +1,4 @@\n"
+            " namespace: acme\n"
+            " name: tools\n"
+            "-version: 1.0.0\n"
+            "+version: 1.2.3\n"
+            " description: ünïcode\n"
+        )
+
+    def test_unchanged(self):
+        """Test an unchanged file renders no diff."""
+        assert render_patch("galaxy.yml", GALAXY, GALAXY) == ""
+
+    def test_hunks(self):
+        """Test distant edits get separate hunks and close ones share one."""
+        old = "".join(f"line {i}: 1.0.0\n" for i in range(30))
+        new = old.replace("line 2: 1.0.0", "line 2: 2.0.0").replace(
+            "line 5: 1.0.0", "line 5: 2.0.0").replace("line 25: 1.0.0", "line 25: 2.0.0")
+        patch = render_patch("a.txt", old, new)
+        assert [line for line in patch.splitlines() if line.startswith("@@")] == [
+            "@@ -1,9 +1,9 @@", "@@ -23,7 +23,7 @@"
+        ]
+        assert apply_patch(read_from({"a.txt": old}), patch) == {"a.txt": new}
+
+    @pytest.mark.parametrize("old", [
+        "name: x\r\nversion: 1.0.0\r\n",
+        "name: x\nversion: 1.0.0",
+    ])
+    def test_round_trip(self, old):
+        """Test line endings and a missing final newline survive the patch."""
+        new = old.replace("1.0.0", "1.2.3")
+        patch = render_patch("galaxy.yml", old, new)
+        assert apply_patch(read_from({"galaxy.yml": old}), patch) == {"galaxy.yml": new}
+
+    def test_stale_patch(self):
+        """Test a patch planned against other contents is rejected."""
+        patch = render_patch("galaxy.yml", GALAXY, GALAXY.replace("1.0.0", "1.2.3"))
+        with pytest.raises(ValueError, match="does not apply"):
+            apply_patch(read_from({"galaxy.yml": GALAXY.replace("tools", "other")}), patch)
+
+    @pytest.mark.skipif(shutil.which("git") is None, reason="git is not available")
+    def test_git_apply(self, tmp_path):
+        """Test git applies the rendered patch like apply_patch does."""
+        files = {"galaxy.yml": GALAXY, "Dockerfile": "FROM x\nLABEL version=\"1.0.0\""}
+        patch = ""
+        for path, content in files.items():
+            (tmp_path / path).write_bytes(content.encode())
+            patch += render_patch(path, content, content.replace("1.0.0", "1.2.3"))
+        subprocess.run(
+            ["git", "apply", "-"], cwd=tmp_path, input=patch.encode(), check=True,
+            capture_output=True
+        )
+        expected = apply_patch(read_from(files), patch)
+        assert {path: (tmp_path / path).read_bytes().decode() for path in files} == expected
+
+
+class TestPlanSync:
+    """Test plan-sync previews exactly what sync writes."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.vm = VersionManager()
+        self.files = {
+            "VERSION": "1.2.3\n",
+            "galaxy.yml": GALAXY,
+            "pyproject.toml": '[project]\nname = "ünï"\nversion = "1.0.0"\n',
+            "Chart.yaml": "name: x\nversion: 1.0.0\nappVersion: 1.1.0\n",
+        }
+        self.targets = ["galaxy.yml", "pyproject.toml", "Chart.yaml", "Chart.yaml:^appVersion:.*$"]
+
+    async def test_json_edits(self):
+        """Test each edit carries byte offsets into the current file."""
+        plan = json.loads(await self.vm.plan_sync(
+            FakeDirectory(self.files), targets=self.targets, output_format="json"
+        ))
+        assert plan["version"] == "1.2.3"
+        assert [(edit["file"], edit["line"], edit["old"]) for edit in plan["edits"]] == [
+            ("galaxy.yml", 3, "1.0.0"),
+            ("pyproject.toml", 3, "1.0.0"),
+            ("Chart.yaml", 2, "1.0.0"),
+            ("Chart.yaml", 3, "1.1.0"),
+        ]
+        for edit in plan["edits"]:
+            data = self.files[edit["file"]].encode()
+            assert data[edit["start"]:edit["end"]] == edit["old"].encode()
+
+    async def test_matches_sync(self):
+        """Test applying the plan gives the files sync-versions writes."""
+        source = FakeDirectory(self.files)
+        patch = await self.vm.plan_sync(source, targets=self.targets)
+        applied = await self.vm.apply_plan(source, patch)
+        synced = await self.vm.sync_versions(source, self.targets)
+        assert applied.files == synced.files
+
+    async def test_no_writes(self, monkeypatch):
+        """Test planning never writes a directory."""
+        def forbidden(*args, **kwargs):
+            raise AssertionError("plan-sync wrote a directory")
+
+        monkeypatch.setattr(FakeDirectory, "with_new_file", forbidden)
+        monkeypatch.setattr(FakeDirectory, "with_directory", forbidden)
+        assert "+version: 1.2.3" in await self.vm.plan_sync(FakeDirectory(self.files))
+
+    async def test_in_sync(self):
+        """Test a consistent project plans nothing and applying it is a no-op."""
+        source = FakeDirectory({"VERSION": "1.2.3\n", "galaxy.yml": "version: 1.2.3\n"})
+        assert await self.vm.plan_sync(source) == ""
+        plan = await self.vm.plan_sync(source, output_format="json")
+        assert json.loads(plan)["edits"] == []
+        assert await self.vm.apply_plan(source, plan) is source
+
+    async def test_apply_json_plan(self):
+        """Test JSON plans are applied through their patch."""
+        source = FakeDirectory(self.files)
+        plan = await self.vm.plan_sync(source, output_format="json")
+        updated = await self.vm.apply_plan(source, plan)
+        assert "version: 1.2.3" in updated.files["galaxy.yml"]
+        assert updated.files["pyproject.toml"] == self.files["pyproject.toml"]
+
+    async def test_stale_plan(self):
+        """Test a plan fails on contents edited since it was computed."""
+        patch = await self.vm.plan_sync(FakeDirectory(self.files))
+        edited = FakeDirectory({**self.files, "galaxy.yml": GALAXY.replace("tools", "other")})
+        with pytest.raises(ValueError, match="does not apply"):
+            await self.vm.apply_plan(edited, patch)
+
+    async def test_errors(self):
+        """Test invalid formats, targets and plans are reported."""
+        source = FakeDirectory(self.files)
+        assert "Invalid output_format" in await self.vm.plan_sync(source, output_format="xml")
+        with pytest.raises(Exception, match="Failed to plan 1 of 2 targets"):
+            await self.vm.plan_sync(source, targets=["galaxy.yml", "missing/galaxy.yml"])
+        with pytest.raises(Exception, match="Invalid sync plan"):
+            await self.vm.apply_plan(source, '{"edits": []}')
+
+    def test_plan_round_trip(self):
+        """Test plans survive serialization."""
+        plan = SyncPlan("1.2.3", "VERSION", patch="diff")
+        assert SyncPlan.from_json(plan.to_json()) == plan
+
+
+class TestLocalApply:
+    """Test plans apply to local checkouts in server mode."""
+
+    async def test_apply(self, tmp_path):
+        """Test the patched files are written on export."""
+        (tmp_path / "VERSION").write_text("1.2.3\n")
+        (tmp_path / "galaxy.yml").write_text(GALAXY)
+        vm = VersionManager()
+        source = LocalDirectory(str(tmp_path))
+        updated = await vm.apply_plan(source, await vm.plan_sync(source))
+        assert updated.written == {"galaxy.yml": GALAXY.replace("1.0.0", "1.2.3")}
+        await updated.export()
+        assert "version: 1.2.3" in (tmp_path / "galaxy.yml").read_text()
@@ -0,0 +1,86 @@
+"""Unit tests for the opt-in profiler and the profile_release function."""
+
+import asyncio
+import json
+
+from src.main import VersionManager
+from src.main.profiler import Profiler, measure, profiled, profiling
+from tests.fakes import FakeDirectory
+
+
+def release_tree() -> FakeDirectory:
+    """Ansible collection whose galaxy.yml is behind VERSION."""
+    return FakeDirectory({
+        "version/VERSION": "1.4.0\n",
+        "galaxy.yml": "namespace: acme\nname: tools\nversion: 1.3.0\n",
+    })
+
+
+class TestProfiler:
+    """Test measurement recording."""
+
+    def test_inactive_measure_records_nothing(self):
+        """Test measuring without an active profiler is a no-op."""
+        with measure("engine.file.contents") as span:
+            span.bytes = 10
+        with profiling() as profiler:
+            pass
+        assert profiler.operations == {}
+
+    def test_aggregates_calls(self):
+        """Test count, bytes and max latency accumulate per operation."""
+        profiler = Profiler()
+        profiler.record("engine.file.contents", 2.0, 100)
+        profiler.record("engine.file.contents", 5.0, 20)
+        stats = profiler.operations["engine.file.contents"]
+        assert (stats.count, stats.bytes, stats.total_ms, stats.max_ms) == (2, 120, 7.0, 5.0)
+
+    async def test_profiled_helpers(self):
+        """Test sync and async helpers are recorded, including spawned tasks."""
+        @profiled
+        def parse(text):
+            return text.strip()
+
+        @profiled
+        async def fetch(name):
+            await asyncio.sleep(0)
+            return parse(name)
+
+        with profiling() as profiler:
+            assert await asyncio.gather(fetch(" a "), fetch(" b ")) == ["a", "b"]
+        assert profiler.operations["helper.fetch"].count == 2
+        assert profiler.operations["helper.parse"].count == 2
+
+        assert parse(" c ") == "c"
+        assert profiler.operations["helper.parse"].count == 2
+
+
+class TestProfileRelease:
+    """Test the profile_release function."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.vm = VersionManager()
+
+    async def test_result_and_breakdown(self):
+        """Test the release output is returned with a timing breakdown."""
+        report = json.loads(await self.vm.profile_release(release_tree()))
+        assert report["result"] == (await self.vm.release(release_tree())).report
+
+        operations = report["profile"]["operations"]
+        reads = operations["engine.file.contents"]
+        assert reads["count"] == 2
+        assert reads["bytes"] == len("1.4.0\n") + len("namespace: acme\nname: tools\nversion: 1.3.0\n")
+        assert operations["engine.directory.with_new_file"]["count"] == 1
+        for helper in ("_resolve_version_file", "_read_version_file", "_render_targets",
+                       "_extract_version_from_target", "_update_target_content"):
+            assert operations[f"helper.{helper}"]["count"] >= 1
+        assert report["profile"]["elapsed_ms"] >= operations["helper._render_targets"]["total_ms"]
+
+    async def test_slowest_first(self):
+        """Test operations are ordered by total time."""
+        source = FakeDirectory(release_tree().files, latency=0.01)
+        operations = json.loads(await self.vm.profile_release(source))["profile"]["operations"]
+        totals = [stats["total_ms"] for stats in operations.values()]
+        assert totals == sorted(totals, reverse=True)
+        assert operations["engine.file.contents"]["max_ms"] >= 10
@@ -0,0 +1,161 @@
+"""Unit tests for the release workflow and its batched write."""
+
+import re
+
+from src.main import ReleaseResult, VersionManager
+from src.main.context import CallContext
+from src.main.profiler import profiling
+from tests.fakes import FakeDirectory
+
+CHANGELOG = """# Changelog
+
+All notable changes to this project.
+
+## [1.2.3] - 2025-01-01
+
+- Initial release
+"""
+
+
+def project(**extra: str) -> FakeDirectory:
+    """Collection with a Python package and a Helm chart next to it."""
+    files = {
+        "VERSION": "1.2.3\n",
+        "galaxy.yml": "namespace: acme\nname: tools\nversion: 1.2.0\n",
+        "pyproject.toml": '[project]\nname = "tools"\nversion = "1.2.0"\n',
+        "Chart.yaml": "apiVersion: v2\nversion: 1.2.0\n",
+    }
+    files.update(extra)
+    return FakeDirectory(files)
+
+
+class TestBatchedWrite:
+    """Test several files written through one overlay."""
+
+    async def test_reads_answered_from_written_files(self):
+        """Test files written together are read back without the engine."""
+        source = project()
+        ctx = CallContext()
+        updated = ctx.with_new_files(source, {"VERSION": "2.0.0", "notes.md": "x"})
+        assert updated.files["VERSION"] == "2.0.0"
+        assert updated.files["galaxy.yml"] == source.files["galaxy.yml"]
+        assert await ctx.read(updated, "VERSION") == "2.0.0"
+        assert await ctx.exists(updated, "notes.md")
+        assert source.stats.count("contents") == 0
+
+    def test_glob_characters_in_paths(self):
+        """Test written paths are taken literally, not as filter patterns."""
+        source = project(**{"[x].txt": "old", "a.txt": "keep"})
+        updated = CallContext().with_new_files(source, {"[x].txt": "new", "b*.md": "x"})
+        assert updated.files == {**source.files, "[x].txt": "new", "b*.md": "x"}
+
+    def test_single_and_empty(self):
+        """Test trivial batches skip the overlay."""
+        source = project()
+        ctx = CallContext()
+        assert ctx.with_new_files(source, {}) is source
+        with profiling() as profiler:
+            ctx.with_new_files(source, {"VERSION": "2.0.0"})
+        assert list(profiler.operations) == ["engine.directory.with_new_file"]
+
+
+class TestRelease:
+    """Test release returns everything needed to export once."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.vm = VersionManager()
+
+    async def test_returns_directory_and_report(self):
+        """Test the synced directory is returned with the report."""
+        result = await self.vm.release(project())
+        assert isinstance(result, ReleaseResult)
+        assert result.version == "1.2.3"
+        assert result.files == ["VERSION", "galaxy.yml"]
+        assert "version: 1.2.3" in result.directory.files["galaxy.yml"]
+        assert "✅ Synced 1.2.3 → galaxy.yml" in result.report
+        assert "✅ Version 1.2.3 is consistent" in result.report
+        assert "git add VERSION galaxy.yml" in result.report
+
+    async def test_bump_targets_and_changelog_in_one_write(self):
+        """Test every release file lands in the directory through one write."""
+        source = project(**{"CHANGELOG.md": CHANGELOG})
+        with profiling() as profiler:
+            result = await self.vm.release(
+                source,
+                targets=["galaxy.yml", "pyproject.toml", "Chart.yaml"],
+                bump_type="minor",
+                changelog="- Sync several targets",
+            )
+
+        files = result.directory.files
+        assert files["VERSION"] == "1.3.0"
+        assert "version: 1.3.0" in files["galaxy.yml"]
+        assert 'version = "1.3.0"' in files["pyproject.toml"]
+        assert "version: 1.3.0" in files["Chart.yaml"]
+        assert result.files == [
+            "VERSION", "galaxy.yml", "pyproject.toml", "Chart.yaml", "CHANGELOG.md",
+        ]
+        assert "✅ Bumped VERSION: 1.2.3 → 1.3.0" in result.report
+        assert 'git tag -a v1.3.0 -m "Release 1.3.0"' in result.report
+
+        operations = profiler.operations
+        assert operations["engine.directory.with_directory"].count == 1
+        assert "engine.directory.with_new_file" not in operations
+        for path in ("VERSION", "galaxy.yml", "pyproject.toml", "Chart.yaml", "CHANGELOG.md"):
+            assert source.stats.count("contents", path) == 1
+
+    async def test_validates_every_target(self):
+        """Test each target is validated against the released version."""
+        result = await self.vm.release(project(), targets=["galaxy.yml", "Chart.yaml"])
+        assert result.report.count("✅ Version 1.2.3 is consistent") == 1
+        assert "✅ Synced 1.2.3 → Chart.yaml" in result.report
+
+    async def test_prerelease_bump(self):
+        """Test a pre-release bump with a custom label."""
+        result = await self.vm.release(project(), bump_type="prerelease", preid="beta")
+        assert result.version == "1.2.4-beta.1"
+        assert "version: 1.2.4-beta.1" in result.directory.files["galaxy.yml"]
+
+    async def test_errors_leave_source_unchanged(self):
+        """Test failures are reported with the unchanged source."""
+        source = project()
+        for kwargs, message in [
+            ({"bump_type": "huge"}, "Invalid bump_type"),
+            ({"targets": ["notes.txt"]}, "No version pattern for notes.txt"),
+            ({"target_file": "missing.yml"}, "Failed to read missing.yml"),
+            ({"version_file": "nope"}, "nope"),
+        ]:
+            result = await self.vm.release(source, **kwargs)
+            assert message in result.report
+            assert result.directory is source
+            assert (result.version, result.files) == ("", [])
+
+
+class TestChangelog:
+    """Test release notes are added to the changelog."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.vm = VersionManager()
+
+    async def test_new_changelog(self):
+        """Test a changelog is created when there is none."""
+        result = await self.vm.release(project(), changelog="- First notes\n")
+        content = result.directory.files["CHANGELOG.md"]
+        assert re.fullmatch(
+            r"# Changelog\n\n## \[1\.2\.3\] - \d{4}-\d{2}-\d{2}\n\n- First notes\n", content
+        )
+
+    async def test_inserted_above_previous_release(self):
+        """Test the section goes below the introduction and above older releases."""
+        content = self.vm._changelog_content(CHANGELOG, "1.3.0", "- Added")
+        positions = [content.index(text) for text in ("All notable", "## [1.3.0]", "## [1.2.3]")]
+        assert positions == sorted(positions)
+        assert "- Added\n\n## [1.2.3]" in content
+        assert content.endswith("- Initial release\n")
+
+    async def test_appended_without_sections(self):
+        """Test the section is appended to a changelog without releases."""
+        content = self.vm._changelog_content("# Changes\n", "1.0.0", "- Added")
+        assert content.startswith("# Changes\n\n## [1.0.0] - ")
@@ -0,0 +1,108 @@
+"""Unit tests for format-aware version rewriting."""
+
+import pytest
+
+from src.main import VersionManager
+from src.main.rewriters import (
+    DOCKERFILE,
+    GENERIC,
+    PACKAGE_JSON,
+    PYTHON,
+    SETUP_CFG,
+    TOML,
+    YAML,
+    select_rewriter,
+)
+
+
+class TestSelectRewriter:
+    """Test rewriter selection from file name or line marker."""
+
+    def test_by_file_name(self):
+        """Test known file names and extensions."""
+        assert select_rewriter("galaxy.yml") is YAML
+        assert select_rewriter("charts/app/Chart.yaml") is YAML
+        assert select_rewriter("deploy/values.yaml") is YAML
+        assert select_rewriter("pyproject.toml") is TOML
+        assert select_rewriter("Dockerfile") is DOCKERFILE
+        assert select_rewriter("Dockerfile.prod") is DOCKERFILE
+        assert select_rewriter("web/package.json") is PACKAGE_JSON
+        assert select_rewriter("setup.cfg") is SETUP_CFG
+        assert select_rewriter("src/pkg/__init__.py") is PYTHON
+
+    def test_by_marker(self):
+        """Test unknown files fall back to the line marker, then generic."""
+        assert select_rewriter("VERSION.txt", '__version__ = "1.0.0"') is PYTHON
+        assert select_rewriter("build.conf", 'LABEL version="1.0.0"') is DOCKERFILE
+        assert select_rewriter("notes.txt", "release 1.0.0") is GENERIC
+
+
+class TestFormatPreservingSync:
+    """Test only the version span is replaced in each format."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.vm = VersionManager()
+
+    @pytest.mark.parametrize("target_file, pattern, before, after", [
+        (
+            "galaxy.yml", r'^version:.*$',
+            "version: 1.0.0  # bumped by CI\n",
+            "version: 2.0.0  # bumped by CI\n",
+        ),
+        (
+            "Chart.yaml", r'^\s+version:.*$',
+            "dependencies:\n  - name: db\n    version: '1.0.0'\n",
+            "dependencies:\n  - name: db\n    version: '2.0.0'\n",
+        ),
+        (
+            "pyproject.toml", r'^version\s*=\s*".*"$',
+            '[project]\nversion = "1.0.0"\n',
+            '[project]\nversion = "2.0.0"\n',
+        ),
+        (
+            "Dockerfile", r'LABEL version=".*"$',
+            'FROM alpine\nLABEL version="1.0.0"\n',
+            'FROM alpine\nLABEL version="2.0.0"\n',
+        ),
+        (
+            "Dockerfile", r'^ARG VERSION=',
+            "ARG VERSION=1.0.0\n",
+            "ARG VERSION=2.0.0\n",
+        ),
+        (
+            "package.json", r'^\s*"version"',
+            '{\n  "name": "x",\n  "version": "1.0.0",\n}\n',
+            '{\n  "name": "x",\n  "version": "2.0.0",\n}\n',
+        ),
+        (
+            "setup.cfg", r'^version\s*=',
+            "[metadata]\nversion = 1.0.0 ; keep\n",
+            "[metadata]\nversion = 2.0.0 ; keep\n",
+        ),
+        (
+            "src/pkg/__init__.py", r'^__version__',
+            '__version__: str = "1.0.0"  # noqa\n',
+            '__version__: str = "2.0.0"  # noqa\n',
+        ),
+        (
+            "deploy/app.yaml", r'^\s+image:',
+            "spec:\n  image: registry/app:v1.0.0\n",
+            "spec:\n  image: registry/app:v2.0.0\n",
+        ),
+    ])
+    def test_rewrite(self, target_file, pattern, before, after):
+        """Test each format keeps indentation, quotes and comments."""
+        assert self.vm._update_target_content(before, target_file, pattern, "2.0.0") == after
+
+    def test_non_numeric_value_replaced(self):
+        """Test a placeholder value is replaced as a whole."""
+        updated = self.vm._update_target_content(
+            "version: unknown\n", "galaxy.yml", r'^version:.*$', "1.0.0"
+        )
+        assert updated == "version: 1.0.0\n"
+
+    def test_no_value_found(self):
+        """Test a matched line without a recognizable value is an error."""
+        with pytest.raises(Exception, match="No version value found"):
+            self.vm._update_target_content("release notes\n", "notes.txt", r'^release', "1.0.0")
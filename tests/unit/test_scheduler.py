@@ -0,0 +1,126 @@
+"""Unit tests for the engine call scheduler."""
+
+import asyncio
+import json
+
+import pytest
+
+from src.main import VersionManager
+from src.main.context import CallContext
+from src.main.scheduler import EngineScheduler
+from tests.fakes import FakeDirectory
+
+
+def monorepo(packages: int, latency: float = 0.0) -> FakeDirectory:
+    """Consistent packages behind a slow engine."""
+    files = {}
+    for i in range(packages):
+        files[f"packages/p{i}/VERSION"] = "0.1.0\n"
+        files[f"packages/p{i}/pyproject.toml"] = '[project]\nversion = "0.1.0"\n'
+    return FakeDirectory(files, latency=latency)
+
+
+class TestEngineScheduler:
+    """Test the limit, coalescing and timeouts."""
+
+    async def test_limit(self):
+        """Test no more than the limit runs at once and the rest is queued."""
+        source = monorepo(20, latency=0.01)
+        scheduler = EngineScheduler(max_concurrency=3)
+        ctx = CallContext(scheduler)
+        paths = [f"packages/p{i}/VERSION" for i in range(20)]
+        await asyncio.gather(*(ctx.read(source, path) for path in paths))
+        assert source.stats.max_in_flight == 3
+        assert scheduler.stats.max_running == 3
+        assert scheduler.stats.max_queued == 17
+        assert (scheduler.stats.queued, scheduler.stats.running) == (0, 0)
+
+    async def test_coalescing(self):
+        """Test identical queries in flight share one engine call."""
+        source = monorepo(1, latency=0.01)
+        scheduler = EngineScheduler()
+        contexts = [CallContext(scheduler) for _ in range(3)]
+        results = await asyncio.gather(
+            *(ctx.read(source, "packages/p0/VERSION") for ctx in contexts),
+            *(ctx.exists(source, "packages/p0/VERSION") for ctx in contexts),
+        )
+        assert results == ["0.1.0\n"] * 3 + [True] * 3
+        assert source.stats.count("contents") == 1
+        assert source.stats.count("entries") == 1
+        assert scheduler.stats.coalesced == 4
+
+        # Finished queries aren't shared: a later read goes to the engine
+        await CallContext(scheduler).read(source, "packages/p0/VERSION")
+        assert source.stats.count("contents") == 2
+
+    async def test_failures_are_shared(self):
+        """Test callers joining a failing query all see its error."""
+        source = monorepo(1)
+        scheduler = EngineScheduler()
+        results = await asyncio.gather(
+            *(CallContext(scheduler).read(source, "missing") for _ in range(2)),
+            return_exceptions=True
+        )
+        assert all("no such file" in str(result) for result in results)
+        assert scheduler.stats.coalesced == 1
+
+    async def test_timeout(self):
+        """Test slow queries are abandoned, but container runs aren't."""
+        scheduler = EngineScheduler(timeout=0.01)
+        with pytest.raises(TimeoutError, match="timed out after 0.01s"):
+            await scheduler.run("slow", lambda: asyncio.sleep(0.1))
+        container = scheduler.run(None, lambda: asyncio.sleep(0.03, "done"), apply_timeout=False)
+        assert await container == "done"
+        assert scheduler.stats.timeouts == 1
+        assert scheduler.stats.running == 0
+
+    async def test_finished_call_keeps_newer_entry(self):
+        """Test a finished call doesn't drop another call registered under its key."""
+        scheduler = EngineScheduler()
+        first = asyncio.ensure_future(scheduler.run("key", lambda: asyncio.sleep(0.01, 1)))
+        await asyncio.sleep(0)
+        newer = asyncio.get_running_loop().create_future()
+        scheduler._in_flight["key"] = newer
+        assert await first == 1
+        await asyncio.sleep(0)
+        assert scheduler._in_flight == {"key": newer}
+
+    def test_event_loops(self):
+        """Test one scheduler serves successive event loops."""
+        scheduler = EngineScheduler(max_concurrency=1)
+
+        async def burst():
+            return await asyncio.gather(*(
+                scheduler.run(None, lambda i=i: asyncio.sleep(0, i)) for i in range(3)
+            ))
+
+        assert asyncio.run(burst()) == [0, 1, 2]
+        assert asyncio.run(burst()) == [0, 1, 2]
+
+
+class TestVersionManagerScheduling:
+    """Test the functions share the scheduler of their instance."""
+
+    async def test_monorepo_limit(self):
+        """Test a fan-out over packages stays within max_engine_calls."""
+        source = monorepo(30, latency=0.002)
+        vm = VersionManager(max_engine_calls=4)
+        report = json.loads(await vm.validate_all(source, max_concurrency=16))
+        assert report["ok"]
+        assert len(report["packages"]) == 30
+        assert source.stats.max_in_flight == 4
+        assert vm._engine().stats.max_queued > 0
+
+    async def test_timeout_surfaces(self):
+        """Test a stuck engine fails the call instead of hanging it."""
+        source = FakeDirectory({"VERSION": "1.2.3\n"}, latency=0.5)
+        vm = VersionManager(engine_timeout=0.01)
+        with pytest.raises(TimeoutError):
+            await vm.get_version(source)
+
+    async def test_profile_reports_scheduler(self):
+        """Test profile-release includes the queue statistics."""
+        source = FakeDirectory({"VERSION": "1.2.3\n", "galaxy.yml": "version: 1.2.3\n"})
+        profile = json.loads(await VersionManager().profile_release(source))
+        assert profile["scheduler"]["submitted"] >= 2
+        assert set(profile["scheduler"]) >= {"coalesced", "max_queued", "timeouts"}
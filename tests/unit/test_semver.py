@@ -0,0 +1,130 @@
+"""Unit tests for the SemVer 2.0 version type."""
+
+import pytest
+
+from src.main import VersionManager
+from src.main.semver import Version
+from tests.fakes import FakeDirectory
+
+
+class TestVersionParsing:
+    """Test parsing and formatting."""
+
+    def test_parse_components(self):
+        """Test every component of a full version is parsed."""
+        version = Version.parse("1.4.0-rc.2+sha.abc")
+        assert (version.major, version.minor, version.patch) == (1, 4, 0)
+        assert version.prerelease == ("rc", 2)
+        assert version.build == ("sha", "abc")
+        assert version.is_prerelease
+        assert str(version) == "1.4.0-rc.2+sha.abc"
+
+    @pytest.mark.parametrize("text", ["1.0", "v1.0.0", "01.0.0", "1.0.0-01", "1.0.0-a..b", "1.0.0\n"])
+    def test_parse_invalid(self, text):
+        """Test invalid versions raise ValueError."""
+        with pytest.raises(ValueError):
+            Version.parse(text)
+
+    def test_immutable(self):
+        """Test attributes can't be changed or added."""
+        version = Version.parse("1.0.0")
+        with pytest.raises(AttributeError):
+            version.major = 2
+        with pytest.raises(AttributeError):
+            version.extra = 1
+
+
+class TestVersionPrecedence:
+    """Test SemVer 2.0 precedence rules."""
+
+    def test_spec_ordering(self):
+        """Test the ordering example from the specification."""
+        ordered = [
+            "1.0.0-alpha", "1.0.0-alpha.1", "1.0.0-alpha.beta", "1.0.0-beta",
+            "1.0.0-beta.2", "1.0.0-beta.11", "1.0.0-rc.1", "1.0.0", "1.0.1", "1.10.0", "2.0.0",
+        ]
+        versions = [Version.parse(text) for text in ordered]
+        assert [str(v) for v in sorted(reversed(versions))] == ordered
+        assert sorted(reversed(versions), key=lambda v: v.precedence) == versions
+        assert all(a < b and b > a and a <= b and b >= a for a, b in zip(versions, versions[1:]))
+
+    def test_build_metadata_ignored(self):
+        """Test build metadata doesn't affect equality or hashing."""
+        a, b = Version.parse("1.0.0+a"), Version.parse("1.0.0+b")
+        assert a == b
+        assert len({a, b}) == 1
+        assert str(a) != str(b)
+
+    def test_numeric_below_alphanumeric(self):
+        """Test numeric identifiers have lower precedence than alphanumeric ones."""
+        assert Version.parse("1.0.0-2") < Version.parse("1.0.0-alpha")
+        assert Version.parse("1.0.0-rc.9") < Version.parse("1.0.0-rc.10")
+
+
+class TestVersionBump:
+    """Test bumps including pre-release series."""
+
+    @pytest.mark.parametrize("current, bump_type, expected", [
+        ("1.2.3+build", "patch", "1.2.4"),
+        ("1.2.3", "prerelease", "1.2.4-rc.1"),
+        ("1.2.4-rc.1", "prerelease", "1.2.4-rc.2"),
+        ("1.2.4-alpha", "prerelease", "1.2.4-alpha.1"),
+        ("1.2.4-rc.2", "finalize", "1.2.4"),
+        ("1.2.4-rc.2", "patch", "1.2.4"),
+        ("1.3.0-rc.1", "minor", "1.3.0"),
+        ("1.3.1-rc.1", "minor", "1.4.0"),
+        ("2.0.0-rc.1", "major", "2.0.0"),
+        ("2.1.0-rc.1", "major", "3.0.0"),
+    ])
+    def test_bump(self, current, bump_type, expected):
+        """Test each bump type from release and pre-release versions."""
+        assert str(Version.parse(current).bump(bump_type)) == expected
+
+    def test_preid(self):
+        """Test a pre-release label starts or switches a series."""
+        assert str(Version.parse("1.2.3").bump("prerelease", "beta")) == "1.2.4-beta.1"
+        assert str(Version.parse("1.2.4-alpha.3").bump("prerelease", "beta")) == "1.2.4-beta.1"
+
+    def test_finalize_release_fails(self):
+        """Test finalizing a release is reported."""
+        vm = VersionManager()
+        new_version, error = vm._bump_version_logic("1.2.3", "finalize")
+        assert new_version is None
+        assert "not a pre-release" in error
+
+    def test_bump_logic_prerelease(self):
+        """Test the helper accepts the new bump types and labels."""
+        vm = VersionManager()
+        assert vm._bump_version_logic("1.4.0-rc.1", "prerelease") == ("1.4.0-rc.2", None)
+        assert vm._bump_version_logic("1.4.0", "prerelease", "beta") == ("1.4.1-beta.1", None)
+
+
+class TestPrereleaseTargets:
+    """Test validation and sync of pre-release versions in target files."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.vm = VersionManager()
+
+    async def test_validate_prerelease(self):
+        """Test a pre-release target is compared as a whole."""
+        source = FakeDirectory({"VERSION": "1.4.0-rc.2\n", "galaxy.yml": "version: 1.4.0-rc.2\n"})
+        assert await self.vm.validate_version(source) == "✅ Version 1.4.0-rc.2 is consistent"
+
+        source = FakeDirectory({"VERSION": "1.4.0-rc.2\n", "galaxy.yml": "version: 1.4.0-rc.1\n"})
+        assert "galaxy.yml=1.4.0-rc.1" in await self.vm.validate_version(source)
+
+    async def test_sync_replaces_whole_prerelease(self):
+        """Test syncing replaces the pre-release suffix instead of keeping it."""
+        source = FakeDirectory({
+            "VERSION": "1.4.0\n",
+            "galaxy.yml": "name: x\nversion: 1.4.0-rc.2+sha.abc  # release\n",
+        })
+        result = await self.vm.sync_version(source)
+        assert result.files["galaxy.yml"] == "name: x\nversion: 1.4.0  # release\n"
+
+    async def test_bump_version_prerelease(self):
+        """Test bump_version writes a pre-release version."""
+        source = FakeDirectory({"VERSION": "1.4.0\n"})
+        result = await self.vm.bump_version(source, "prerelease", preid="beta")
+        assert result.files["VERSION"] == "1.4.1-beta.1"
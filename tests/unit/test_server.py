@@ -0,0 +1,108 @@
+"""Unit tests for the JSON-lines server."""
+
+import asyncio
+import json
+
+import pytest
+
+from src.main.server import VersionServer
+
+
+@pytest.fixture
+def repos(tmp_path):
+    """Two checkouts: one consistent, one out of sync."""
+    for name, target in [("good", "1.2.3"), ("stale", "1.0.0")]:
+        repo = tmp_path / name
+        repo.mkdir()
+        (repo / "VERSION").write_text("1.2.3\n")
+        (repo / "galaxy.yml").write_text(f"name: {name}\nversion: {target}\n")
+    return tmp_path
+
+
+class TestVersionServer:
+    """Test requests are dispatched to the module's functions."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.server = VersionServer()
+
+    async def test_single_job(self, repos):
+        """Test a function call against a local checkout."""
+        response = await self.server.handle(
+            {"id": 7, "function": "validate-version", "source": str(repos / "good")}
+        )
+        assert response == {"id": 7, "ok": True, "result": "✅ Version 1.2.3 is consistent"}
+
+    async def test_batch(self, repos):
+        """Test a batch answers every job in request order."""
+        response = await self.server.handle({"id": "b", "jobs": [
+            {"id": name, "function": "validate_version", "source": str(repos / name)}
+            for name in ("good", "stale", "good")
+        ]})
+        assert response["ok"] is True
+        assert [result["id"] for result in response["results"]] == ["good", "stale", "good"]
+        assert "Mismatch" in response["results"][1]["result"]
+
+    async def test_export(self, repos):
+        """Test returned directories are written back only when asked."""
+        job = {"function": "sync-version", "source": str(repos / "stale")}
+        response = await self.server.handle(job)
+        assert response["result"] == {"files": ["galaxy.yml"], "exported": False}
+        assert "1.0.0" in (repos / "stale/galaxy.yml").read_text()
+
+        await self.server.handle({**job, "export": True})
+        assert "version: 1.2.3" in (repos / "stale/galaxy.yml").read_text()
+
+    async def test_object_result(self, repos):
+        """Test object results are returned field by field."""
+        response = await self.server.handle({
+            "function": "release",
+            "source": str(repos / "good"),
+            "args": {"bump_type": "minor"},
+            "export": True,
+        })
+        result = response["result"]
+        assert result["version"] == "1.3.0"
+        assert result["directory"] == {"files": ["VERSION", "galaxy.yml"], "exported": True}
+        assert (repos / "good/VERSION").read_text() == "1.3.0"
+
+    @pytest.mark.parametrize("job, error", [
+        ({"function": "infer-bump", "source": "."}, "Unknown function"),
+        ({"function": "get-version", "source": "/nonexistent"}, "is not a directory"),
+        ({"function": "get-version", "source": ".", "args": {"bogus": 1}}, "get_version failed"),
+    ])
+    async def test_errors(self, job, error):
+        """Test failures are reported in the response."""
+        response = await self.server.handle(job)
+        assert response["ok"] is False
+        assert error in response["error"]
+        assert self.server.stats()["errors"] == 1
+
+    async def test_caches_reused(self, repos):
+        """Test repeated calls read unchanged files from the cache."""
+        job = {"function": "get-version", "source": str(repos / "good")}
+        await self.server.handle(job)
+        await self.server.handle(job)
+        stats = (await self.server.handle({"function": "stats"}))["result"]
+        assert stats["jobs"] == 2
+        assert stats["file_cache"]["hits"] == 1
+
+
+class TestSocket:
+    """Test the JSON-lines protocol over a Unix socket."""
+
+    async def test_round_trip(self, repos, tmp_path):
+        """Test requests on one connection are answered line by line."""
+        path = str(tmp_path / "dvm.sock")
+        listener = await VersionServer().start_unix(path)
+        async with listener:
+            reader, writer = await asyncio.open_unix_connection(path)
+            job = {"id": 1, "function": "get-version", "source": str(repos / "good")}
+            writer.write(json.dumps(job).encode() + b"\nnot json\n")
+            await writer.drain()
+            first = json.loads(await reader.readline())
+            second = json.loads(await reader.readline())
+            writer.close()
+        assert first == {"id": 1, "ok": True, "result": "1.2.3"}
+        assert second["ok"] is False
+        assert "Invalid request" in second["error"]
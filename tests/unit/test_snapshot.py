@@ -0,0 +1,158 @@
+"""Unit tests for the single-query metadata snapshot."""
+
+import os
+import shutil
+import subprocess
+
+import pytest
+
+from src.main import VersionManager
+from src.main.snapshot import SNAPSHOT_SCRIPT, Snapshot, snapshot_paths
+from tests.fakes import FakeDirectory
+
+pytestmark = pytest.mark.skipif(shutil.which("sh") is None, reason="sh is not available")
+
+HOOK = "#!/bin/sh\n# DAGGER-VERSION-MANAGER: v1.0.0\n"
+
+
+def materialize(files: dict[str, str], root) -> None:
+    """Write a fake directory's files to disk."""
+    for path, content in files.items():
+        target = root / path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(content.encode())
+
+
+def run_script(root, directories: list[str], files: list[str], max_bytes: int) -> str:
+    """Run the snapshot script the way the container does."""
+    env = dict(
+        os.environ,
+        DVM_SNAPSHOT_DIRS="\n".join(directories),
+        DVM_SNAPSHOT_FILES="\n".join(files),
+        DVM_SNAPSHOT_MAX_BYTES=str(max_bytes),
+    )
+    return subprocess.run(
+        ["sh", "-c", SNAPSHOT_SCRIPT], cwd=root, env=env, check=True, capture_output=True
+    ).stdout.decode()
+
+
+class TestSnapshotScript:
+    """Test the snapshot script against real directories."""
+
+    def test_records(self, tmp_path):
+        """Test listings, contents, missing paths and line endings are captured."""
+        materialize({
+            "VERSION": "1.2.3\n",
+            "galaxy.yml": "name: x\r\nversion: 1.2.3",
+            "notes/ünïcode.md": "héllo\n\n",
+        }, tmp_path)
+        (tmp_path / ".git").mkdir()
+        snapshot = Snapshot.from_output(run_script(
+            tmp_path, [".", "version", "notes"],
+            ["VERSION", "galaxy.yml", "notes/ünïcode.md", "Chart.yaml"], 1024
+        ))
+        assert snapshot.entries == {
+            ".": [".git/", "VERSION", "galaxy.yml", "notes/"],
+            "version": None,
+            "notes": ["ünïcode.md"],
+        }
+        assert snapshot.files == {
+            "VERSION": "1.2.3\n",
+            "galaxy.yml": "name: x\r\nversion: 1.2.3",
+            "notes/ünïcode.md": "héllo\n\n",
+            "Chart.yaml": None,
+        }
+        assert snapshot.skipped == []
+
+    def test_size_cap(self, tmp_path):
+        """Test files past the cap are skipped and left for normal reads."""
+        materialize({"a": "x" * 60, "b": "y" * 60, "c": "z" * 30}, tmp_path)
+        snapshot = Snapshot.from_output(run_script(tmp_path, ["."], ["a", "b", "c"], 100))
+        assert set(snapshot.files) == {"a", "c"}
+        assert snapshot.skipped == ["b"]
+
+    @pytest.mark.parametrize("output", ["F 10 VERSION\n1.2", "X 1 a\nb", "F\n", "F x VERSION\n"])
+    def test_malformed(self, output):
+        """Test truncated or unknown records are rejected."""
+        with pytest.raises(ValueError):
+            Snapshot.from_output(output)
+
+    def test_paths(self):
+        """Test call files are added with their parent directories."""
+        directories, files = snapshot_paths(["VERSION", "charts/app/Chart.yaml", None])
+        assert files.count("VERSION") == 1
+        assert files[-1] == "charts/app/Chart.yaml"
+        assert directories == [".", "version", ".git/hooks", "charts/app"]
+
+
+class LocalSnapshotVersionManager(VersionManager):
+    """Snapshots fake directories by running the script on a copy on disk."""
+
+    root = None
+    failing = False
+
+    def _snapshot_enabled(self, source) -> bool:
+        return self.snapshot_max_bytes > 0
+
+    async def _run_snapshot(self, source, directories, files) -> str:
+        if self.failing:
+            raise Exception("no engine session")
+        materialize(source.files, self.root)
+        return run_script(self.root, directories, files, self.snapshot_max_bytes)
+
+
+class TestSnapshotCalls:
+    """Test functions run against the snapshot without engine round-trips."""
+
+    @pytest.fixture
+    def vm(self, tmp_path):
+        """Version manager snapshotting into a temporary directory."""
+        vm = LocalSnapshotVersionManager()
+        vm.root = tmp_path
+        return vm
+
+    @pytest.fixture
+    def source(self):
+        """Ansible collection with a managed hook."""
+        return FakeDirectory({
+            "VERSION": "1.2.3\n",
+            "galaxy.yml": "namespace: acme\nname: tools\nversion: 1.2.3\n",
+            "CHANGELOG.md": "# Changelog\n",
+            ".git/HEAD": "ref: refs/heads/main\n",
+            ".git/hooks/pre-commit": HOOK,
+        })
+
+    async def test_validate_version(self, vm, source):
+        """Test validation reads nothing from the engine."""
+        assert await vm.validate_version(source) == "✅ Version 1.2.3 is consistent"
+        assert source.stats.round_trips == 0
+
+    async def test_release(self, vm, source):
+        """Test a release with bump and changelog reads nothing from the engine."""
+        result = await vm.release(source, bump_type="minor", changelog="- Added")
+        assert result.version == "1.3.0"
+        assert "## [1.3.0]" in result.directory.files["CHANGELOG.md"]
+        assert source.stats.round_trips == 0
+
+    async def test_setup_git_hooks(self, vm, source):
+        """Test hook installation reads nothing from the engine."""
+        updated = await vm.setup_git_hooks(source)
+        assert "DAGGER-VERSION-MANAGER: v1.2.3" in updated.files[".git/hooks/pre-push"]
+        assert source.stats.round_trips == 0
+
+    async def test_over_cap_read_on_demand(self, vm, source):
+        """Test files skipped by the cap are still read from the engine."""
+        vm.snapshot_max_bytes = 20
+        assert await vm.validate_version(source) == "✅ Version 1.2.3 is consistent"
+        assert source.stats.calls == [("contents", "galaxy.yml")]
+
+    async def test_fallback(self, vm, source):
+        """Test a failed snapshot falls back to normal reads."""
+        vm.failing = True
+        assert await vm.validate_version(source) == "✅ Version 1.2.3 is consistent"
+        assert source.stats.count("contents") == 2
+
+    async def test_disabled_for_local_directories(self, source):
+        """Test directories outside the engine are never snapshotted."""
+        assert not VersionManager()._snapshot_enabled(source)
+        assert not VersionManager(snapshot_max_bytes=0)._snapshot_enabled(source)
@@ -0,0 +1,82 @@
+"""Unit tests for multi-target version synchronization."""
+
+import pytest
+
+from src.main import VersionManager
+from tests.fakes import FakeDirectory
+
+
+def service_tree() -> FakeDirectory:
+    """Service carrying its version in several files."""
+    return FakeDirectory({
+        "VERSION": "2.1.0\n",
+        "pyproject.toml": '[project]\nname = "svc"\nversion = "2.0.0"\n',
+        "Chart.yaml": "apiVersion: v2\nname: svc\nversion: 2.0.0\n",
+        "deploy/app.yaml": "app:\n  version: 2.0.0\n",
+    })
+
+
+class TestParseTargetSpec:
+    """Test parsing of PATH or PATH:PATTERN target specs."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.vm = VersionManager()
+
+    def test_default_pattern_by_file_name(self):
+        """Test known file names get their default pattern."""
+        assert self.vm._parse_target_spec("Chart.yaml") == ("Chart.yaml", r'^version:.*$')
+        assert self.vm._parse_target_spec("sub/pyproject.toml") == (
+            "sub/pyproject.toml", r'^version\s*=\s*".*"$'
+        )
+
+    def test_explicit_pattern_keeps_colons(self):
+        """Test the path ends at the first colon and the pattern keeps the rest."""
+        assert self.vm._parse_target_spec("app.yaml:^  version:.*$") == (
+            "app.yaml", r'^  version:.*$'
+        )
+
+    def test_unknown_file_without_pattern(self):
+        """Test unknown file names require an explicit pattern."""
+        with pytest.raises(Exception, match="No version pattern"):
+            self.vm._parse_target_spec("values.yaml")
+
+
+class TestSyncVersions:
+    """Test syncing several targets in one pass."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.vm = VersionManager()
+
+    async def test_updates_every_target(self):
+        """Test all targets are rewritten in one returned directory."""
+        source = service_tree()
+        updated = await self.vm.sync_versions(
+            source, ["pyproject.toml", "Chart.yaml", "deploy/app.yaml:^  version:.*$"]
+        )
+        files = updated.files
+        assert 'version = "2.1.0"' in files["pyproject.toml"]
+        assert "version: 2.1.0" in files["Chart.yaml"]
+        assert "2.1.0" in files["deploy/app.yaml"]
+        assert source.stats.count("contents", "VERSION") == 1
+
+    async def test_errors_are_aggregated(self):
+        """Test failures from every target are reported together."""
+        source = service_tree()
+        with pytest.raises(Exception) as excinfo:
+            await self.vm.sync_versions(
+                source, ["missing.toml:^version.*$", "Chart.yaml:^appVersion:.*$"]
+            )
+        message = str(excinfo.value)
+        assert "Failed to sync 2 of 2 targets" in message
+        assert "missing.toml" in message
+        assert "Chart.yaml" in message
+
+    async def test_invalid_specs_are_aggregated(self):
+        """Test every malformed spec is reported before any read happens."""
+        source = service_tree()
+        with pytest.raises(Exception) as excinfo:
+            await self.vm.sync_versions(source, ["a.yaml", "b.yaml"])
+        assert "a.yaml" in str(excinfo.value) and "b.yaml" in str(excinfo.value)
+        assert source.stats.round_trips == 0
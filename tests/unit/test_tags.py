@@ -0,0 +1,157 @@
+"""Unit tests for tag history analysis."""
+
+import json
+
+import pytest
+
+from src.main import VersionManager
+from src.main.semver import Version
+from src.main.tags import TagIndex, loose_tag_names, parse_packed_refs
+from tests.fakes import FakeDirectory
+
+PACKED_REFS = """\
+# pack-refs with: peeled fully-peeled sorted
+1111111111111111111111111111111111111111 refs/heads/main
+2222222222222222222222222222222222222222 refs/tags/v1.0.0
+^3333333333333333333333333333333333333333
+4444444444444444444444444444444444444444 refs/tags/v1.1.0
+5555555555555555555555555555555555555555 refs/remotes/origin/main
+"""
+
+HISTORY = [
+    "v1.0.0", "v1.0.1", "v1.1.0", "v1.3.0", "v1.3.1",
+    "v2.0.0-rc.1", "v2.0.0", "v2.0.3", "v3.0.0-beta.1",
+    "nightly", "v4", "latest",
+]
+
+
+class TestTagSources:
+    """Test tag names are read from packed-refs and loose refs."""
+
+    def test_packed_refs(self):
+        """Test only tags are extracted and peeled lines are skipped."""
+        assert parse_packed_refs(PACKED_REFS) == ["v1.0.0", "v1.1.0"]
+
+    def test_loose_tags(self):
+        """Test nested tags are kept and directories dropped."""
+        paths = [
+            ".git/refs/tags/v1.0.0",
+            ".git/refs/tags/release",
+            ".git/refs/tags/release/",
+            ".git/refs/tags/release/v2.0.0",
+        ]
+        assert loose_tag_names(paths) == ["release/v2.0.0", "v1.0.0"]
+
+
+class TestTagIndex:
+    """Test the sorted tag index."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.index = TagIndex(HISTORY)
+
+    def test_sorted_and_skipped(self):
+        """Test versions are sorted by precedence and non-versions skipped."""
+        assert [str(v) for v in self.index.versions] == [
+            "1.0.0", "1.0.1", "1.1.0", "1.3.0", "1.3.1",
+            "2.0.0-rc.1", "2.0.0", "2.0.3", "3.0.0-beta.1",
+        ]
+        assert self.index.tags[0] == "v1.0.0"
+        assert self.index.skipped == ["nightly", "v4", "latest"]
+
+    def test_contains(self):
+        """Test membership by precedence."""
+        assert Version.parse("1.3.0") in self.index
+        assert Version.parse("1.3.0+build.7") in self.index
+        assert Version.parse("1.2.0") not in self.index
+
+    def test_latest(self):
+        """Test latest versions overall, per release and per major line."""
+        assert str(self.index.latest()) == "3.0.0-beta.1"
+        assert str(self.index.latest(include_prereleases=False)) == "2.0.3"
+        assert {major: str(v) for major, v in self.index.latest_per_major().items()} == {
+            1: "1.3.1", 2: "2.0.3",
+        }
+        assert self.index.latest_in_major(3) is None
+        assert str(self.index.latest_in_major(3, include_prereleases=True)) == "3.0.0-beta.1"
+
+    def test_gaps(self):
+        """Test releases that skip a version are reported."""
+        assert [tuple(map(str, gap)) for gap in self.index.gaps()] == [
+            ("1.1.0", "1.3.0", "1.2.0"),
+            ("2.0.0", "2.0.3", "2.0.1"),
+        ]
+
+    def test_next_version(self):
+        """Test the next version from the latest tag overall or of a major line."""
+        assert str(self.index.next_version("prerelease")) == "3.0.0-beta.2"
+        assert str(self.index.next_version("patch", major=1)) == "1.3.2"
+        assert str(self.index.next_version("minor", major=1)) == "1.4.0"
+
+        taken = TagIndex(["v1.0.0", "v1.0.0-rc.1", "v1.0.0-rc.2"])
+        assert str(taken.next_version("prerelease", major=1)) == "1.0.1-rc.1"
+        assert str(TagIndex(["v1.0.0-rc.1", "v1.0.0-rc.2"]).next_version("patch")) == "1.0.0"
+
+    def test_next_version_skips_taken(self):
+        """Test a bump landing on an existing tag is bumped again."""
+        index = TagIndex(["v1.0.0-beta.1", "v1.0.0-rc.1"])
+        assert str(index.next_version("prerelease", preid="beta")) == "1.0.0-beta.2"
+
+        index = TagIndex(["v1.4.0", "v2.0.0", "v3.0.0"])
+        assert str(index.next_version("major", major=1)) == "4.0.0"
+
+    def test_empty(self):
+        """Test an empty history starts from 0.0.0."""
+        index = TagIndex([])
+        assert index.latest() is None
+        assert str(index.next_version("minor")) == "0.1.0"
+
+    def test_custom_prefix(self):
+        """Test tags with another prefix are parsed."""
+        index = TagIndex(["release-1.0.0", "v2.0.0"], prefix="release-")
+        assert [str(v) for v in index.versions] == ["1.0.0"]
+        assert index.skipped == ["v2.0.0"]
+
+
+class TestAnalyzeTags:
+    """Test the analyze_tags function."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.vm = VersionManager()
+
+    async def test_from_tag_list(self):
+        """Test analysis of an explicit tag list."""
+        report = json.loads(await self.vm.analyze_tags(tags=HISTORY, bump_type="minor"))
+        assert report["count"] == 9
+        assert report["latest_release"] == "2.0.3"
+        assert report["latest_per_major"] == {"1": "1.3.1", "2": "2.0.3"}
+        assert report["gaps"][0] == {"after": "1.1.0", "before": "1.3.0", "expected": "1.2.0"}
+        assert report["next"] == {"bump_type": "minor", "version": "3.0.0"}
+
+    async def test_from_git_directory(self):
+        """Test loose and packed tags are combined without running git."""
+        source = FakeDirectory({
+            ".git/packed-refs": PACKED_REFS,
+            ".git/refs/tags/v1.1.0": "4444444444444444444444444444444444444444\n",
+            ".git/refs/tags/v1.2.0": "6666666666666666666666666666666666666666\n",
+        })
+        report = json.loads(await self.vm.analyze_tags(source))
+        assert report["versions"] == ["1.0.0", "1.1.0", "1.2.0"]
+        assert report["next"]["version"] == "1.2.1"
+        assert source.stats.count("contents") == 1
+
+    async def test_without_tags(self):
+        """Test a repository without tags."""
+        report = json.loads(await self.vm.analyze_tags(FakeDirectory({".git/HEAD": "x"})))
+        assert report["count"] == 0
+        assert report["next"]["version"] == "0.0.1"
+
+    async def test_errors(self):
+        """Test missing input and invalid bump types are rejected."""
+        with pytest.raises(Exception, match="--source or --tags"):
+            await self.vm.analyze_tags()
+        with pytest.raises(Exception, match="Invalid bump_type"):
+            await self.vm.analyze_tags(tags=["v1.0.0"], bump_type="huge")
+        with pytest.raises(Exception, match="Cannot compute"):
+            await self.vm.analyze_tags(tags=["v1.0.0"], bump_type="finalize")
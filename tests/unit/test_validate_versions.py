@@ -0,0 +1,77 @@
+"""Unit tests for batch validation and its structured report."""
+
+import json
+
+from src.main import VersionManager
+from tests.fakes import FakeDirectory
+
+
+def service_tree() -> FakeDirectory:
+    """Service with one consistent, one stale and one unmatched target."""
+    return FakeDirectory({
+        "version/VERSION": "2.1.0\n",
+        "pyproject.toml": '[project]\nversion = "2.1.0"\n',
+        "Chart.yaml": "apiVersion: v2\nversion: 2.0.0\n",
+        "deploy/app.yaml": "app:\n  image: svc\n",
+    })
+
+
+class TestValidateVersions:
+    """Test batch validation reports."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.vm = VersionManager()
+
+    async def test_json_report(self):
+        """Test per-target status, extracted version and timing are reported."""
+        source = service_tree()
+        result = json.loads(await self.vm.validate_versions(
+            source,
+            ["pyproject.toml", "Chart.yaml", "deploy/app.yaml:^  version:.*$", "missing.yml"],
+        ))
+        assert result["version_file"] == "version/VERSION"
+        assert result["source_version"] == "2.1.0"
+        assert not result["ok"]
+        statuses = [(t["target_file"], t["status"], t["target_version"]) for t in result["targets"]]
+        assert statuses == [
+            ("pyproject.toml", "consistent", "2.1.0"),
+            ("Chart.yaml", "mismatch", "2.0.0"),
+            ("deploy/app.yaml", "not_found", None),
+            ("missing.yml", "invalid_spec", None),
+        ]
+        assert all(t["elapsed_ms"] >= 0 for t in result["targets"])
+        assert source.stats.count("contents", "version/VERSION") == 1
+
+    async def test_text_report_matches_single_validation(self):
+        """Test the text rendering reuses the validate_version messages."""
+        source = service_tree()
+        text = await self.vm.validate_versions(
+            source, ["pyproject.toml", "Chart.yaml"], output_format="text"
+        )
+        single = await self.vm.validate_version(
+            service_tree(), target_file="pyproject.toml",
+            version_pattern=r'^version\s*=\s*".*"$'
+        )
+        assert text.splitlines()[0] == single
+        assert text.splitlines()[-1] == "❌ 1 of 2 targets failed validation"
+
+    async def test_all_consistent(self):
+        """Test the summary line when every target matches."""
+        text = await self.vm.validate_versions(
+            service_tree(), ["pyproject.toml"], output_format="text"
+        )
+        assert text.endswith("✅ All 1 targets match version/VERSION=2.1.0")
+
+    async def test_version_file_error(self):
+        """Test an unreadable version file is reported once."""
+        source = FakeDirectory({"galaxy.yml": "version: 1.0.0\n"})
+        result = json.loads(await self.vm.validate_versions(source, ["galaxy.yml"]))
+        assert "No VERSION file found" in result["error"]
+        assert result["targets"] == []
+        assert not result["ok"]
+
+    async def test_invalid_output_format(self):
+        """Test unknown output formats are rejected."""
+        result = await self.vm.validate_versions(service_tree(), ["Chart.yaml"], output_format="xml")
+        assert "❌" in result and "json" in result
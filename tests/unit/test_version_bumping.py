@@ -1,7 +1,7 @@
 """Unit tests for version bumping logic."""
 
 import pytest
-from src.main import DaggerVersionManager
+from src.main import VersionManager
 
 
 class TestVersionBumping:
@@ -9,7 +9,7 @@ class TestVersionBumping:
 
     def setup_method(self):
         """Set up test fixtures."""
-        self.vm = DaggerVersionManager()
+        self.vm = VersionManager()
 
     def test_bump_patch_version(self):
         """Test patch version bumping."""
@@ -95,7 +95,7 @@ class TestBumpingEdgeCases:
 
     def setup_method(self):
         """Set up test fixtures."""
-        self.vm = DaggerVersionManager()
+        self.vm = VersionManager()
 
     def test_bump_from_zero_versions(self):
         """Test bumping from 0.0.0."""
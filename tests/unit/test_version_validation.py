@@ -1,7 +1,7 @@
 """Unit tests for version validation logic."""
 
 import pytest
-from src.main import DaggerVersionManager
+from src.main import VersionManager
 
 
 class TestVersionValidation:
@@ -9,7 +9,7 @@ class TestVersionValidation:
 
     def setup_method(self):
         """Set up test fixtures."""
-        self.vm = DaggerVersionManager()
+        self.vm = VersionManager()
 
     def test_validate_semver_valid_versions(self):
         """Test validation of valid semantic versions."""
@@ -18,6 +18,9 @@ class TestVersionValidation:
             "0.0.1",
             "10.20.30",
             "999.999.999",
+            "1.0.0-alpha",
+            "1.0.0+build",
+            "1.4.0-rc.2+sha.abc",
         ]
         
         for version in valid_versions:
@@ -32,8 +35,10 @@ class TestVersionValidation:
             "1",             # Missing minor and patch
             "1.0.0.0",       # Too many components
             "v1.0.0",        # Has 'v' prefix
-            "1.0.0-alpha",   # Has pre-release tag
-            "1.0.0+build",   # Has build metadata
+            "01.0.0",        # Leading zero
+            "1.0.0-01",      # Leading zero in numeric pre-release
+            "1.0.0-",        # Empty pre-release
+            "1.0.0+",        # Empty build metadata
             "a.b.c",         # Non-numeric
             "1.0.x",         # Contains non-numeric
         ]
@@ -63,7 +68,7 @@ class TestVersionExtraction:
 
     def setup_method(self):
         """Set up test fixtures."""
-        self.vm = DaggerVersionManager()
+        self.vm = VersionManager()
 
     def test_extract_version_from_yaml(self):
         """Test extracting version from YAML format."""